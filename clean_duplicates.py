@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+Duplicate Cleaning Script for Merged Scorecard Data
+Version: 2.0
+
+Reads the most recent MERGED_DATA file once, detects duplicate POG runs once,
+and writes one output file per removal policy:
+
+  highlight           CLEAN_MERGE_*.xlsx       all duplicates kept, highlighted in yellow
+  remove-directional  CLEAN_DD_MERGE_*.xlsx    Directional duplicates removed,
+                                               Rental duplicates highlighted in yellow
+  remove-all          CLEAN_DD_R_MERGE_*.xlsx  all duplicates removed
+
+detect_duplicates.py, clean_dd_merge.py and clean_dd_r_merge.py run this script
+with a single policy each.
+
+DUPLICATE DETECTION LOGIC:
+1. Duplicates are identified using THREE criteria (all must match):
+   - JOB_NUM (must match exactly)
+   - Total Hrs within ±5 hours tolerance (TOTAL_DRILL when both have no hours)
+   - Last 3 digits of Serial Number (SN) must match
+   A POG row whose hours match the SUM of the reference runs with the same
+   JOB_NUM and SN digits is also a duplicate (runs recorded combined).
+   With --partial-runs, so is a POG row matching the sum of only some (two or
+   more) of those runs; the matched reference rows are listed.
+   With --date-overlap, only reference runs whose DATE_IN..DATE_OUT overlaps
+   the POG run (within the given number of days) count; undated runs always do.
+
+2. Reference files are identified by SOURCE (never marked as duplicates):
+   - Motor KPI (SOURCE='Motor_KPI'): Reference for ALL Directional job types
+   - CAM Run Tracker (SOURCE='CAM_Run_Tracker'): Reference for ALL Rental job types
+
+3. POG files are checked for duplicates by JOB_TYPE:
+   - POG JOB_TYPE = "Directional" -> checked against Motor KPI
+   - POG JOB_TYPE = "Rental" -> checked against CAM Run Tracker
+
+DATA CLEANING:
+- Rows with both Total Hrs = 0/blank AND TOTAL_DRILL = 0/blank are removed
+
+Usage:
+    python clean_duplicates.py
+    python clean_duplicates.py --policy remove-all
+    python clean_duplicates.py --policy highlight remove-directional
+    python clean_duplicates.py --parallel --workers 4
+    python clean_duplicates.py --partial-runs
+    python clean_duplicates.py --date-overlap 1
+"""
+
+import argparse
+import glob
+import os
+from datetime import datetime
+import numpy as np
+from openpyxl import load_workbook
+from openpyxl.styles import PatternFill
+from spreadsheet_readers import read_sheet
+from serial_numbers import serial_number_keys, SN_SUFFIX_DIGITS
+from duplicate_matching import flag_pog_duplicates, flag_pog_duplicates_parallel, MAX_SUBSET_RUNS
+
+# Configuration
+TOTAL_HRS_TOLERANCE = 5  # ±5 hours tolerance
+SN_LAST_DIGITS = SN_SUFFIX_DIGITS   # Match last 3 digits of Serial Number
+
+# Yellow fill for highlighting duplicates
+YELLOW_FILL = PatternFill(start_color="FFFF00", end_color="FFFF00", fill_type="solid")
+
+# Removal policies: output file prefix, duplicates removed, duplicates highlighted
+POLICIES = {
+    'highlight': {
+        'prefix': 'CLEAN_MERGE',
+        'remove': [],
+        'highlight': ['Directional', 'Rental'],
+    },
+    'remove-directional': {
+        'prefix': 'CLEAN_DD_MERGE',
+        'remove': ['Directional'],
+        'highlight': ['Rental'],
+    },
+    'remove-all': {
+        'prefix': 'CLEAN_DD_R_MERGE',
+        'remove': ['Directional', 'Rental'],
+        'highlight': [],
+    },
+}
+
+# Partial combined-run matches listed in the console
+PARTIAL_RUNS_REPORT_LIMIT = 20
+
+# Duplicate flag column per JOB_TYPE (temporary, never exported)
+FLAG_COLUMNS = {'Directional': 'IS_DIRECTIONAL_DUPLICATE', 'Rental': 'IS_RENTAL_DUPLICATE'}
+
+
+def find_merged_file():
+    """Find the most recent MERGED_DATA file in the current directory."""
+    print("\nSearching for merged data file...")
+    pattern = "MERGED_DATA*.xlsx"
+    matches = glob.glob(pattern)
+
+    if len(matches) == 0:
+        print(f"  ERROR: No file found matching pattern '{pattern}'")
+        return None
+    elif len(matches) > 1:
+        # Sort by modification time, get most recent
+        matches.sort(key=os.path.getmtime, reverse=True)
+        print(f"  WARNING: Multiple files found. Using most recent: {matches[0]}")
+    else:
+        print(f"  Found: {matches[0]}")
+
+    return matches[0]
+
+
+def sn_last_digits(df):
+    """
+    Last 3 digits of each row's SN (the SN_SUFFIX key of serial_numbers.py).
+
+    Always derived from SN: SN_* columns read back from a workbook come back
+    as numbers (5.0 instead of '005') and would match the wrong runs.
+    """
+    return serial_number_keys(df['SN'])['SN_SUFFIX']
+
+
+def remove_empty_runs(df):
+    """
+    Remove rows where both Total Hrs = 0/blank AND TOTAL_DRILL = 0/blank.
+    Keep rows if at least one has a value.
+
+    Args:
+        df: DataFrame with merged data
+
+    Returns:
+        Filtered DataFrame and count of removed rows
+    """
+    print("\nStep 1: Removing runs with no hours and no drill distance...")
+
+    initial_count = len(df)
+
+    # Create conditions for empty/zero values
+    total_hrs_empty = (df['Total Hrs (C+D)'].isna()) | (df['Total Hrs (C+D)'] == 0)
+    total_drill_empty = (df['TOTAL_DRILL'].isna()) | (df['TOTAL_DRILL'] == 0)
+
+    # Keep rows where at least one is NOT empty/zero
+    # IMPORTANT: Don't use .copy() to preserve original indices
+    df_filtered = df[~(total_hrs_empty & total_drill_empty)]
+
+    removed_count = initial_count - len(df_filtered)
+
+    print(f"  Removed {removed_count} rows with no hours and no drill distance")
+    print(f"  Remaining rows: {len(df_filtered)}")
+
+    return df_filtered, removed_count
+
+
+def report_partial_runs(partial):
+    """
+    List POG rows matched to the sum of some of their reference runs.
+    Row numbers are merged-file Excel rows.
+    """
+    if len(partial) == 0:
+        print("  No partial combined runs found")
+        return
+
+    print(f"  Partial combined runs ({len(partial)} POG rows match the sum of some reference runs):")
+    for _, match in partial.head(PARTIAL_RUNS_REPORT_LIMIT).iterrows():
+        reference_rows = ' + '.join(str(label + 2) for label in match['REFERENCE_ROWS'])
+        print(f"    Row {match['POG_ROW'] + 2} ({match['JOB_TYPE']}, JOB_NUM {match['JOB_NUM']}, "
+              f"SN ...{match['SN_LAST_3']}): {match['BY']} {match['TARGET']:g} ~ rows {reference_rows} "
+              f"= {match['MATCHED_SUM']:g}")
+    if len(partial) > PARTIAL_RUNS_REPORT_LIMIT:
+        print(f"    ... and {len(partial) - PARTIAL_RUNS_REPORT_LIMIT} more")
+
+
+def detect_duplicates(df, parallel=False, workers=None, max_subset_runs=None, date_slack=None):
+    """
+    Detect duplicate POG runs once, for every policy.
+
+    Args:
+        df: DataFrame with merged data
+        parallel: Match JOB_NUM shards in worker processes
+        workers: Number of worker processes (default: CPU count)
+        max_subset_runs: Also match POG rows to the sum of some reference runs,
+            in groups of up to this many runs (None: off)
+        date_slack: Only match reference runs whose dates overlap the POG run's,
+            or are at most this many days apart (None: dates not compared)
+
+    Returns:
+        DataFrame with SN_LAST_3, IS_DIRECTIONAL_DUPLICATE and IS_RENTAL_DUPLICATE added
+    """
+    print("\nStep 2: Detecting duplicates...")
+
+    print("  Taking last 3 digits of Serial Numbers...")
+    df = df.copy()  # Make an explicit copy to avoid SettingWithCopyWarning
+    df['SN_LAST_3'] = sn_last_digits(df)
+
+    # Reference files are identified by SOURCE, not JOB_TYPE:
+    #   - All Motor KPI rows are Directional reference (regardless of JOB_TYPE)
+    #   - All CAM Run Tracker rows are Rental reference (regardless of JOB_TYPE)
+    source = df['SOURCE'].astype(object)
+    print("\n  Source breakdown:")
+    print(f"    Motor KPI (Directional reference - by SOURCE): {(source == 'Motor_KPI').sum()} rows")
+    print(f"    CAM Run Tracker (Rental reference - by SOURCE): {(source == 'CAM_Run_Tracker').sum()} rows")
+    print(f"    POG CAM Usage (checked by JOB_TYPE): {(source == 'POG_CAM_Usage').sum()} rows")
+    print(f"    POG MM Usage (checked by JOB_TYPE): {(source == 'POG_MM_Usage').sum()} rows")
+
+    # POG files use JOB_TYPE to determine which reference to check against:
+    #   Directional -> Motor KPI, Rental -> CAM Run Tracker
+    if parallel:
+        print(f"\n  Checking POG CAM and POG MM for duplicates in parallel "
+              f"({workers or os.cpu_count() or 1} JOB_NUM shards)...")
+        directional, rental, partial = flag_pog_duplicates_parallel(df, TOTAL_HRS_TOLERANCE, workers,
+                                                                    max_subset_runs, date_slack)
+    else:
+        print("\n  Checking POG CAM and POG MM for duplicates...")
+        directional, rental, partial = flag_pog_duplicates(df, TOTAL_HRS_TOLERANCE, max_subset_runs,
+                                                           date_slack)
+    if max_subset_runs:
+        report_partial_runs(partial)
+    df[FLAG_COLUMNS['Directional']] = directional
+    df[FLAG_COLUMNS['Rental']] = rental
+
+    print(f"\n  Directional duplicates (vs Motor KPI): {int(directional.sum())}")
+    print(f"  Rental duplicates (vs CAM Run Tracker): {int(rental.sum())}")
+    print(f"  Total duplicates detected: {int(directional.sum() + rental.sum())}")
+
+    return df
+
+
+def apply_policy(df, policy):
+    """
+    Apply a removal policy to the detected duplicates.
+
+    Args:
+        df: DataFrame from detect_duplicates
+        policy: Key of POLICIES
+
+    Returns:
+        (output DataFrame without the helper columns,
+         boolean array of the output rows to highlight)
+    """
+    rules = POLICIES[policy]
+    removed = np.zeros(len(df), dtype=bool)
+    for job_type in rules['remove']:
+        removed |= df[FLAG_COLUMNS[job_type]].to_numpy(dtype=bool)
+    highlighted = np.zeros(len(df), dtype=bool)
+    for job_type in rules['highlight']:
+        highlighted |= df[FLAG_COLUMNS[job_type]].to_numpy(dtype=bool)
+
+    helper_columns = ['SN_LAST_3'] + list(FLAG_COLUMNS.values())
+    df_output = df[~removed].drop(columns=helper_columns, errors='ignore')
+    return df_output, highlighted[~removed]
+
+
+def format_output_workbook(file_path, highlighted):
+    """
+    Highlight rows in yellow and format DATE_IN and DATE_OUT as date only.
+
+    Args:
+        file_path: Path to the output Excel file
+        highlighted: Boolean array, one entry per data row
+    """
+    wb = load_workbook(file_path)
+    ws = wb.active
+
+    # When exported to Excel with index=False, position determines Excel row number
+    for position in np.flatnonzero(highlighted):
+        excel_row = position + 2  # +2 because Excel is 1-indexed and has header row
+        for col in range(1, ws.max_column + 1):
+            ws.cell(row=excel_row, column=col).fill = YELLOW_FILL
+
+    header_row = [cell.value for cell in ws[1]]
+    for idx, header in enumerate(header_row, start=1):
+        if header in ('DATE_IN', 'DATE_OUT'):
+            for row_idx in range(2, ws.max_row + 1):
+                cell = ws.cell(row=row_idx, column=idx)
+                if cell.value is not None:
+                    if hasattr(cell.value, 'date'):
+                        cell.value = cell.value.date()
+                    cell.number_format = 'YYYY-MM-DD'
+
+    wb.save(file_path)
+
+
+def write_policy_output(df, policy, timestamp):
+    """
+    Write the output file of one policy.
+
+    Returns:
+        Dictionary with policy, output_file, removed, highlighted and final row counts
+    """
+    df_output, highlighted = apply_policy(df, policy)
+    output_file = f"{POLICIES[policy]['prefix']}_{timestamp}.xlsx"
+
+    print(f"\nWriting {policy} output: {output_file}")
+    df_output.to_excel(output_file, index=False, engine='openpyxl')
+    format_output_workbook(output_file, highlighted)
+
+    result = {'policy': policy, 'output_file': output_file, 'removed': len(df) - len(df_output),
+              'highlighted': int(highlighted.sum()), 'final': len(df_output)}
+    print(f"  Removed {result['removed']} duplicate rows, highlighted {result['highlighted']} in yellow")
+    return result
+
+
+def generate_summary_report(original_count, after_empty_removal, directional_count, rental_count, results):
+    """
+    Print a summary of the cleaning process.
+
+    Args:
+        original_count: Original number of rows
+        after_empty_removal: Number of rows after removing empty runs
+        directional_count: Number of Directional duplicates found
+        rental_count: Number of Rental duplicates found
+        results: One dictionary per output file, from write_policy_output
+    """
+    print("\n" + "="*70)
+    print("DUPLICATE CLEANING SUMMARY")
+    print("="*70)
+    print(f"\nOriginal merged file rows:           {original_count}")
+    print(f"Rows removed (no hrs & no drill):    {original_count - after_empty_removal}")
+    print(f"Rows after removal:                  {after_empty_removal}")
+    print(f"Directional duplicates found:        {directional_count}")
+    print(f"Rental duplicates found:             {rental_count}")
+
+    print(f"\n  {'Policy':<20} {'Removed':>8} {'Highlighted':>12} {'Rows':>8}  Output file")
+    for result in results:
+        print(f"  {result['policy']:<20} {result['removed']:>8} {result['highlighted']:>12} "
+              f"{result['final']:>8}  {result['output_file']}")
+
+    print("\nNOTE: Highlighted rows are duplicates kept for manual review.")
+    print("="*70)
+
+
+def run(policies, parallel=False, workers=None, max_subset_runs=None, date_slack=None):
+    """Read the merged file, detect duplicates once, and write one output per policy"""
+    print("="*70)
+    print("DUPLICATE CLEANING - Scorecard Data Cleaner")
+    print("="*70)
+    print("\nCriteria for duplicate detection:")
+    print("  1. JOB_NUM must match exactly")
+    print(f"  2. Total Hrs within ±{TOTAL_HRS_TOLERANCE} hours")
+    print(f"  3. Last {SN_LAST_DIGITS} digits of Serial Number must match")
+    if max_subset_runs:
+        print(f"  Partial combined runs: groups of up to {max_subset_runs} reference runs")
+    if date_slack is not None:
+        print(f"  Dates must overlap a reference run (within {date_slack} days)")
+    print("\nReference files (identified by SOURCE, never marked as duplicates):")
+    print("  - Motor KPI (SOURCE='Motor_KPI'): Reference for ALL Directional runs")
+    print("  - CAM Run Tracker (SOURCE='CAM_Run_Tracker'): Reference for ALL Rental runs")
+    print("\nPOG files (checked for duplicates by JOB_TYPE):")
+    print("  - POG JOB_TYPE='Directional' -> checked against Motor KPI")
+    print("  - POG JOB_TYPE='Rental' -> checked against CAM Run Tracker")
+    print(f"\nPolicies: {', '.join(policies)}")
+
+    # Find merged file
+    merged_file = find_merged_file()
+    if merged_file is None:
+        print("\nERROR: No merged file found. Please run merge script first.")
+        return
+
+    # Read merged data
+    print(f"\nReading merged data from: {merged_file}")
+    df = read_sheet(merged_file)
+    original_count = len(df)
+    print(f"  Loaded {original_count} rows")
+
+    # Remove empty runs (no hours and no drill distance)
+    df_filtered, _ = remove_empty_runs(df)
+    after_empty_removal = len(df_filtered)
+
+    # Detect duplicates once for every policy
+    df_flagged = detect_duplicates(df_filtered, parallel, workers, max_subset_runs, date_slack)
+
+    print("\nStep 3: Writing output files...")
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    results = [write_policy_output(df_flagged, policy, timestamp) for policy in policies]
+
+    generate_summary_report(original_count, after_empty_removal,
+                            int(df_flagged[FLAG_COLUMNS['Directional']].sum()),
+                            int(df_flagged[FLAG_COLUMNS['Rental']].sum()), results)
+
+
+def subset_runs(text):
+    """--partial-runs value: a whole number of runs from 3 to MAX_SUBSET_RUNS"""
+    runs = int(text)
+    if not 3 <= runs <= MAX_SUBSET_RUNS:
+        raise argparse.ArgumentTypeError(f"must be between 3 and {MAX_SUBSET_RUNS}, got {runs}")
+    return runs
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Detect duplicate POG runs and write cleaned copies of the merged data")
+    parser.add_argument('--policy', nargs='+', choices=list(POLICIES), default=list(POLICIES),
+                        help="Outputs to write (default: all three)")
+    parser.add_argument('--parallel', action='store_true',
+                        help="Match duplicates in parallel worker processes, one JOB_NUM shard each")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Number of worker processes for --parallel (default: CPU count)")
+    parser.add_argument('--partial-runs', type=subset_runs, nargs='?', const=MAX_SUBSET_RUNS, default=None,
+                        metavar='MAX_RUNS',
+                        help="Also flag POG rows matching the sum of some (2+) reference runs of their "
+                             f"JOB_NUM/SN, in groups of up to MAX_RUNS runs (3-{MAX_SUBSET_RUNS}, "
+                             f"default {MAX_SUBSET_RUNS})")
+    parser.add_argument('--date-overlap', type=int, nargs='?', const=0, default=None, metavar='DAYS',
+                        help="Only match reference runs whose DATE_IN..DATE_OUT overlaps the POG run's, "
+                             "or is at most DAYS days apart (default 0)")
+    return parser.parse_args()
+
+
+def main():
+    """Main execution function."""
+    args = parse_args()
+    # Keep the order given, without repeats
+    run(list(dict.fromkeys(args.policy)), parallel=args.parallel, workers=args.workers,
+        max_subset_runs=args.partial_runs, date_slack=args.date_overlap)
+
+
+if __name__ == "__main__":
+    main()
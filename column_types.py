@@ -0,0 +1,230 @@
+"""
+Column Types
+Compact dtypes for the merged frame, declared in COLUMN_TYPES.csv.
+
+Most merged columns come out of the readers as object dtype, which stores every
+cell as a Python object. COLUMN_TYPES.csv (next to FORMAT GRAL TABLE.xlsx)
+declares a compact type per target column:
+
+  category  Low-cardinality text (SOURCE, JOB_TYPE, DDS, OPERATOR, BASIN, ...)
+  Int64     Counters and flags (BHA, RUN_NUM, ...); nullable, so blanks stay blank
+  float64   Measurements
+  string    Free text; Arrow-backed when pyarrow is installed
+
+Conversions are lossless only: a column is left as it is when its values do not
+fit the declared type (e.g. text in a numeric column, or numbers mixed into a
+text column). Columns that are not listed (dates, times) are never touched.
+
+The last pass before export coerces numeric columns (coerce=True): text that
+reads as a number ('10.9') becomes that number and any other value is cleared
+and listed, so the declared Int64/float64 types always apply to the output.
+"""
+
+import os
+import re
+import numpy as np
+import pandas as pd
+from spreadsheet_readers import read_sheet
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+COLUMN_TYPES_FILE = 'COLUMN_TYPES.csv'
+
+# Arrow-backed strings that keep NaN for missing values (like pandas' default str
+# dtype), so existing pd.isna()/notna() checks behave the same
+try:
+    STRING_DTYPE = pd.StringDtype('pyarrow', na_value=np.nan)
+except (ImportError, TypeError):
+    STRING_DTYPE = object
+
+SUPPORTED_TYPES = ['category', 'Int64', 'float64', 'string']
+NUMERIC_TYPES = ['Int64', 'float64']
+
+# Text that reads as a number when coercing numeric columns ('8', '-1.5', '.5', '2e3')
+NUMBER_TEXT = re.compile(r'[+-]?(\d+(\.\d*)?|\.\d+)([eE][+-]?\d+)?')
+
+# ============================================================================
+# LOAD
+# ============================================================================
+
+def load_column_types(file_path=COLUMN_TYPES_FILE):
+    """
+    Load the declared column types.
+
+    Returns:
+        Dictionary column name -> type name, or {} when the file is missing
+    """
+    if not os.path.exists(file_path):
+        print(f"  WARNING: {file_path} not found, keeping default column types")
+        return {}
+
+    df_types = read_sheet(file_path)
+    column_types = {}
+    for column, type_name in zip(df_types['COLUMN'], df_types['TYPE']):
+        type_name = str(type_name).strip()
+        if type_name not in SUPPORTED_TYPES:
+            raise ValueError(f"{file_path}: unknown type '{type_name}' for column '{column}' "
+                             f"(choose from: {', '.join(SUPPORTED_TYPES)})")
+        column_types[str(column)] = type_name
+
+    print(f"  Loaded {len(column_types)} column types from {file_path}")
+    return column_types
+
+# ============================================================================
+# CONVERT
+# ============================================================================
+
+def _is_number(value):
+    return isinstance(value, (int, float, np.integer, np.floating)) and not isinstance(value, (bool, np.bool_))
+
+
+def _parse_number(value):
+    """A cell as a number: numbers as they are, numeric text parsed, anything else NaN"""
+    if _is_number(value):
+        return value
+    if isinstance(value, str) and NUMBER_TEXT.fullmatch(value.strip()):
+        return float(value)
+    return np.nan
+
+
+def coerce_numbers(series):
+    """
+    Make a text/mixed column numeric: numeric text is parsed and any other value is
+    cleared. Each distinct value is parsed once.
+
+    Returns:
+        (float64 Series, Series of the cleared values); numeric columns come back as they are
+    """
+    if not (series.dtype == object or isinstance(series.dtype, pd.CategoricalDtype)):
+        return series, series.iloc[:0]
+    values = series.astype(object)
+    codes, uniques = pd.factorize(values)
+    parsed = np.array([_parse_number(value) for value in uniques] + [np.nan], dtype='float64')
+    numbers = pd.Series(parsed[codes], index=series.index)
+    cleared = values[values.notna() & numbers.isna()]
+    return numbers, cleared
+
+
+def convert_column(series, type_name):
+    """
+    Convert one column to its declared type, if that is lossless.
+
+    Returns:
+        Converted Series, or None when the values do not fit the type
+    """
+    if type_name == 'category':
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            return series
+        return series.astype('category')
+
+    if type_name == 'string':
+        if series.dtype == STRING_DTYPE:
+            return series
+        values = series.dropna()
+        if not all(isinstance(value, str) for value in values):
+            return None
+        return series.astype(STRING_DTYPE)
+
+    # Numeric types: only real numbers (text that looks like a number stays text)
+    if series.dtype == type_name:
+        return series
+    if series.dtype == object or isinstance(series.dtype, pd.CategoricalDtype):
+        values = series.dropna()
+        if not all(_is_number(value) for value in values):
+            return None
+        series = pd.to_numeric(series.astype(object))
+    elif not pd.api.types.is_numeric_dtype(series.dtype) or pd.api.types.is_bool_dtype(series.dtype):
+        # All-missing text columns have nothing to lose
+        if series.notna().any():
+            return None
+        series = series.astype('float64')
+
+    if type_name == 'Int64':
+        values = series.dropna()
+        if not (values % 1 == 0).all():
+            return None
+        return series.astype('Int64')
+
+    return series.astype('float64')
+
+
+def apply_column_types(df, column_types, columns=None, coerce=False):
+    """
+    Convert the columns of df to their declared types (lossless only).
+
+    Args:
+        df: DataFrame
+        column_types: Dictionary from load_column_types()
+        columns: Optional subset of columns to convert (default: every declared column in df)
+        coerce: Coerce numeric columns first (see coerce_numbers)
+
+    Returns:
+        (DataFrame, list of declared columns left unchanged because their values do not fit,
+         dictionary column -> Series of the values cleared by coerce)
+    """
+    if not column_types:
+        return df, [], {}
+
+    kept = []
+    cleared = {}
+    converted = {}
+    for column in (columns if columns is not None else df.columns):
+        type_name = column_types.get(column)
+        if type_name is None or column not in df.columns:
+            continue
+        # Duplicate column names cannot be converted one by one
+        if isinstance(df[column], pd.DataFrame):
+            continue
+        series = df[column]
+        if coerce and type_name in NUMERIC_TYPES:
+            series, column_cleared = coerce_numbers(series)
+            if len(column_cleared):
+                cleared[column] = column_cleared
+        new_series = convert_column(series, type_name)
+        if new_series is None:
+            kept.append(column)
+            if series is not df[column]:
+                converted[column] = series
+        elif new_series is not df[column]:
+            converted[column] = new_series
+
+    if converted:
+        df = df.assign(**converted)
+
+    return df, kept, cleared
+
+# ============================================================================
+# MEMORY REPORT
+# ============================================================================
+
+def frame_memory_mb(df):
+    """Memory used by df (including Python objects) in MB"""
+    return df.memory_usage(deep=True).sum() / (1024 * 1024)
+
+
+def apply_column_types_with_report(df, column_types, label, columns=None, coerce=False):
+    """
+    apply_column_types() that prints the memory footprint before and after.
+
+    Returns:
+        Converted DataFrame
+    """
+    if not column_types:
+        return df
+
+    before = frame_memory_mb(df)
+    df, kept, cleared = apply_column_types(df, column_types, columns, coerce)
+    after = frame_memory_mb(df)
+
+    saved = (1 - after / before) * 100 if before else 0
+    print(f"  Memory ({label}): {before:.2f} MB -> {after:.2f} MB ({saved:.0f}% smaller)")
+    if kept:
+        print(f"    Kept as-is (values do not fit declared type): {', '.join(kept)}")
+    for column, values in cleared.items():
+        counts = values.astype(str).value_counts()
+        examples = ', '.join(f"'{value}' x{count}" for value, count in counts.head(5).items())
+        print(f"    Cleared {len(values)} non-numeric value(s) in {column}: {examples}")
+
+    return df
@@ -0,0 +1,261 @@
+"""
+Derivations
+Vectorized source-specific column rules for the merged frame.
+
+The merge used to derive MOTOR_TYPE2, JOB_TYPE, DDS, MOTOR_MODEL and
+START_DATE/END_DATE with df.apply(..., axis=1), branching on row['SOURCE'] and
+calling str()/upper()/re/pd.to_datetime once per cell. Here each rule is
+written once per column: boolean masks per SOURCE, .str accessors for the text
+tests and np.select to pick the branch. The outputs are the same value for
+value as the row-wise rules (see verify_derivations.py, which keeps the
+row-wise versions as the reference).
+
+Every function takes the merged frame and returns the new column as a Series;
+merge_excel_files_auto.py assigns it. The SN tests read the serial-number key
+columns (serial_numbers.py) instead of parsing SN again.
+"""
+
+from datetime import time
+import numpy as np
+import pandas as pd
+from serial_numbers import sn_keys
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+POG_SOURCES = ['POG_CAM_Usage', 'POG_MM_Usage']
+
+# Motor KPI TIME_IN/TIME_OUT text format
+TIME_TEXT_FORMAT = '%H:%M:%S'
+
+# POG tool sizes -> MOTOR_MODEL
+POG_MODEL_CONVERSIONS = {
+    '5': '500',
+    '5-4/4': '575',
+    '6-1/2': '650',
+    '7-1/8': '712',
+    '8': '800',
+    '9-5/8': '962'
+}
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+def _column(df, column):
+    """Column values as an object Series (all None when the column is missing, like row.get())"""
+    if column not in df.columns:
+        return pd.Series(None, index=df.index, dtype=object)
+    return df[column].astype(object)
+
+
+def _text(df, column, upper=False, strip=False):
+    """
+    str(value) per cell, '' where blank, optionally upper-cased/stripped.
+    Same as: str(row.get(column)).upper() if pd.notna(row.get(column)) else ''
+    """
+    values = _column(df, column)
+    text = values.astype(str)
+    if strip:
+        text = text.str.strip()
+    if upper:
+        text = text.str.upper()
+    return text.where(values.notna(), '').astype(object)
+
+
+def _select(conditions, choices, default):
+    """np.select over Series masks and Series/scalar choices, keeping Python objects"""
+    index = default.index if isinstance(default, pd.Series) else None
+    conditions = [np.asarray(condition, dtype=bool) for condition in conditions]
+    choices = [choice.to_numpy(dtype=object) if isinstance(choice, pd.Series) else choice
+               for choice in choices]
+    if isinstance(default, pd.Series):
+        default = default.to_numpy(dtype=object)
+    result = np.select(conditions, choices, default=default)
+    return pd.Series(result.astype(object), index=index)
+
+
+def _time_of_day(values):
+    """
+    Time of day of each value as a timedelta, NaT where it cannot be combined with a date.
+    Text must match TIME_TEXT_FORMAT and datetime.time objects are used as is; anything
+    else (numbers, full datetimes) cannot be combined. Each distinct value is parsed once.
+    """
+    codes, uniques = pd.factorize(values.astype(object))
+    uniques = pd.Series(uniques, dtype=object)
+    is_text = uniques.map(lambda value: isinstance(value, str)).astype(bool)
+    is_time = uniques.map(lambda value: isinstance(value, time)).astype(bool)
+
+    offsets = pd.Series(pd.NaT, index=uniques.index, dtype='timedelta64[ns]')
+    if is_text.any():
+        parsed = pd.to_datetime(uniques[is_text], format=TIME_TEXT_FORMAT, errors='coerce')
+        offsets[is_text] = parsed - parsed.dt.normalize()
+    if is_time.any():
+        offsets[is_time] = pd.to_timedelta(uniques[is_time].astype(str), errors='coerce')
+
+    result = offsets.to_numpy()[codes]
+    result[codes == -1] = np.timedelta64('NaT')
+    return pd.Series(result, index=values.index)
+
+
+def _compose_datetime(df, date_column, time_column, target_column):
+    """
+    Motor KPI: date + time of day (date only when the time cannot be used).
+    POG: date only. Everything else, and rows without a date (or Motor KPI rows
+    without a time), keep the existing target value.
+    """
+    source = df['SOURCE'].astype(object)
+    motor_kpi = source == 'Motor_KPI'
+    times = _column(df, time_column)
+
+    day = pd.to_datetime(_column(df, date_column), errors='coerce')
+    offset = _time_of_day(times).where(motor_kpi).fillna(pd.Timedelta(0))
+    composed = (day + offset).astype(object)
+
+    use = day.notna() & ((motor_kpi & times.notna()) | source.isin(POG_SOURCES))
+    return _column(df, target_column).mask(use, composed).infer_objects()
+
+# ============================================================================
+# RULES
+# ============================================================================
+
+def derive_motor_type2(df):
+    """
+    MOTOR_TYPE2 per source:
+    - Motor KPI: "MLA07" in SN -> CAM DD, else "TDI" in MOTOR_MAKE -> TDI CONV, else 3RD PARTY
+    - CAM Run Tracker: CAM RENTAL
+    - POG_CAM: JOB_TYPE contains RENTAL -> CAM RENTAL, DIRECTIONAL -> CAM DD, else blank
+    - POG_MM: TDI CONV
+    """
+    source = df['SOURCE'].astype(object)
+    motor_kpi = source == 'Motor_KPI'
+    pog_cam = source == 'POG_CAM_Usage'
+
+    mla07 = sn_keys(df)['SN_MLA07']
+    motor_make = _text(df, 'MOTOR_MAKE', upper=True)
+    job_type = _text(df, 'JOB_TYPE', upper=True, strip=True)
+
+    none = pd.Series(None, index=df.index, dtype=object)
+    return _select(
+        [
+            motor_kpi & mla07,
+            motor_kpi & motor_make.str.contains('TDI', regex=False),
+            motor_kpi,
+            source == 'CAM_Run_Tracker',
+            pog_cam & job_type.str.contains('RENTAL', regex=False),
+            pog_cam & job_type.str.contains('DIRECTIONAL', regex=False),
+            source == 'POG_MM_Usage',
+        ],
+        ['CAM DD', 'TDI CONV', '3RD PARTY', 'CAM RENTAL', 'CAM RENTAL', 'CAM DD', 'TDI CONV'],
+        none,
+    )
+
+
+def derive_job_type(df):
+    """
+    JOB_TYPE per source: Motor KPI -> Directional, CAM Run Tracker -> Rental.
+    Other sources keep their value, cleaned: MWD -> Rental,
+    "Directional- MWD and Motor" -> Directional, exact case for Directional/Rental.
+    Blank POG values become Rental.
+    """
+    source = df['SOURCE'].astype(object)
+    job_type = _column(df, 'JOB_TYPE')
+    present = job_type.notna()
+
+    text = job_type.astype(str).str.strip().astype(object)
+    upper = text.str.upper()
+    cleaned = _select(
+        [
+            upper == 'MWD',
+            text.str.contains('Directional- MWD and Motor', regex=False),
+            upper == 'DIRECTIONAL',
+            upper == 'RENTAL',
+        ],
+        ['Rental', 'Directional', 'Directional', 'Rental'],
+        text,
+    )
+
+    return _select(
+        [
+            source == 'Motor_KPI',
+            source == 'CAM_Run_Tracker',
+            present,
+            source.isin(POG_SOURCES),
+        ],
+        ['Directional', 'Rental', cleaned, 'Rental'],
+        job_type,
+    )
+
+
+def derive_dds(df):
+    """
+    DDS per source: Motor KPI -> SDT, POG -> Other,
+    CAM Run Tracker -> first word (letters only) of the existing value.
+    """
+    source = df['SOURCE'].astype(object)
+    dds = _column(df, 'DDS')
+
+    first_word = dds.astype(str).str.strip().str.extract(r'^([A-Za-z]+)', expand=False)
+    cam_value = first_word.astype(object).where(first_word.notna() & dds.notna(), dds)
+
+    return _select(
+        [
+            source == 'Motor_KPI',
+            source == 'CAM_Run_Tracker',
+            source.isin(POG_SOURCES),
+        ],
+        ['SDT', cam_value, 'Other'],
+        dds.where(dds.notna(), None),
+    )
+
+
+def derive_motor_model(df):
+    """
+    MOTOR_MODEL per source:
+    - Motor KPI: TDI motors take the model from the SN (first known model number),
+      other makes use MOTOR_OD; otherwise the existing value is kept
+    - CAM Run Tracker: keep existing
+    - POG: tool size converted to a model number (5 -> 500, 6-1/2 -> 650, ...)
+    """
+    source = df['SOURCE'].astype(object)
+    motor_kpi = source == 'Motor_KPI'
+    motor_model = _column(df, 'MOTOR_MODEL')
+
+    tdi = _text(df, 'MOTOR_MAKE', upper=True).str.contains('TDI', regex=False)
+    sn_model = sn_keys(df)['SN_MODEL']
+
+    motor_od = _column(df, 'MOTOR_OD')
+    motor_od_text = motor_od.astype(str).str.strip().astype(object)
+
+    pog_text = motor_model.astype(str).str.strip().astype(object)
+    pog_value = pog_text.replace(POG_MODEL_CONVERSIONS)
+
+    none = pd.Series(None, index=df.index, dtype=object)
+    pog = source.isin(POG_SOURCES)
+    return _select(
+        [
+            motor_kpi & tdi & sn_model.notna(),
+            motor_kpi & tdi,
+            motor_kpi & motor_od.notna(),
+            motor_kpi,
+            pog & motor_model.notna(),
+            pog,
+        ],
+        [sn_model, motor_model, motor_od_text, motor_model, pog_value, none],
+        motor_model,
+    )
+
+
+def derive_start_date(df):
+    """
+    START_DATE per source: Motor KPI combines DATE_IN + TIME_IN ('09:00:00' text or a
+    time), falling back to DATE_IN alone; POG uses DATE_IN; CAM Run Tracker is unchanged.
+    DATE_IN must already be formatted as dates.
+    """
+    return _compose_datetime(df, 'DATE_IN', 'TIME_IN', 'START_DATE')
+
+
+def derive_end_date(df):
+    """END_DATE from DATE_OUT + TIME_OUT, same rules as derive_start_date"""
+    return _compose_datetime(df, 'DATE_OUT', 'TIME_OUT', 'END_DATE')
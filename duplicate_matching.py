@@ -0,0 +1,505 @@
+"""
+Duplicate Matching
+Matches POG runs against the reference runs (Motor KPI, CAM Run Tracker) for
+the duplicate cleaner (clean_duplicates.py).
+
+A POG run is a duplicate of a reference run with the same JOB_NUM and the same
+last SN digits (both blank also counts as the same) when:
+- Total Hrs (C+D) are within the tolerance, or, when both runs have no hours,
+  TOTAL_DRILL is within the tolerance; or
+- its SN digits are not blank and its hours (or drill, when either side has no
+  hours) are within the tolerance of the SUM over all those reference runs
+  (one POG row recording several reference runs combined).
+
+The cleaners used to filter the whole reference frame by JOB_NUM for every POG
+row and then walk the matches with iterrows(). Here the reference runs are
+grouped once by (JOB_NUM, SN_LAST_3) into arrays. The run-by-run rule is a
+tolerance join: reference runs are sorted by (group, hours) and the runs within
+the tolerance of each POG run are found with binary searches, so only pairs
+that can match are ever built; TOTAL_DRILL (both runs without hours) is a
+second join of the same kind. The group sums used by the combined-runs rule
+depend only on the reference side, so they are aggregated once per group
+(hours, drill, run count) and checked for all POG rows in a single lookup
+instead of being re-summed for every POG row.
+
+Optionally (max_subset_runs), a POG run whose hours match the sum of only SOME
+(two or more) of the reference runs of its group is a duplicate too: each
+group's runs are split in two halves, all subset sums of each half are listed
+once, and the two lists are joined on the tolerance (meet in the middle).
+Groups with more runs than the cap are skipped, so one check never lists more
+than about 2 x 2**(cap / 2) sums.
+
+Optionally (date_slack), only reference runs whose DATE_IN..DATE_OUT days
+overlap the POG run's days (within date_slack days) can match it. Overlapping
+runs are found with a sweep over the reference intervals sorted by (group,
+first day), and only those pairs reach the hours comparison; the sums of the
+combined-runs rules then cover the overlapping runs only. Runs without dates
+overlap everything, so they are matched as before.
+
+POG runs are only ever compared with reference runs of the same JOB_NUM, so
+the rows can also be split into JOB_NUM shards and matched in parallel worker
+processes (flag_pog_duplicates_parallel) with the same result.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+HOURS_COLUMN = 'Total Hrs (C+D)'
+DRILL_COLUMN = 'TOTAL_DRILL'
+
+# Largest reference group searched for partial combined runs (2 x 2**6 subset sums);
+# also the largest max_subset_runs accepted, since memory grows as 2**(runs / 2)
+MAX_SUBSET_RUNS = 12
+
+# Day number standing in for a missing date: an undated run overlaps every run
+# (finite, because the sorted joins cannot order infinities)
+UNBOUNDED_DAYS = 1e9
+
+# Columns the matching reads; only these are sent to worker processes
+MATCH_COLUMNS = ['SOURCE', 'JOB_TYPE', 'JOB_NUM', 'SN_LAST_3', HOURS_COLUMN, DRILL_COLUMN, 'DATE_IN', 'DATE_OUT']
+
+# ============================================================================
+# REFERENCE INDEX
+# ============================================================================
+
+def _numbers(df, column):
+    """Column as a float array, blanks as 0"""
+    return pd.to_numeric(df[column], errors='coerce').fillna(0).to_numpy(dtype=float)
+
+
+def _days(df, column):
+    """Dates of a column as day numbers (float), NaN where blank or missing"""
+    if column not in df.columns:
+        return np.full(len(df), np.nan)
+    dates = pd.to_datetime(df[column], errors='coerce').dt.normalize()
+    return ((dates - pd.Timestamp('1970-01-01')) / pd.Timedelta(days=1)).to_numpy(dtype=float)
+
+
+def day_intervals(df):
+    """
+    (first day, last day) of each run from DATE_IN and DATE_OUT. A missing date
+    takes the other one; a run with neither spans every day.
+    """
+    start = _days(df, 'DATE_IN')
+    end = _days(df, 'DATE_OUT')
+    start, end = np.where(np.isnan(start), end, start), np.where(np.isnan(end), start, end)
+    start = np.where(np.isnan(start), -UNBOUNDED_DAYS, start)
+    end = np.where(np.isnan(end), UNBOUNDED_DAYS, end)
+    return np.minimum(start, end), np.maximum(start, end)
+
+
+def _group_keys(df):
+    """(JOB_NUM, SN_LAST_3) per row; None for rows without a JOB_NUM (they never match)"""
+    return [None if pd.isna(job_num) or job_num == '' else (job_num, sn_last)
+            for job_num, sn_last in zip(df['JOB_NUM'], df['SN_LAST_3'])]
+
+
+def build_reference_index(reference_df):
+    """
+    Group reference runs once by (JOB_NUM, SN_LAST_3).
+
+    Returns:
+        Dictionary with:
+        - group_ids: (JOB_NUM, SN_LAST_3) -> group id
+        - codes, hours, drill, start, end, labels: group id, hours, drill, first
+          and last day (day_intervals) and index label of each grouped run
+        - aggregates: DataFrame by group id of JOB_NUM, SN_LAST_3, HOURS_SUM,
+          DRILL_SUM and RUNS (blank hours/drill count as 0)
+    """
+    group_ids = {}
+    codes = np.array([-1 if key is None else group_ids.setdefault(key, len(group_ids))
+                      for key in _group_keys(reference_df)], dtype=int)
+    hours = _numbers(reference_df, HOURS_COLUMN)
+    drill = _numbers(reference_df, DRILL_COLUMN)
+    start, end = day_intervals(reference_df)
+
+    grouped = codes >= 0
+    aggregates = pd.DataFrame({
+        'JOB_NUM': [key[0] for key in group_ids],
+        'SN_LAST_3': [key[1] for key in group_ids],
+        'HOURS_SUM': np.bincount(codes[grouped], weights=hours[grouped], minlength=len(group_ids)),
+        'DRILL_SUM': np.bincount(codes[grouped], weights=drill[grouped], minlength=len(group_ids)),
+        'RUNS': np.bincount(codes[grouped], minlength=len(group_ids)),
+    })
+    return {'group_ids': group_ids, 'codes': codes[grouped], 'hours': hours[grouped],
+            'drill': drill[grouped], 'start': start[grouped], 'end': end[grouped],
+            'labels': reference_df.index[grouped], 'aggregates': aggregates}
+
+# ============================================================================
+# TOLERANCE JOIN
+# ============================================================================
+
+def _expand_windows(lo, hi):
+    """(query, sorted position) for every position in each query's window [lo, hi)"""
+    counts = np.maximum(hi - lo, 0)
+    queries = np.repeat(np.arange(len(lo)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return queries, np.repeat(lo, counts) + offsets
+
+
+def tolerance_join(left_codes, left_values, right_codes, right_values, tolerance):
+    """
+    Every (left, right) pair with the same code and values at most tolerance apart.
+
+    The right side is sorted by (code, value); each left row's window
+    [value - tolerance, value + tolerance] is located with two binary searches
+    and only the pairs inside it are built.
+
+    Returns:
+        (left positions, right positions) arrays
+    """
+    # Complex numbers sort by real part, then imaginary part, so code + value*1j
+    # sorts by (code, value) and one searchsorted finds a window within a code
+    right_keys = right_codes + 1j * right_values
+    order = np.argsort(right_keys, kind='stable')
+    right_keys = right_keys[order]
+
+    # The window is a little wider than the tolerance; the exact test below decides
+    reach = tolerance + 1e-9 * (np.abs(left_values) + tolerance)
+    lo = np.searchsorted(right_keys, left_codes + 1j * (left_values - reach), side='left')
+    hi = np.searchsorted(right_keys, left_codes + 1j * (left_values + reach), side='right')
+
+    left, right = _expand_windows(lo, hi)
+    right = order[right]
+
+    close = np.abs(left_values[left] - right_values[right]) <= tolerance
+    return left[close], right[close]
+
+
+def overlap_join(left_codes, left_start, left_end, right_codes, right_start, right_end, slack=0):
+    """
+    Every (left, right) pair with the same code whose day intervals overlap, or
+    are at most slack days apart.
+
+    The right intervals are sorted by (code, first day): the runs of a code that
+    start no later than a left interval's last day (+ slack) are one window from
+    the start of the code, and only those are checked for ending late enough.
+
+    Returns:
+        (left positions, right positions) arrays, sorted by left position
+    """
+    right_keys = right_codes + 1j * right_start
+    order = np.argsort(right_keys, kind='stable')
+    right_keys = right_keys[order]
+
+    lo = np.searchsorted(right_codes[order], left_codes, side='left')
+    hi = np.searchsorted(right_keys, left_codes + 1j * (left_end + slack), side='right')
+    left, right = _expand_windows(lo, hi)
+    right = order[right]
+
+    overlap = right_end[right] + slack >= left_start[left]
+    return left[overlap], right[overlap]
+
+# ============================================================================
+# MATCHING
+# ============================================================================
+
+def _close_to_sum(hours, drill, sum_hours, sum_drill, tolerance):
+    """Hours within tolerance of sum_hours, or drill of sum_drill when either side has no hours"""
+    use_hours = (hours > 0) & (sum_hours > 0)
+    return np.where(use_hours,
+                    np.abs(hours - sum_hours) <= tolerance,
+                    (drill > 0) & (sum_drill > 0) & (np.abs(drill - sum_drill) <= tolerance))
+
+
+def match_combined_runs(codes, hours, drill, sn_last, aggregates, tolerance):
+    """
+    Combined-runs rule for all candidates at once: hours (or drill, when either
+    side has no hours) within tolerance of the reference group's sum.
+
+    Args:
+        codes: Reference group id per candidate, -1 where there is none
+        hours, drill: Candidate hours and drill arrays (blanks as 0)
+        sn_last: Candidate SN_LAST_3 array; blank SN digits never match this rule
+        aggregates: The aggregates table of the reference index
+
+    Returns:
+        Boolean array
+    """
+    found = codes >= 0
+    sum_hours = np.zeros(len(codes))
+    sum_drill = np.zeros(len(codes))
+    sum_hours[found] = aggregates['HOURS_SUM'].to_numpy()[codes[found]]
+    sum_drill[found] = aggregates['DRILL_SUM'].to_numpy()[codes[found]]
+
+    return found & (sn_last != '') & _close_to_sum(hours, drill, sum_hours, sum_drill, tolerance)
+
+
+def match_runs(codes, hours, drill, reference_index, tolerance):
+    """
+    Run-by-run rule for all candidates at once: a reference run of the same group
+    with hours within tolerance (unless neither run has hours), or, when neither
+    run has hours, drill within tolerance (unless neither has drill).
+
+    Args:
+        codes: Reference group id per candidate, -1 where there is none
+        hours, drill: Candidate hours and drill arrays (blanks as 0)
+        reference_index: Result of build_reference_index
+
+    Returns:
+        Boolean array
+    """
+    ref_codes = reference_index['codes']
+    ref_hours = reference_index['hours']
+    ref_drill = reference_index['drill']
+    matched = np.zeros(len(codes), dtype=bool)
+
+    left, right = tolerance_join(codes, hours, ref_codes, ref_hours, tolerance)
+    by_hours = (hours[left] > 0) | (ref_hours[right] > 0)
+    matched[left[by_hours]] = True
+
+    # TOTAL_DRILL fallback: only pairs where neither run has hours
+    ref_no_hours = ref_hours <= 0
+    left, right = tolerance_join(np.where(hours <= 0, codes, -1), drill, ref_codes[ref_no_hours],
+                                 ref_drill[ref_no_hours], tolerance)
+    by_drill = (drill[left] > 0) | (ref_drill[ref_no_hours][right] > 0)
+    matched[left[by_drill]] = True
+
+    return matched
+
+
+def match_overlapping_runs(pairs, hours, drill, sn_last, reference_index, tolerance):
+    """
+    Run-by-run and combined-runs rules restricted to date-overlapping runs.
+
+    Args:
+        pairs: (candidate positions, reference positions) from overlap_join
+        hours, drill: Candidate hours and drill arrays (blanks as 0)
+        sn_last: Candidate SN_LAST_3 array
+
+    Returns:
+        Boolean array
+    """
+    left, right = pairs
+    ref_hours = reference_index['hours'][right]
+    ref_drill = reference_index['drill'][right]
+    matched = np.zeros(len(hours), dtype=bool)
+
+    has_hours = (hours[left] > 0) | (ref_hours > 0)
+    has_drill = (drill[left] > 0) | (ref_drill > 0)
+    close = np.where(has_hours,
+                     np.abs(hours[left] - ref_hours) <= tolerance,
+                     has_drill & (np.abs(drill[left] - ref_drill) <= tolerance))
+    matched[left[close]] = True
+
+    # Combined runs: sums over the overlapping runs of each candidate
+    found = np.bincount(left, minlength=len(hours)) > 0
+    sum_hours = np.bincount(left, weights=ref_hours, minlength=len(hours))
+    sum_drill = np.bincount(left, weights=ref_drill, minlength=len(hours))
+    matched |= found & (sn_last != '') & _close_to_sum(hours, drill, sum_hours, sum_drill, tolerance)
+
+    return matched
+
+
+def _subset_sums(values):
+    """Sum and run count of every subset of values; subset k holds run i when bit i of k is set"""
+    bits = (np.arange(2 ** len(values))[:, None] >> np.arange(len(values))) & 1
+    return bits @ values, bits.sum(axis=1)
+
+
+def _prepare_subsets(values):
+    """Subset sums of the two halves of values, the second half sorted, for best_subset"""
+    half = len(values) // 2
+    sums_a, runs_a = _subset_sums(values[:half])
+    sums_b, runs_b = _subset_sums(values[half:])
+    order = np.argsort(sums_b, kind='stable')
+    return {'half': half, 'size': len(values), 'sums_a': sums_a, 'runs_a': runs_a,
+            'sums_b': sums_b[order], 'runs_b': runs_b[order], 'subsets_b': order}
+
+
+def best_subset(prepared, target, tolerance):
+    """
+    Subset of at least two runs whose sum is within tolerance of target; the
+    closest sum wins, then the fewest runs.
+
+    Every subset is a subset of the first half plus one of the second half, so
+    for each first-half sum the matching second-half sums are one binary-search
+    window in the sorted second-half list.
+
+    Returns:
+        Array of run positions (into the values given to _prepare_subsets), or None
+    """
+    sums_a, sums_b = prepared['sums_a'], prepared['sums_b']
+    reach = tolerance + 1e-9 * (abs(target) + tolerance)
+    lo = np.searchsorted(sums_b, target - reach - sums_a, side='left')
+    hi = np.searchsorted(sums_b, target + reach - sums_a, side='right')
+    subsets_a, positions_b = _expand_windows(lo, hi)
+
+    error = np.abs(sums_a[subsets_a] + sums_b[positions_b] - target)
+    runs = prepared['runs_a'][subsets_a] + prepared['runs_b'][positions_b]
+    valid = np.flatnonzero((error <= tolerance) & (runs >= 2))
+    if len(valid) == 0:
+        return None
+
+    best = valid[np.lexsort((runs[valid], error[valid]))[0]]
+    subset = subsets_a[best] | (prepared['subsets_b'][positions_b[best]] << prepared['half'])
+    return np.flatnonzero((subset >> np.arange(prepared['size'])) & 1)
+
+
+def match_partial_runs(codes, hours, drill, sn_last, reference_index, tolerance, unmatched, max_runs,
+                       pairs=None):
+    """
+    Partial combined runs: candidate hours (drill when it has no hours) within
+    tolerance of the sum of some, but at least two, reference runs of its group.
+    Like the combined-runs rule, it needs SN digits. Only unmatched candidates with
+    3 to max_runs runs to choose from are searched (2 is the combined-runs rule).
+
+    Args:
+        pairs: (candidate positions, reference positions) sorted by candidate,
+            the runs each candidate may combine (date-overlap mode); by default
+            the whole group
+
+    Returns:
+        DataFrame POSITION (candidate position), JOB_NUM, SN_LAST_3, BY (hours or
+        drill), TARGET, MATCHED_SUM, REFERENCE_ROWS (list of reference index labels)
+    """
+    aggregates = reference_index['aggregates']
+
+    # Runs to choose from: the members of a group (shared by its candidates), or
+    # each candidate's own overlapping runs
+    if pairs is None:
+        ref_codes = reference_index['codes']
+        members = np.argsort(ref_codes, kind='stable')
+        owners = ref_codes[members]
+        keys = codes
+    else:
+        owners, members = pairs
+        keys = np.arange(len(codes))
+    starts = np.searchsorted(owners, keys, side='left')
+    ends = np.searchsorted(owners, keys, side='right')
+    run_counts = np.where(codes >= 0, ends - starts, 0)
+
+    searched = unmatched & (sn_last != '') & (run_counts >= 3) & (run_counts <= max_runs)
+    searched &= (hours > 0) | (drill > 0)
+
+    prepared = {}
+    rows = []
+    for position in np.flatnonzero(searched):
+        code = codes[position]
+        by = 'hours' if hours[position] > 0 else 'drill'
+        target = hours[position] if by == 'hours' else drill[position]
+        runs = members[starts[position]:ends[position]]
+        if (keys[position], by) not in prepared:
+            prepared[(keys[position], by)] = _prepare_subsets(reference_index[by][runs])
+        subset = best_subset(prepared[(keys[position], by)], target, tolerance)
+        if subset is not None:
+            rows.append((position, aggregates.at[code, 'JOB_NUM'], aggregates.at[code, 'SN_LAST_3'], by, target,
+                         reference_index[by][runs[subset]].sum(), list(reference_index['labels'][runs[subset]])))
+
+    return pd.DataFrame(rows, columns=['POSITION', 'JOB_NUM', 'SN_LAST_3', 'BY', 'TARGET', 'MATCHED_SUM',
+                                       'REFERENCE_ROWS'])
+
+
+def find_duplicates(candidates, reference_index, tolerance, max_subset_runs=None, date_slack=None):
+    """
+    Duplicate flag for every candidate (POG) row.
+
+    Args:
+        candidates: DataFrame with JOB_NUM, SN_LAST_3, Total Hrs (C+D), TOTAL_DRILL
+        reference_index: Result of build_reference_index
+        tolerance: Largest hours/drill difference that still matches
+        max_subset_runs: Also match partial combined runs in groups of up to this
+            many reference runs, at most MAX_SUBSET_RUNS (None: off)
+        date_slack: Only match reference runs whose dates overlap the candidate's,
+            or are at most this many days apart (None: dates are not compared)
+
+    Returns:
+        (boolean Series aligned with candidates.index,
+         DataFrame of the partial combined-run matches, see match_partial_runs)
+    """
+    if max_subset_runs is not None and max_subset_runs > MAX_SUBSET_RUNS:
+        raise ValueError(f"max_subset_runs {max_subset_runs} is above the limit of {MAX_SUBSET_RUNS} runs")
+
+    group_ids = reference_index['group_ids']
+    codes = np.array([-1 if key is None else group_ids.get(key, -1)
+                      for key in _group_keys(candidates)], dtype=int)
+    hours = _numbers(candidates, HOURS_COLUMN)
+    drill = _numbers(candidates, DRILL_COLUMN)
+    sn_last = candidates['SN_LAST_3'].to_numpy(dtype=object)
+
+    if date_slack is None:
+        pairs = None
+        flags = (match_combined_runs(codes, hours, drill, sn_last, reference_index['aggregates'], tolerance)
+                 | match_runs(codes, hours, drill, reference_index, tolerance))
+    else:
+        start, end = day_intervals(candidates)
+        pairs = overlap_join(codes, start, end, reference_index['codes'], reference_index['start'],
+                             reference_index['end'], date_slack)
+        flags = match_overlapping_runs(pairs, hours, drill, sn_last, reference_index, tolerance)
+
+    partial = match_partial_runs(codes, hours, drill, sn_last, reference_index, tolerance,
+                                 unmatched=~flags, max_runs=max_subset_runs or 0, pairs=pairs)
+    positions = partial.pop('POSITION').to_numpy(dtype=int)
+    flags[positions] = True
+    partial.insert(0, 'POG_ROW', candidates.index[positions])
+
+    return pd.Series(flags, index=candidates.index), partial
+
+
+def flag_pog_duplicates(df, tolerance, max_subset_runs=None, date_slack=None):
+    """
+    Check POG CAM and POG MM rows against the reference for their JOB_TYPE:
+    Directional -> Motor KPI, Rental -> CAM Run Tracker.
+
+    Args:
+        df: Merged data with SN_LAST_3
+        tolerance: Largest hours/drill difference that still matches
+        max_subset_runs: Also match partial combined runs (see find_duplicates)
+        date_slack: Require overlapping dates (see find_duplicates)
+
+    Returns:
+        (directional: boolean Series aligned with df, True for Directional POG duplicates,
+         rental: boolean Series aligned with df, True for Rental POG duplicates,
+         partial: DataFrame of the partial combined-run matches with their JOB_TYPE)
+    """
+    source = df['SOURCE'].astype(object)
+    job_type = df['JOB_TYPE'].astype(object) if 'JOB_TYPE' in df.columns else pd.Series('', index=df.index)
+    pog = source.isin(['POG_CAM_Usage', 'POG_MM_Usage'])
+
+    flags = {}
+    partial = []
+    for name, reference_source in [('Directional', 'Motor_KPI'), ('Rental', 'CAM_Run_Tracker')]:
+        reference_index = build_reference_index(df[source == reference_source])
+        candidates = df[pog & (job_type == name)]
+        found, matches = find_duplicates(candidates, reference_index, tolerance, max_subset_runs, date_slack)
+        flags[name] = found.reindex(df.index, fill_value=False)
+        partial.append(matches.assign(JOB_TYPE=name))
+
+    return flags['Directional'], flags['Rental'], pd.concat(partial, ignore_index=True)
+
+# ============================================================================
+# PARALLEL MATCHING
+# ============================================================================
+
+def shard_by_job(df, shards):
+    """
+    Shard number of each row from the hash of its JOB_NUM (equal JOB_NUMs, e.g.
+    123 and 123.0, always land in the same shard); -1 for rows without a JOB_NUM.
+    """
+    return np.array([-1 if pd.isna(job_num) or job_num == '' else hash(job_num) % shards
+                     for job_num in df['JOB_NUM']], dtype=int)
+
+
+def flag_pog_duplicates_parallel(df, tolerance, workers=None, max_subset_runs=None, date_slack=None):
+    """
+    flag_pog_duplicates with the rows split into one JOB_NUM shard per worker
+    process. Rows without a JOB_NUM never match and are not sent anywhere.
+
+    Returns:
+        (directional, rental, partial), as flag_pog_duplicates
+    """
+    workers = workers or os.cpu_count() or 1
+    columns = [column for column in MATCH_COLUMNS if column in df.columns]
+    shard = shard_by_job(df, workers)
+    parts = [df.loc[shard == number, columns] for number in range(workers)]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(flag_pog_duplicates, parts, [tolerance] * workers,
+                                    [max_subset_runs] * workers, [date_slack] * workers))
+
+    directional = pd.concat([result[0] for result in results]).reindex(df.index, fill_value=False)
+    rental = pd.concat([result[1] for result in results]).reindex(df.index, fill_value=False)
+    partial = pd.concat([result[2] for result in results], ignore_index=True)
+    return directional.astype(bool), rental.astype(bool), partial
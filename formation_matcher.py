@@ -0,0 +1,137 @@
+"""
+Formation Matcher
+FORM_FAM lookup from the FORM_FAM sheet of LISTS_BASIN AND FORM_FAM.xlsx.
+
+A row's formation family is the family of the first keyword (in sheet order)
+of the row's basin that appears anywhere in its FORMATION text. The lookup used
+to test every (basin, keyword) pair of the sheet against every merged row.
+
+Here the keywords of each basin are compiled once into an Aho-Corasick
+automaton (a keyword trie with failure links). One pass over a formation string
+finds every keyword it contains, so the cost grows with the length of the
+string, not with the number of keywords. Each node also remembers the earliest
+keyword (in sheet order) that ends there or at any of its suffixes, which keeps
+the "first keyword in sheet order wins" rule without collecting all matches.
+Each distinct (BASIN, FORMATION) pair is resolved once and broadcast back.
+"""
+
+from collections import deque
+import pandas as pd
+from text_normalization import as_text, map_distinct
+
+# Joins BASIN and FORMATION into one key per row (never part of the text itself)
+KEY_SEPARATOR = '\x1f'
+
+# ============================================================================
+# AUTOMATON
+# ============================================================================
+
+def build_keyword_automaton(keywords):
+    """
+    Compile keywords into an Aho-Corasick automaton.
+
+    Args:
+        keywords: List of (keyword, value) in priority order (first wins)
+
+    Returns:
+        Dictionary with:
+        - goto: per node, {character: next node}
+        - fail: per node, the node of its longest proper suffix in the trie
+        - best: per node, (priority, value) of the earliest keyword ending at the
+          node or at one of its suffixes, or None
+    """
+    goto = [{}]
+    best = [None]
+
+    for priority, (keyword, value) in enumerate(keywords):
+        node = 0
+        for char in keyword:
+            if char not in goto[node]:
+                goto.append({})
+                best.append(None)
+                goto[node][char] = len(goto) - 1
+            node = goto[node][char]
+        if best[node] is None or priority < best[node][0]:
+            best[node] = (priority, value)
+
+    # Breadth-first, so a node's failure target is finished before the node
+    fail = [0] * len(goto)
+    queue = deque(goto[0].values())
+    while queue:
+        node = queue.popleft()
+        for char, child in goto[node].items():
+            target = fail[node]
+            while target and char not in goto[target]:
+                target = fail[target]
+            fail[child] = goto[target].get(char, 0)
+
+            inherited = best[fail[child]]
+            if inherited is not None and (best[child] is None or inherited[0] < best[child][0]):
+                best[child] = inherited
+            queue.append(child)
+
+    return {'goto': goto, 'fail': fail, 'best': best}
+
+
+def first_keyword_value(automaton, text):
+    """Value of the earliest-priority keyword contained in text, or None"""
+    goto, fail, best = automaton['goto'], automaton['fail'], automaton['best']
+
+    # best[0] is only set by an empty keyword, which every string contains
+    found = best[0]
+    node = 0
+    for char in text:
+        while node and char not in goto[node]:
+            node = fail[node]
+        node = goto[node].get(char, 0)
+        candidate = best[node]
+        if candidate is not None and (found is None or candidate[0] < found[0]):
+            found = candidate
+            if found[0] == 0:
+                break
+
+    return found[1] if found is not None else None
+
+# ============================================================================
+# FORM_FAM LOOKUP
+# ============================================================================
+
+def build_formfam_index(formfam_df):
+    """
+    One automaton per basin from the FORM_FAM sheet (columns Basin, Keyword,
+    Formation Family). Basins and keywords are matched upper-case. A repeated
+    (basin, keyword) keeps its first position and its last Formation Family.
+    """
+    formfam_dict = {}
+    for basin, keyword, form_fam in zip(formfam_df['Basin'], formfam_df['Keyword'],
+                                        formfam_df['Formation Family']):
+        formfam_dict[(str(basin).upper(), str(keyword).upper())] = form_fam
+
+    keywords_by_basin = {}
+    for (basin, keyword), form_fam in formfam_dict.items():
+        keywords_by_basin.setdefault(basin, []).append((keyword, form_fam))
+
+    return {basin: build_keyword_automaton(keywords) for basin, keywords in keywords_by_basin.items()}
+
+
+def lookup_form_fam(df, formfam_index):
+    """
+    FORM_FAM for every row of df from its BASIN and FORMATION.
+    Rows missing either, or with no keyword match, get None.
+    """
+    basin = as_text(df['BASIN']).str.upper()
+    formation = as_text(df['FORMATION']).str.upper()
+    keys = basin + KEY_SEPARATOR + formation
+
+    def resolve(pairs):
+        parts = pairs.str.split(KEY_SEPARATOR, n=1, expand=True)
+        values = []
+        for pair_basin, pair_formation in zip(parts[0], parts[1]):
+            automaton = formfam_index.get(pair_basin)
+            values.append(first_keyword_value(automaton, pair_formation) if automaton else None)
+        return pd.Series(values, index=pairs.index, dtype=object)
+
+    if keys.notna().sum() == 0:
+        return pd.Series(None, index=df.index, dtype=object)
+    form_fam = map_distinct(keys, resolve)
+    return form_fam.astype(object).where(keys.notna(), None)
@@ -11,6 +11,7 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 import warnings
+from operator_names import load_operator_index, canonicalize_operators
 warnings.filterwarnings('ignore')
 
 # ============================================================================
@@ -29,34 +30,6 @@ MAPPING_FILE = 'FORMAT GRAL TABLE.xlsx'
 BASIN_LOOKUP_FILE = 'LISTS_BASIN AND FORM_FAM.xlsx'
 OUTPUT_FILE = f'MERGED_DATA_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
 
-# Operator name standardization mapping (CAM Run Tracker -> Standard names)
-OPERATOR_MAPPING = {
-    'Aethon Energy': 'Aethon Energy Operating, LLC',
-    'BPX': 'BPX Operating Company',
-    'COMSTOCK RESOURCES': 'Comstock Oil & Gas LLP',
-    'Camino': 'Camino Resources',
-    'Caturus Energy': 'CATURUS ENERGY, LLC',
-    'Comstock': 'Comstock Oil & Gas LLP',
-    'Comstock Resources': 'Comstock Oil & Gas LLP',
-    'Conoco': 'Conoco Phillips',
-    'ConocoPhillips': 'Conoco Phillips',
-    'Coterra': 'COTERRA',
-    'Devon': 'Devon Energy',
-    'Discovery': 'DISCOVERY NATURAL RESOURCES',
-    'Exxon': 'EXXON',
-    'Fervo': 'FERVO ENERGY COMPANY',
-    'Greenlake Energy': 'GREENLAKE ENERGY',
-    'Logos Operating LLC': 'LOGOS OPERATING LLC',
-    'Mewbourne': 'Mewbourne Oil Company',
-    'Mitsui': 'MITSUI E&P USA LLC',
-    'Ovintiv': 'Ovintiv USA',
-    'Oxy': 'OXY USA',
-    'Oxy EOR': 'OXY USA',
-    'Petro-Hunt': 'PETRO-HUNT',
-    'Summit': 'Summit Petroleum',
-    'XTO': 'EXXON',
-}
-
 # ============================================================================
 # STEP 1: Load Mapping Configuration
 # ============================================================================
@@ -379,7 +352,10 @@ def clean_county_names(df, source_name):
 # ============================================================================
 
 def standardize_operator_names(df, source_name):
-    """Standardize operator names for CAM Run Tracker data"""
+    """
+    Standardize operator names for CAM Run Tracker data, with the same
+    OPERATOR_MAPPING_FINAL.xlsx index as merge_excel_files_auto.py (operator_names.py)
+    """
     if 'OPERATOR' not in df.columns:
         return df
 
@@ -387,20 +363,11 @@ def standardize_operator_names(df, source_name):
     if source_name == 'CAM_Run_Tracker':
         print(f"  Standardizing operator names...")
 
-        # Count changes before
-        original_names = df['OPERATOR'].value_counts()
-        changes_made = 0
-
-        # Apply mapping
-        for old_name, new_name in OPERATOR_MAPPING.items():
-            mask = df['OPERATOR'] == old_name
-            count = mask.sum()
-            if count > 0:
-                df.loc[mask, 'OPERATOR'] = new_name
-                changes_made += 1
-                print(f"    {old_name} -> {new_name} ({count} records)")
+        df['OPERATOR'], changes = canonicalize_operators(df['OPERATOR'], load_operator_index())
+        for old_name, new_name, count in changes.itertuples(index=False, name=None):
+            print(f"    {old_name} -> {new_name} ({count} records)")
 
-        print(f"  Total operator names standardized: {changes_made}")
+        print(f"  Total operator names standardized: {len(changes)}")
 
     return df
 
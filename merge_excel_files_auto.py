@@ -28,6 +28,20 @@ from datetime import datetime
 import warnings
 import os
 import glob
+import argparse
+import io
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+from source_cache import read_excel_cached
+from spreadsheet_readers import read_sheet, resolve_backend, benchmark_backends, EXCEL_BACKENDS
+from column_types import load_column_types, apply_column_types_with_report
+from derivations import (derive_motor_type2, derive_job_type, derive_dds, derive_motor_model,
+                         derive_start_date, derive_end_date)
+from serial_numbers import add_serial_number_keys, SN_KEY_COLUMNS
+from text_normalization import split_county_state, combine_lobe_stage, parse_my_values, as_text
+from formation_matcher import build_formfam_index, lookup_form_fam
+from operator_names import (load_operator_index, canonicalize_operators, unmapped_operator_suggestions,
+                            apply_operator_suggestions, OPERATOR_MAPPING_FILE)
 warnings.filterwarnings('ignore')
 
 # ============================================================================
@@ -46,6 +60,43 @@ MAPPING_FILE = 'FORMAT GRAL TABLE.xlsx'
 BASIN_LOOKUP_FILE = 'LISTS_BASIN AND FORM_FAM.xlsx'
 OUTPUT_FILE = f'MERGED_DATA_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
 
+# Parsed source sheets are cached in .merge_cache (see source_cache.py)
+# Bump READER_VERSION whenever a reader changes what it returns for the same file
+READER_VERSION = 7
+
+# Sheet and header row of each source (header row None = detect it; some Motor KPI
+# exports have a title row above the headers, POG sheets have a blank row)
+SOURCE_SHEETS = {
+    'Motor_KPI': (0, None),
+    'CAM_Run_Tracker': ('General', 0),
+    'POG_CAM_Usage': ('POG Tool Usage', None),
+    'POG_MM_Usage': ('POG Tool Usage', None),
+}
+
+# Source columns the readers need beyond the mapped ones (special-case handling)
+# Keys match the SOURCE values in FORMAT GRAL TABLE
+READ_PLAN_AUX_COLUMNS = {
+    'Motor_KPI': ['BHA', 'DATEIN', 'DATEOUT', 'TIME_IN', 'TIME_OUT', 'BENDANGLE'],
+    'CAM Run Tracker': ['Section', 'Run #', 'Start of Run', 'End of Run', 'Bend'],
+    'POG_CAM_Usage': ['Brt Date', 'Art Date', 'Fixed', 'Adjustable', 'Job Type'],
+    'POG_MM_Usage': ['Brt Date', 'Art Date', 'Fixed', 'Adjustable', 'Job Type'],
+}
+
+# Sources whose OPERATOR names are standardized (--standardize-all-operators adds the rest)
+OPERATOR_SOURCES = ['CAM_Run_Tracker']
+
+# Operator names not in the mapping that standardize_operator_names lists with suggestions
+UNMAPPED_OPERATOR_REPORT_LIMIT = 20
+
+# County names without a state that clean_county_names lists (the rest are counted)
+UNMATCHED_COUNTY_REPORT_LIMIT = 10
+
+# Columns found by name pattern rather than exact name (lowercase substrings)
+# CAM Run Tracker: "Yield >45 Deg" / "Yield 0-45 Deg" spelling varies between files
+READ_PLAN_PATTERNS = {
+    'CAM Run Tracker': ['yield'],
+}
+
 # ============================================================================
 # AUTO-DETECT FILES
 # ============================================================================
@@ -88,46 +139,14 @@ def find_files():
     print("\nAll required files found successfully!\n")
     return found_files
 
-# ============================================================================
-# OPERATOR MAPPING
-# ============================================================================
-
-# Operator name standardization mapping (CAM Run Tracker -> Standard names)
-OPERATOR_MAPPING = {
-    'Aethon Energy': 'Aethon Energy Operating, LLC',
-    'BPX': 'BPX Operating Company',
-    'COMSTOCK RESOURCES': 'Comstock Oil & Gas LLP',
-    'Camino': 'Camino Resources',
-    'Caturus Energy': 'CATURUS ENERGY, LLC',
-    'Comstock': 'Comstock Oil & Gas LLP',
-    'Comstock Resources': 'Comstock Oil & Gas LLP',
-    'Conoco': 'Conoco Phillips',
-    'ConocoPhillips': 'Conoco Phillips',
-    'Coterra': 'COTERRA',
-    'Devon': 'Devon Energy',
-    'Discovery': 'DISCOVERY NATURAL RESOURCES',
-    'Exxon': 'EXXON',
-    'Fervo': 'FERVO ENERGY COMPANY',
-    'Greenlake Energy': 'GREENLAKE ENERGY',
-    'Logos Operating LLC': 'LOGOS OPERATING LLC',
-    'Mewbourne': 'Mewbourne Oil Company',
-    'Mitsui': 'MITSUI E&P USA LLC',
-    'Ovintiv': 'Ovintiv USA',
-    'Oxy': 'OXY USA',
-    'Oxy EOR': 'OXY USA',
-    'Petro-Hunt': 'PETRO-HUNT',
-    'Summit': 'Summit Petroleum',
-    'XTO': 'EXXON'
-}
-
 # ============================================================================
 # STEP 1: Load Mapping
 # ============================================================================
 
-def load_mapping():
+def load_mapping(reader_backend=None):
     """Load the mapping configuration from FORMAT GRAL TABLE"""
     print("Loading mapping configuration...")
-    df_mapping = pd.read_excel(MAPPING_FILE, sheet_name='Sheet1')
+    df_mapping = read_sheet(MAPPING_FILE, sheet_name='Sheet1', backend=reader_backend)
 
     # Create mapping dictionaries for each source
     mappings = {}
@@ -146,18 +165,50 @@ def load_mapping():
         print(f"  Loaded mappings for {source}")
         print(f"    {source}: {len(mapping)} mapped columns")
 
-    return mappings, target_headers
+    read_plans = build_read_plans(mappings, target_headers)
+
+    return mappings, target_headers, read_plans
+
+def build_read_plans(mappings, target_headers):
+    """
+    Build the per-source read plan: the only source columns the merge ever uses.
+
+    A plan holds:
+    - columns: mapped source columns + auxiliary columns used by the special-case
+      logic in the readers + any column already named like a target header
+    - patterns: lowercase substrings for columns matched by pattern (e.g. Yield)
+
+    Everything else in the sheet is dropped at read time.
+    """
+    read_plans = {}
+    for source, mapping in mappings.items():
+        columns = set(mapping.keys())
+        columns.update(READ_PLAN_AUX_COLUMNS.get(source, []))
+        columns.update(target_headers)
+        read_plans[source] = {
+            'columns': columns,
+            'patterns': READ_PLAN_PATTERNS.get(source, []),
+        }
+        print(f"    {source}: read plan keeps {len(mapping)} mapped + {len(READ_PLAN_AUX_COLUMNS.get(source, []))} auxiliary columns")
+    return read_plans
+
+def column_in_plan(col, read_plan):
+    """Check whether a source column is part of the read plan"""
+    if read_plan is None or col in read_plan['columns']:
+        return True
+    col_clean = str(col).strip().lower()
+    return any(pattern in col_clean for pattern in read_plan['patterns'])
 
 # ============================================================================
 # STEP 2: Load Lookup Tables
 # ============================================================================
 
-def load_lookup_tables():
+def load_lookup_tables(reader_backend=None):
     """Load basin and formation family lookup tables"""
     print("\nLoading lookup tables...")
 
     # Load Basin lookup
-    basin_df = pd.read_excel(BASIN_LOOKUP_FILE, sheet_name='Basin')
+    basin_df = read_sheet(BASIN_LOOKUP_FILE, sheet_name='Basin', backend=reader_backend)
 
     # Create a dictionary mapping county to basin
     # The Basin sheet has basin names as columns and counties as values
@@ -168,7 +219,7 @@ def load_lookup_tables():
             county_to_basin[str(county).strip().upper()] = basin_name
 
     # Load Formation Family lookup
-    df_formfam = pd.read_excel(BASIN_LOOKUP_FILE, sheet_name='FORM_FAM')
+    df_formfam = read_sheet(BASIN_LOOKUP_FILE, sheet_name='FORM_FAM', backend=reader_backend)
 
     print(f"  Loaded {len(county_to_basin)} county-to-basin mappings")
     print(f"  Loaded {len(df_formfam)} formation family mappings")
@@ -179,25 +230,36 @@ def load_lookup_tables():
 # STEP 3: Read Source Files
 # ============================================================================
 
-def read_motor_kpi(file_path, mapping):
+def read_source_sheet(file_path, source_name, use_cache=True, read_plan=None, reader_backend=None):
+    """
+    Read a source sheet, reusing the parsed frame from the cache when the file is unchanged.
+    The sheet and header row come from SOURCE_SHEETS; with a read plan, only planned
+    columns are read. The reader backend (see spreadsheet_readers.py) is part of the
+    cache key, so switching backends never mixes their frames.
+    """
+    sheet_name, header_row = SOURCE_SHEETS[source_name]
+    backend = resolve_backend(file_path, reader_backend)
+
+    if read_plan is None:
+        return read_excel_cached(file_path, sheet_name=sheet_name, reader_version=READER_VERSION,
+                                 use_cache=use_cache, reader=read_sheet,
+                                 header_row=header_row, backend=backend)
+
+    def usecols(col):
+        return column_in_plan(col, read_plan)
+
+    plan_signature = repr((sorted(map(str, read_plan['columns'])), read_plan['patterns']))
+    return read_excel_cached(file_path, sheet_name=sheet_name, reader_version=READER_VERSION,
+                             use_cache=use_cache, cache_extra=plan_signature, reader=read_sheet,
+                             header_row=header_row, backend=backend, usecols=usecols)
+
+def read_motor_kpi(file_path, mapping, use_cache=True, read_plan=None, reader_backend=None):
     """Read Motor KPI file"""
     print(f"\nReading Motor KPI file...")
-    df = pd.read_excel(file_path)
-    print(f"  Rows before cleaning: {len(df)}, Columns: {len(df.columns)}")
-
-    # Check if headers are in the first row (like POG files)
-    # If most columns are "Unnamed", headers are likely in first row
-    unnamed_count = sum(1 for col in df.columns if str(col).startswith('Unnamed'))
-    if unnamed_count > len(df.columns) * 0.5:  # More than 50% unnamed
-        print(f"  Detected headers in first row, restructuring...")
-        # The first row contains the actual headers
-        new_headers = df.iloc[0]
-        df = df[1:].copy()
-        df.columns = new_headers
-
-        # Remove any completely empty rows
-        df = df.dropna(how='all')
-        print(f"  Rows after cleaning: {len(df)}, Columns: {len(df.columns)}")
+    # Some exports have a title row above the headers; the reader detects the real
+    # header row and skips blank rows
+    df = read_source_sheet(file_path, 'Motor_KPI', use_cache, read_plan, reader_backend)
+    print(f"  Rows: {len(df)}, Columns: {len(df.columns)}")
 
     # Save original BHA column before renaming
     original_bha = df['BHA'].copy() if 'BHA' in df.columns else None
@@ -236,10 +298,10 @@ def read_motor_kpi(file_path, mapping):
 
     return df_renamed
 
-def read_cam_run_tracker(file_path, mapping):
+def read_cam_run_tracker(file_path, mapping, use_cache=True, read_plan=None, reader_backend=None):
     """Read CAM Run Tracker file"""
     print(f"\nReading CAM Run Tracker file...")
-    df = pd.read_excel(file_path, sheet_name='General')
+    df = read_source_sheet(file_path, 'CAM_Run_Tracker', use_cache, read_plan, reader_backend)
     print(f"  Rows: {len(df)}, Columns: {len(df.columns)}")
 
     # DEBUG: Check if Section column exists
@@ -361,21 +423,12 @@ def read_cam_run_tracker(file_path, mapping):
 
     return df_renamed
 
-def read_pog_cam_usage(file_path, mapping):
+def read_pog_cam_usage(file_path, mapping, use_cache=True, read_plan=None, reader_backend=None):
     """Read POG CAM Usage file"""
     print(f"\nReading POG CAM Usage file...")
-    df = pd.read_excel(file_path, sheet_name='POG Tool Usage')
-    print(f"  Rows before cleaning: {len(df)}")
-
-    # The first row contains the actual headers
-    new_headers = df.iloc[0]
-    df = df[1:].copy()
-    df.columns = new_headers
-
-    # Remove any completely empty rows
-    df = df.dropna(how='all')
-
-    print(f"  Rows after cleaning: {len(df)}, Columns: {len(df.columns)}")
+    # Headers sit below a blank row; the reader finds them and skips blank rows
+    df = read_source_sheet(file_path, 'POG_CAM_Usage', use_cache, read_plan, reader_backend)
+    print(f"  Rows: {len(df)}, Columns: {len(df.columns)}")
 
     # Rename columns according to mapping
     df_renamed = df.rename(columns=mapping)
@@ -410,21 +463,12 @@ def read_pog_cam_usage(file_path, mapping):
 
     return df_renamed
 
-def read_pog_mm_usage(file_path, mapping):
+def read_pog_mm_usage(file_path, mapping, use_cache=True, read_plan=None, reader_backend=None):
     """Read POG MM Usage file"""
     print(f"\nReading POG MM Usage file...")
-    df = pd.read_excel(file_path, sheet_name='POG Tool Usage')
-    print(f"  Rows before cleaning: {len(df)}")
-
-    # The first row contains the actual headers
-    new_headers = df.iloc[0]
-    df = df[1:].copy()
-    df.columns = new_headers
-
-    # Remove any completely empty rows
-    df = df.dropna(how='all')
-
-    print(f"  Rows after cleaning: {len(df)}, Columns: {len(df.columns)}")
+    # Headers sit below a blank row; the reader finds them and skips blank rows
+    df = read_source_sheet(file_path, 'POG_MM_Usage', use_cache, read_plan, reader_backend)
+    print(f"  Rows: {len(df)}, Columns: {len(df.columns)}")
 
     # Rename columns according to mapping
     df_renamed = df.rename(columns=mapping)
@@ -472,48 +516,31 @@ def clean_county_names(df, source_name):
     if source_name in ['Motor_KPI', 'POG_CAM_Usage', 'POG_MM_Usage']:
         print(f"  Extracting STATE from county and cleaning county names...")
 
-        import re
-
-        def extract_state_and_clean_county(county_str):
-            if pd.isna(county_str):
-                return None, None
-
-            county_str = str(county_str).strip()
+        # Parsed once per distinct county (see text_normalization.py)
+        original_counties = df['COUNTY'].copy()
+        parts = split_county_state(original_counties)
 
-            # Extract state (last 2 capital letters)
-            state_match = re.search(r'\b([A-Z]{2})$', county_str)
-            state = state_match.group(1) if state_match else None
-
-            # Clean county name
-            # Remove "County", "Parish", and state abbreviation
-            cleaned = county_str
-            cleaned = re.sub(r'\s+County\s*', ' ', cleaned, flags=re.IGNORECASE)
-            cleaned = re.sub(r'\s+Parish\s*', ' ', cleaned, flags=re.IGNORECASE)
-            if state:
-                cleaned = re.sub(r'\s+' + state + r'\s*$', '', cleaned)
-
-            return state, cleaned.strip()
-
-        # Extract states and clean counties
-        states = []
-        cleaned_counties = []
-
-        for county in df['COUNTY']:
-            state, cleaned = extract_state_and_clean_county(county)
-            states.append(state)
-            cleaned_counties.append(cleaned)
-
-        # Update STATE column
+        # Update STATE column (parts shares df's index, so the fill lines up row by row)
         if 'STATE' in df.columns:
-            df['STATE'] = df['STATE'].fillna(pd.Series(states))
+            df['STATE'] = df['STATE'].fillna(parts['STATE'])
         else:
-            df['STATE'] = states
+            df['STATE'] = parts['STATE']
 
         # Update COUNTY column
-        df['COUNTY'] = cleaned_counties
+        df['COUNTY'] = parts['COUNTY']
+
+        print(f"    Extracted STATE for {parts['STATE'].notna().sum()} records")
+        print(f"    Cleaned {len(df)} county names")
 
-        print(f"    Extracted STATE for {sum(1 for s in states if s is not None)} records")
-        print(f"    Cleaned {len(cleaned_counties)} county names")
+        # Report counties that still have no STATE
+        unmatched = original_counties[original_counties.notna() & df['STATE'].isna()]
+        if len(unmatched) > 0:
+            unmatched_counts = as_text(unmatched).str.strip().value_counts()
+            print(f"    No STATE found for {len(unmatched)} records ({len(unmatched_counts)} county names):")
+            for county, count in unmatched_counts.head(UNMATCHED_COUNTY_REPORT_LIMIT).items():
+                print(f"      '{county}' ({count} records)")
+            if len(unmatched_counts) > UNMATCHED_COUNTY_REPORT_LIMIT:
+                print(f"      ... and {len(unmatched_counts) - UNMATCHED_COUNTY_REPORT_LIMIT} more")
 
         # Print sample
         print(f"    Sample results:")
@@ -527,29 +554,49 @@ def clean_county_names(df, source_name):
 # STEP 5: Standardize Operator Names
 # ============================================================================
 
-def standardize_operator_names(df, source_name):
-    """Standardize operator names for CAM Run Tracker data"""
+def standardize_operator_names(df, source_name, operator_index=None, operator_sources=None,
+                               auto_map_threshold=None):
+    """
+    Standardize operator names (CAM Run Tracker only, unless operator_sources says otherwise).
+    Names are looked up by normalized key in OPERATOR_MAPPING_FINAL.xlsx (see operator_names.py).
+    Names not in the mapping are listed with their closest standard names; with
+    auto_map_threshold, the best candidate is applied when its score reaches it.
+    """
     if 'OPERATOR' not in df.columns:
         return df
 
-    # Only apply mapping to CAM Run Tracker data
-    if source_name == 'CAM_Run_Tracker':
+    if source_name in (operator_sources or OPERATOR_SOURCES):
         print(f"  Standardizing operator names...")
 
-        # Count changes before
-        original_names = df['OPERATOR'].value_counts()
-        changes_made = 0
-
-        # Apply mapping
-        for old_name, new_name in OPERATOR_MAPPING.items():
-            mask = df['OPERATOR'] == old_name
-            count = mask.sum()
-            if count > 0:
-                df.loc[mask, 'OPERATOR'] = new_name
-                changes_made += 1
-                print(f"    {old_name} -> {new_name} ({count} records)")
-
-        print(f"  Total operator names standardized: {changes_made}")
+        if operator_index is None:
+            operator_index = load_operator_index()
+
+        df['OPERATOR'], changes = canonicalize_operators(df['OPERATOR'], operator_index)
+        for old_name, new_name, count in changes.itertuples(index=False, name=None):
+            print(f"    {old_name} -> {new_name} ({count} records)")
+
+        print(f"  Total operator names standardized: {len(changes)}")
+
+        # Names not in OPERATOR_MAPPING_FINAL.xlsx, with the closest standard names
+        suggestions = unmapped_operator_suggestions(df['OPERATOR'], operator_index)
+        unmapped_names = list(dict.fromkeys(suggestions['NAME']))
+        if unmapped_names:
+            print(f"  Operator names not in {OPERATOR_MAPPING_FILE}: {len(unmapped_names)} (closest standard names)")
+            for name in unmapped_names[:UNMAPPED_OPERATOR_REPORT_LIMIT]:
+                rows = suggestions[suggestions['NAME'] == name]
+                candidates = ', '.join(f"{candidate} ({score:.2f})"
+                                       for candidate, score in zip(rows['CANDIDATE'], rows['SCORE'])
+                                       if pd.notna(candidate))
+                print(f"    {name} ({rows['RECORDS'].iloc[0]} records): {candidates or 'no close match'}")
+            if len(unmapped_names) > UNMAPPED_OPERATOR_REPORT_LIMIT:
+                print(f"    ... and {len(unmapped_names) - UNMAPPED_OPERATOR_REPORT_LIMIT} more")
+
+            if auto_map_threshold is not None:
+                df['OPERATOR'], applied = apply_operator_suggestions(df['OPERATOR'], suggestions,
+                                                                     auto_map_threshold)
+                for name, records, _, candidate, score in applied.itertuples(index=False, name=None):
+                    print(f"    Auto-mapped {name} -> {candidate} (score {score:.2f}, {records} records)")
+                print(f"  Auto-mapped operator names (score >= {auto_map_threshold}): {len(applied)}")
 
     return df
 
@@ -569,55 +616,11 @@ def format_dates_and_datetimes(df):
     print(f"  Formatted DATE_IN/DATE_OUT to date format")
 
     # Create START_DATE and END_DATE
+    # Motor KPI: DATE + TIME (date only if the time can't be used), POG: date only,
+    # CAM Run Tracker: already populated
     if 'START_DATE' in df.columns and 'END_DATE' in df.columns:
-        def create_start_date(row):
-            # For Motor KPI: combine DATE_IN + TIME_IN
-            if row['SOURCE'] in ['Motor_KPI']:
-                if pd.notna(row['DATE_IN']) and pd.notna(row.get('TIME_IN')):
-                    try:
-                        # TIME_IN might be a string like '09:00:00', convert to time object
-                        time_in = row['TIME_IN']
-                        if isinstance(time_in, str):
-                            # Parse string time to time object
-                            time_in = pd.to_datetime(time_in, format='%H:%M:%S').time()
-
-                        # Combine date and time
-                        return pd.Timestamp.combine(row['DATE_IN'], time_in)
-                    except Exception as e:
-                        # If combination fails, just use the date
-                        return pd.to_datetime(row['DATE_IN'])
-            # For POG files without time
-            elif row['SOURCE'] in ['POG_CAM_Usage', 'POG_MM_Usage']:
-                if pd.notna(row['DATE_IN']):
-                    return pd.to_datetime(row['DATE_IN'])
-            # For CAM Run Tracker, START_DATE already populated
-            return row['START_DATE']
-
-        def create_end_date(row):
-            # For Motor KPI: combine DATE_OUT + TIME_OUT
-            if row['SOURCE'] in ['Motor_KPI']:
-                if pd.notna(row['DATE_OUT']) and pd.notna(row.get('TIME_OUT')):
-                    try:
-                        # TIME_OUT might be a string like '10:00:00', convert to time object
-                        time_out = row['TIME_OUT']
-                        if isinstance(time_out, str):
-                            # Parse string time to time object
-                            time_out = pd.to_datetime(time_out, format='%H:%M:%S').time()
-
-                        # Combine date and time
-                        return pd.Timestamp.combine(row['DATE_OUT'], time_out)
-                    except Exception as e:
-                        # If combination fails, just use the date
-                        return pd.to_datetime(row['DATE_OUT'])
-            # For POG files without time
-            elif row['SOURCE'] in ['POG_CAM_Usage', 'POG_MM_Usage']:
-                if pd.notna(row['DATE_OUT']):
-                    return pd.to_datetime(row['DATE_OUT'])
-            # For CAM Run Tracker, END_DATE already populated
-            return row['END_DATE']
-
-        df['START_DATE'] = df.apply(create_start_date, axis=1)
-        df['END_DATE'] = df.apply(create_end_date, axis=1)
+        df['START_DATE'] = derive_start_date(df)
+        df['END_DATE'] = derive_end_date(df)
 
         print(f"  Created START_DATE/END_DATE from date+time combinations")
 
@@ -635,62 +638,12 @@ def populate_lobe_stage_and_dds(df):
 
     # Handle LOBE/STAGE column
     if 'LOBE/STAGE' in df.columns and 'LOBES' in df.columns and 'STAGES' in df.columns:
-        def combine_lobe_stage(row):
-            # For Motor KPI and POG files, combine LOBES + ":" + STAGES
-            # LOBES should be like "6/7" and STAGES should be like "7.8"
-            # Result: "6/7:7.8"
-            if row['SOURCE'] in ['Motor_KPI', 'POG_CAM_Usage', 'POG_MM_Usage']:
-                lobe = row['LOBES']
-                stage = row['STAGES']
-                if pd.notna(lobe) and pd.notna(stage):
-                    # Convert to string and ensure proper format
-                    lobe_str = str(lobe).strip()
-                    stage_str = str(stage).strip()
-
-                    # If LOBES already contains ":", it might be formatted wrong
-                    # We want LOBE/STAGE format (e.g., "6/7"), not LOBES:STAGES
-                    # Remove any existing ":" from lobe if present
-                    if ':' in lobe_str:
-                        # This means LOBES was mistakenly formatted as "6:7" instead of "6/7"
-                        lobe_str = lobe_str.replace(':', '/')
-
-                    return f"{lobe_str}:{stage_str}"
-            # CAM Run Tracker: replace "-" with ":" to match format
-            elif row['SOURCE'] == 'CAM_Run_Tracker':
-                if pd.notna(row['LOBE/STAGE']):
-                    return str(row['LOBE/STAGE']).replace('-', ':')
-            return row['LOBE/STAGE']
-
-        df['LOBE/STAGE'] = df.apply(combine_lobe_stage, axis=1)
+        df['LOBE/STAGE'] = combine_lobe_stage(df)
         print(f"  Combined LOBES and STAGES into LOBE/STAGE column")
 
-    # Handle DDS column
+    # Handle DDS column (Motor KPI=SDT, POG=Other, CAM=first word of the DDS name)
     if 'DDS' in df.columns:
-        def populate_dds(row):
-            source = row['SOURCE']
-
-            # Motor KPI: Always "SDT"
-            if source == 'Motor_KPI':
-                return 'SDT'
-
-            # CAM Run Tracker: Keep as is (extract first complete word/company name)
-            elif source == 'CAM_Run_Tracker':
-                if pd.notna(row['DDS']):
-                    dds_value = str(row['DDS']).strip()
-                    # Extract first word before space or /
-                    import re
-                    match = re.match(r'^([A-Za-z]+)', dds_value)
-                    if match:
-                        return match.group(1)
-                return row['DDS']
-
-            # POG files: Always "Other"
-            elif source in ['POG_CAM_Usage', 'POG_MM_Usage']:
-                return 'Other'
-
-            return row['DDS'] if pd.notna(row['DDS']) else None
-
-        df['DDS'] = df.apply(populate_dds, axis=1)
+        df['DDS'] = derive_dds(df)
         print(f"  Populated DDS column (Motor KPI=SDT, POG=Other, CAM=Keep as is)")
 
     return df
@@ -762,41 +715,7 @@ def populate_motor_type2(df):
     - All -> "TDI CONV"
     """
     if 'MOTOR_TYPE2' in df.columns:
-        def determine_motor_type2(row):
-            source = row['SOURCE']
-
-            # Motor KPI logic
-            if source == 'Motor_KPI':
-                sn = str(row.get('SN', '')).upper() if pd.notna(row.get('SN')) else ''
-                motor_make = str(row.get('MOTOR_MAKE', '')).upper() if pd.notna(row.get('MOTOR_MAKE')) else ''
-
-                if 'MLA07' in sn:
-                    return 'CAM DD'
-                elif 'TDI' in motor_make and 'MLA07' not in sn:
-                    return 'TDI CONV'
-                else:
-                    return '3RD PARTY'
-
-            # CAM Run Tracker logic
-            elif source == 'CAM_Run_Tracker':
-                return 'CAM RENTAL'
-
-            # POG_CAM logic
-            elif source == 'POG_CAM_Usage':
-                job_type = str(row.get('JOB_TYPE', '')).strip().upper() if pd.notna(row.get('JOB_TYPE')) else ''
-                if 'RENTAL' in job_type:
-                    return 'CAM RENTAL'
-                elif 'DIRECTIONAL' in job_type:
-                    return 'CAM DD'
-                return None
-
-            # POG_MM logic
-            elif source == 'POG_MM_Usage':
-                return 'TDI CONV'
-
-            return None
-
-        df['MOTOR_TYPE2'] = df.apply(determine_motor_type2, axis=1)
+        df['MOTOR_TYPE2'] = derive_motor_type2(df)
         print(f"  Populated MOTOR_TYPE2 column based on source-specific logic")
 
     return df
@@ -816,45 +735,7 @@ def populate_and_clean_job_type(df):
     - Only two allowed values: "Directional" or "Rental"
     """
     if 'JOB_TYPE' in df.columns:
-        def clean_job_type(row):
-            source = row['SOURCE']
-            job_type = row.get('JOB_TYPE', None)
-
-            # Motor KPI: All are Directional
-            if source == 'Motor_KPI':
-                return 'Directional'
-
-            # CAM Run Tracker: All are Rental
-            if source == 'CAM_Run_Tracker':
-                return 'Rental'
-
-            # For POG files and other sources, clean the existing value
-            if pd.notna(job_type):
-                job_type_str = str(job_type).strip()
-
-                # Replace "MWD" with "Rental"
-                if job_type_str.upper() == 'MWD':
-                    return 'Rental'
-
-                # Replace "Directional- MWD and Motor" with "Directional"
-                if 'Directional- MWD and Motor' in job_type_str:
-                    return 'Directional'
-
-                # Standardize to exact case
-                if job_type_str.upper() == 'DIRECTIONAL':
-                    return 'Directional'
-                if job_type_str.upper() == 'RENTAL':
-                    return 'Rental'
-
-                return job_type_str
-
-            # POG files: If blank, set to "Rental"
-            if source in ['POG_CAM_Usage', 'POG_MM_Usage']:
-                return 'Rental'
-
-            return job_type
-
-        df['JOB_TYPE'] = df.apply(clean_job_type, axis=1)
+        df['JOB_TYPE'] = derive_job_type(df)
         print(f"  Populated and standardized JOB_TYPE (Motor KPI=Directional, CAM=Rental, POG blanks=Rental)")
 
     return df
@@ -884,67 +765,7 @@ def populate_motor_model(df):
       9-5/8 → 962
     """
     if 'MOTOR_MODEL' in df.columns:
-        def calculate_motor_model(row):
-            source = row['SOURCE']
-
-            # Motor KPI logic
-            if source == 'Motor_KPI':
-                motor_make = str(row.get('MOTOR_MAKE', '')).upper() if pd.notna(row.get('MOTOR_MAKE')) else ''
-
-                if 'TDI' in motor_make:
-                    # Extract model from SN (serial number)
-                    sn = str(row.get('SN', '')).upper() if pd.notna(row.get('SN')) else ''
-
-                    # Look for 3-digit numbers in SN that match motor models
-                    import re
-                    # Common TDI models: 475, 500, 575, 650, 712, 800, 962
-                    matches = re.findall(r'\b(475|500|575|650|712|800|962)\b', sn)
-                    if matches:
-                        return matches[0]  # Return first match
-
-                    # If no match found, return existing MOTOR_MODEL or None
-                    return row.get('MOTOR_MODEL')
-                else:
-                    # Not TDI, use MOTOR_OD
-                    motor_od = row.get('MOTOR_OD')
-                    if pd.notna(motor_od):
-                        return str(motor_od).strip()
-                    return row.get('MOTOR_MODEL')
-
-            # CAM Run Tracker: keep existing
-            elif source == 'CAM_Run_Tracker':
-                return row.get('MOTOR_MODEL')
-
-            # POG files: convert text to numbers
-            elif source in ['POG_CAM_Usage', 'POG_MM_Usage']:
-                motor_model = row.get('MOTOR_MODEL')
-                if pd.notna(motor_model):
-                    model_str = str(motor_model).strip()
-
-                    # Conversion mapping
-                    conversions = {
-                        '5': '500',
-                        '5-4/4': '575',
-                        '6-1/2': '650',
-                        '7-1/8': '712',
-                        '8': '800',
-                        '9-5/8': '962'
-                    }
-
-                    # Check for exact match
-                    if model_str in conversions:
-                        return conversions[model_str]
-
-                    # Check if already a number
-                    if model_str.isdigit():
-                        return model_str
-
-                    return model_str
-                return None
-
-            return row.get('MOTOR_MODEL')
-
-        df['MOTOR_MODEL'] = df.apply(calculate_motor_model, axis=1)
+        df['MOTOR_MODEL'] = derive_motor_model(df)
         print(f"  Populated MOTOR_MODEL based on source-specific logic")
 
     return df
@@ -965,53 +786,12 @@ def parse_my_column_text(df):
 
     Result must be numeric in merged file.
     """
-    import re
-
     if 'MY' not in df.columns:
         return df
 
     print("\nParsing MY column text for CAM Run Tracker rows...")
 
-    def parse_my_value(row):
-        # Only process CAM Run Tracker rows
-        if row['SOURCE'] != 'CAM_Run_Tracker':
-            return row['MY']
-
-        my_value = row['MY']
-
-        # If already numeric or empty, return as is
-        if pd.isna(my_value):
-            return my_value
-
-        # Convert to string for processing
-        my_str = str(my_value).strip()
-
-        # If it's already a number, return it
-        try:
-            return float(my_str)
-        except ValueError:
-            pass
-
-        # Pattern 1: Single number with 's' or 'S' (e.g., "18s", "18S")
-        # Match: number followed by optional 's' or 'S'
-        pattern1 = r'^(\d+(?:\.\d+)?)[sS]?$'
-        match1 = re.match(pattern1, my_str, re.IGNORECASE)
-        if match1:
-            return float(match1.group(1))
-
-        # Pattern 2: Range with "to" (e.g., "11s to 15s", "11 to 15")
-        # Match: number (optional s) + "to" + number (optional s)
-        pattern2 = r'^(\d+(?:\.\d+)?)[sS]?\s+to\s+(\d+(?:\.\d+)?)[sS]?$'
-        match2 = re.match(pattern2, my_str, re.IGNORECASE)
-        if match2:
-            num1 = float(match2.group(1))
-            num2 = float(match2.group(2))
-            return (num1 + num2) / 2.0
-
-        # If no pattern matched, return original value (leave as is)
-        return my_value
-
-    df['MY'] = df.apply(parse_my_value, axis=1)
+    df['MY'] = parse_my_values(df)
     print(f"  Parsed MY column text patterns for CAM Run Tracker rows")
 
     return df
@@ -1028,37 +808,13 @@ def populate_bha_and_run_num(df):
     - Keep existing values if present
     """
 
-    # Handle BHA column
-    if 'BHA' in df.columns:
-        def populate_bha(row):
-            source = row['SOURCE']
-            bha = row.get('BHA', None)
-
-            # If blank or NaN, set to 1
-            if pd.isna(bha) or bha == '':
-                return 1
-
-            # Keep existing value
-            return bha
-
-        df['BHA'] = df.apply(populate_bha, axis=1)
-        print(f"  Populated BHA column (blanks set to 1)")
-
-    # Handle RUN_NUM column
-    if 'RUN_NUM' in df.columns:
-        def populate_run_num(row):
-            source = row['SOURCE']
-            run_num = row.get('RUN_NUM', None)
-
-            # If blank or NaN, set to 1
-            if pd.isna(run_num) or run_num == '':
-                return 1
-
-            # Keep existing value
-            return run_num
-
-        df['RUN_NUM'] = df.apply(populate_run_num, axis=1)
-        print(f"  Populated RUN_NUM column (blanks set to 1)")
+    for column in ['BHA', 'RUN_NUM']:
+        if column in df.columns:
+            # If blank or NaN, set to 1; keep existing values
+            values = df[column].astype(object)
+            blank = values.isna() | (values == '')
+            df[column] = values.mask(blank, 1).infer_objects()
+            print(f"  Populated {column} column (blanks set to 1)")
 
     return df
 
@@ -1108,73 +864,122 @@ def apply_basin_lookup(df, county_to_basin):
 def apply_formfam_lookup(df, formfam_df):
     """Apply formation family lookup"""
     if 'FORMATION' in df.columns and 'BASIN' in df.columns and 'FORM_FAM' in df.columns:
-        # Create lookup dictionary
-        formfam_dict = {}
-        for _, row in formfam_df.iterrows():
-            key = (str(row['Basin']).upper(), str(row['Keyword']).upper())
-            formfam_dict[key] = row['Formation Family']
-
-        def get_form_fam(row):
-            if pd.isna(row['FORMATION']) or pd.isna(row['BASIN']):
-                return None
+        # One keyword automaton per basin; first keyword in sheet order wins
+        formfam_index = build_formfam_index(formfam_df)
+        df['FORM_FAM'] = lookup_form_fam(df, formfam_index)
 
-            basin = str(row['BASIN']).upper()
-            formation = str(row['FORMATION']).upper()
+    return df
+
+# ============================================================================
+# SOURCE INGESTION (serial or parallel)
+# ============================================================================
 
-            # Look for keyword match in formation name
-            for (lookup_basin, keyword), form_fam in formfam_dict.items():
-                if lookup_basin == basin and keyword in formation:
-                    return form_fam
+# Sources in merge order: (FILES key / SOURCE value, key in FORMAT GRAL TABLE, reader)
+SOURCE_READERS = [
+    ('Motor_KPI', 'Motor_KPI', read_motor_kpi),
+    ('CAM_Run_Tracker', 'CAM Run Tracker', read_cam_run_tracker),
+    ('POG_CAM_Usage', 'POG_CAM_Usage', read_pog_cam_usage),
+    ('POG_MM_Usage', 'POG_MM_Usage', read_pog_mm_usage),
+]
+
+def read_and_clean_source(source_name, file_path, mapping, use_cache=True, read_plan=None, reader_backend=None,
+                          column_types=None, operator_index=None, operator_sources=None,
+                          auto_map_threshold=None):
+    """Read one source file, run its per-source cleaning chain and compact its column types"""
+    reader = {name: func for name, _, func in SOURCE_READERS}[source_name]
+    df = reader(file_path, mapping, use_cache, read_plan, reader_backend)
+    df = clean_county_names(df, source_name)
+    df = standardize_operator_names(df, source_name, operator_index, operator_sources, auto_map_threshold)
+    # Types are applied after the cleaning chain: it edits values in place,
+    # which categorical columns would reject
+    df = apply_column_types_with_report(df, column_types, source_name)
+    return df
 
-            return None
+def _run_captured(func, *args):
+    """
+    Run func in a worker process and capture its console output.
+    The parent prints each log in merge order, so parallel output reads like a serial run.
+    The returned frame travels back to the parent pickled.
+    """
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        result = func(*args)
+    return result, buffer.getvalue()
+
+def ingest_sources(FILES, mappings, read_plans=None, use_cache=True, parallel=False, workers=None,
+                   reader_backend=None, column_types=None, operator_index=None, operator_sources=None,
+                   auto_map_threshold=None):
+    """
+    Read and clean the four source files and load the lookup tables.
 
-        df['FORM_FAM'] = df.apply(get_form_fam, axis=1)
+    Serial mode runs each source in turn. Parallel mode runs every
+    read+clean chain and the lookup-table load in its own worker process,
+    so the total time is roughly the slowest single source instead of the sum.
 
-    return df
+    Returns:
+        (list of cleaned source frames in merge order, county_to_basin, formfam_df)
+    """
+    if not parallel:
+        county_to_basin, formfam_df = load_lookup_tables(reader_backend)
+        read_plans = read_plans or {}
+        dfs = [read_and_clean_source(name, FILES[name], mappings[mapping_key], use_cache,
+                                     read_plans.get(mapping_key), reader_backend, column_types,
+                                     operator_index, operator_sources, auto_map_threshold)
+               for name, mapping_key, _ in SOURCE_READERS]
+        return dfs, county_to_basin, formfam_df
+
+    read_plans = read_plans or {}
+    max_workers = workers or min(len(SOURCE_READERS) + 1, os.cpu_count() or 1)
+    print(f"\nReading source files in parallel ({max_workers} workers)...")
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        lookup_future = executor.submit(_run_captured, load_lookup_tables, reader_backend)
+        source_futures = [
+            executor.submit(_run_captured, read_and_clean_source,
+                            name, FILES[name], mappings[mapping_key], use_cache,
+                            read_plans.get(mapping_key), reader_backend, column_types,
+                            operator_index, operator_sources, auto_map_threshold)
+            for name, mapping_key, _ in SOURCE_READERS
+        ]
+
+        (county_to_basin, formfam_df), log = lookup_future.result()
+        print(log, end='')
+
+        dfs = []
+        for future in source_futures:
+            df, log = future.result()
+            print(log, end='')
+            dfs.append(df)
+
+    return dfs, county_to_basin, formfam_df
 
 # ============================================================================
 # STEP 5: Merge All Data
 # ============================================================================
 
-def merge_all_files(FILES):
+def merge_all_files(FILES, use_cache=True, parallel=False, workers=None, reader_backend=None,
+                    all_operators=False, auto_map_threshold=None):
     """Main function to merge all files"""
 
     print("="*80)
     print("EXCEL FILES MERGER - STARTING")
     print("="*80)
 
-    # Step 1: Load mapping
-    mappings, target_headers = load_mapping()
-
-    # Step 2: Load lookup tables
-    county_to_basin, formfam_df = load_lookup_tables()
+    # Step 1: Load mapping (and the per-source read plans derived from it)
+    mappings, target_headers, read_plans = load_mapping(reader_backend)
 
-    # Step 3: Read all source files
-    dfs = []
+    # Compact column types declared next to the mapping (COLUMN_TYPES.csv)
+    column_types = load_column_types()
 
-    # Motor KPI
-    df_motor = read_motor_kpi(FILES['Motor_KPI'], mappings['Motor_KPI'])
-    df_motor = clean_county_names(df_motor, 'Motor_KPI')
-    df_motor = standardize_operator_names(df_motor, 'Motor_KPI')
-    dfs.append(df_motor)
+    # Operator name index (OPERATOR_MAPPING_FINAL.xlsx), loaded once and shared with every source
+    operator_index = load_operator_index(use_cache=use_cache, reader_backend=reader_backend)
+    operator_sources = list(FILE_PATTERNS) if all_operators else OPERATOR_SOURCES
 
-    # CAM Run Tracker
-    df_cam = read_cam_run_tracker(FILES['CAM_Run_Tracker'], mappings['CAM Run Tracker'])
-    df_cam = clean_county_names(df_cam, 'CAM_Run_Tracker')
-    df_cam = standardize_operator_names(df_cam, 'CAM_Run_Tracker')
-    dfs.append(df_cam)
-
-    # POG CAM Usage
-    df_pog_cam = read_pog_cam_usage(FILES['POG_CAM_Usage'], mappings['POG_CAM_Usage'])
-    df_pog_cam = clean_county_names(df_pog_cam, 'POG_CAM_Usage')
-    df_pog_cam = standardize_operator_names(df_pog_cam, 'POG_CAM_Usage')
-    dfs.append(df_pog_cam)
-
-    # POG MM Usage
-    df_pog_mm = read_pog_mm_usage(FILES['POG_MM_Usage'], mappings['POG_MM_Usage'])
-    df_pog_mm = clean_county_names(df_pog_mm, 'POG_MM_Usage')
-    df_pog_mm = standardize_operator_names(df_pog_mm, 'POG_MM_Usage')
-    dfs.append(df_pog_mm)
+    # Step 2-3: Load lookup tables and read all source files
+    # Motor KPI, CAM Run Tracker, POG CAM Usage, POG MM Usage
+    dfs, county_to_basin, formfam_df = ingest_sources(FILES, mappings, read_plans, use_cache, parallel, workers,
+                                                      reader_backend, column_types, operator_index,
+                                                      operator_sources, auto_map_threshold)
 
     # Step 4: Concatenate all dataframes
     print("\n" + "="*80)
@@ -1197,6 +1002,14 @@ def merge_all_files(FILES):
     columns_to_keep = ['SOURCE'] + target_headers
     df_merged = df_merged[columns_to_keep]
 
+    # Concatenating sources with different categories falls back to object; restore the types
+    df_merged = apply_column_types_with_report(df_merged, column_types, 'merged')
+
+    # Serial-number keys (SN_SUFFIX, SN_MLA07, SN_MODEL), derived once
+    # and reused by MOTOR_TYPE2 and MOTOR_MODEL; in memory only, dropped before export
+    df_merged = add_serial_number_keys(df_merged)
+    print(f"\nAdded serial-number key columns: {', '.join(SN_KEY_COLUMNS)}")
+
     # Step 7: Apply lookups
     print("\nApplying lookup tables...")
     df_merged = apply_basin_lookup(df_merged, county_to_basin)
@@ -1241,6 +1054,14 @@ def merge_all_files(FILES):
     print("\nConverting numeric columns to text format...")
     df_merged = convert_to_text_format(df_merged)
 
+    # The serial-number keys are not part of the target format
+    df_merged = df_merged.drop(columns=SN_KEY_COLUMNS, errors='ignore')
+
+    # Steps that rebuild a column return plain object columns; restore the declared types.
+    # Numeric columns are coerced: numeric text becomes a number, other text is cleared and listed
+    print("\nApplying column types...")
+    df_merged = apply_column_types_with_report(df_merged, column_types, 'final', coerce=True)
+
     # Step 18: Export to Excel
     print("\n" + "="*80)
     print("EXPORTING RESULTS")
@@ -1369,11 +1190,45 @@ def merge_all_files(FILES):
 
     return df_merged
 
+# ============================================================================
+# READER BENCHMARK
+# ============================================================================
+
+def benchmark_readers(FILES, repeat=3):
+    """Time every reader backend on the source files found in this folder"""
+    sources = [(name, FILES[name], sheet_name, header_row)
+               for name, (sheet_name, header_row) in SOURCE_SHEETS.items()]
+    sources.append(('Mapping', MAPPING_FILE, 'Sheet1', 0))
+    return benchmark_backends(sources, repeat=repeat)
+
 # ============================================================================
 # MAIN EXECUTION
 # ============================================================================
 
+def parse_args():
+    """Parse command-line options (all optional; double-click runs with defaults)"""
+    parser = argparse.ArgumentParser(description="Merge Motor KPI, CAM Run Tracker and POG usage files")
+    parser.add_argument('command', nargs='?', default='merge', choices=['merge', 'benchmark-readers'],
+                        help="'merge' (default) or 'benchmark-readers' to time each reader backend")
+    parser.add_argument('--reader', default=None, choices=['auto'] + EXCEL_BACKENDS,
+                        help="Workbook reader backend (default: auto, or SCORECARD_READER if set)")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="Reads per backend for benchmark-readers (best time is reported)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Re-parse every source workbook instead of loading cached frames")
+    parser.add_argument('--parallel', action='store_true',
+                        help="Read and clean the source files in parallel worker processes")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Number of worker processes for --parallel (default: one per source, up to CPU count)")
+    parser.add_argument('--standardize-all-operators', action='store_true',
+                        help="Standardize OPERATOR names in every source, not only CAM Run Tracker")
+    parser.add_argument('--auto-map-operators', type=float, default=None, metavar='SCORE',
+                        help="Replace unmapped operator names with their best suggestion when its "
+                             "similarity (0-1) is at least SCORE, e.g. 0.85 (default: only list suggestions)")
+    return parser.parse_args()
+
 if __name__ == "__main__":
+    args = parse_args()
     try:
         # Auto-detect files
         FILES = find_files()
@@ -1388,9 +1243,17 @@ if __name__ == "__main__":
             print("  - FORMAT GRAL TABLE.xlsx")
             print("  - LISTS_BASIN AND FORM_FAM.xlsx")
             input("\nPress Enter to exit...")
+        elif args.command == 'benchmark-readers':
+            benchmark_readers(FILES, repeat=args.repeat)
+            print("\nBenchmark completed!")
+            input("\nPress Enter to exit...")
         else:
             # Run the merge
-            df_result = merge_all_files(FILES)
+            df_result = merge_all_files(FILES, use_cache=not args.no_cache,
+                                        parallel=args.parallel, workers=args.workers,
+                                        reader_backend=args.reader,
+                                        all_operators=args.standardize_all_operators,
+                                        auto_map_threshold=args.auto_map_operators)
             print("\nScript completed successfully!")
             input("\nPress Enter to exit...")
     except Exception as e:
@@ -1,5 +1,12 @@
-# Operator name standardization mapping
-# CAM Run Tracker names -> Standard names
+"""
+Operator Mapping (built-in fallback)
+CAM Run Tracker operator names -> standard names.
+
+OPERATOR_MAPPING_FINAL.xlsx is the source of the operator names; both merge
+scripts read it through operator_names.py. This dictionary is only used by
+operator_names.load_operator_mapping when that workbook is missing, so add new
+names to the workbook, not here.
+"""
 
 OPERATOR_MAPPING = {
     'Aethon Energy': 'Aethon Energy Operating, LLC',
@@ -0,0 +1,244 @@
+"""
+Operator Names
+Canonical operator names from OPERATOR_MAPPING_FINAL.xlsx.
+
+The workbook lists every operator spelling seen in CAM Run Tracker
+(CAM_Run_Tracker_Name) with its standard name (Standard_Name). It is turned
+into an index keyed on a normalized form of the name: upper case, punctuation
+and spaces removed, and legal suffixes (LLC, Inc, Company, ...) dropped from the
+end. "Aethon Energy Operating LLC", "AETHON ENERGY OPERATING, LLC" and
+"Aethon Energy Operating, LLC" all share one key. Standard names are indexed
+too, so a standard name in a different case or punctuation also resolves.
+
+Names are canonicalized once per distinct operator value and broadcast back,
+instead of building one boolean mask per mapping entry. When the workbook is
+missing, the built-in mapping in operator_mapping_dict.py is used.
+
+Names that are not in the index get ranked suggestions from a character
+n-gram inverted index of the indexed names: only names sharing at least one
+n-gram with the new spelling are scored (Dice similarity of their n-gram
+sets), so new names are never compared with every known name.
+"""
+
+import os
+import re
+from collections import Counter
+import pandas as pd
+from source_cache import read_excel_cached
+from spreadsheet_readers import read_sheet, resolve_backend
+from operator_mapping_dict import OPERATOR_MAPPING
+from text_normalization import as_text, map_distinct
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+OPERATOR_MAPPING_FILE = 'OPERATOR_MAPPING_FINAL.xlsx'
+
+# Bump when load_operator_mapping changes what it reads from the workbook
+OPERATOR_MAPPING_VERSION = 4
+
+# Trailing words that do not distinguish one operator from another
+LEGAL_SUFFIXES = {'LLC', 'LLP', 'LP', 'LTD', 'INC', 'INCORPORATED', 'CO', 'COMPANY', 'CORP',
+                  'CORPORATION', 'PLC'}
+
+NON_ALPHANUMERIC_PATTERN = re.compile(r'[^0-9A-Z&]+')
+
+# Suggestions: n-gram length, candidates listed per name, lowest similarity listed
+NGRAM_SIZE = 3
+SUGGESTION_LIMIT = 3
+MIN_SUGGESTION_SCORE = 0.3
+
+# Loaded indexes by (path, modification time), so each process reads the workbook once
+_index_cache = {}
+
+# ============================================================================
+# INDEX
+# ============================================================================
+
+def normalize_operator_key(name):
+    """
+    Normalized lookup key for an operator name, e.g.
+    "Comstock Oil & Gas, LLP" -> "COMSTOCKOIL&GAS", "Petro-Hunt" -> "PETROHUNT".
+    A name made only of suffixes keeps them.
+    """
+    words = NON_ALPHANUMERIC_PATTERN.sub(' ', str(name).upper()).split()
+    end = len(words)
+    while end > 1 and words[end - 1] in LEGAL_SUFFIXES:
+        end -= 1
+    return ''.join(words[:end])
+
+
+def load_operator_mapping(file_path=OPERATOR_MAPPING_FILE, use_cache=True, reader_backend=None):
+    """
+    Load raw name -> standard name from the mapping workbook (first sheet).
+
+    Returns:
+        Dictionary in sheet order; the built-in OPERATOR_MAPPING when the file is missing
+    """
+    if not os.path.exists(file_path):
+        print(f"  WARNING: {file_path} not found, using the built-in operator mapping")
+        return dict(OPERATOR_MAPPING)
+
+    df_mapping = read_excel_cached(file_path, sheet_name=0, reader_version=OPERATOR_MAPPING_VERSION,
+                                   use_cache=use_cache, reader=read_sheet,
+                                   backend=resolve_backend(file_path, reader_backend))
+    mapping = {}
+    for name, standard in zip(df_mapping['CAM_Run_Tracker_Name'], df_mapping['Standard_Name']):
+        if pd.notna(name) and pd.notna(standard) and str(name).strip():
+            mapping[str(name).strip()] = str(standard).strip()
+    return mapping
+
+
+def build_operator_index(mapping):
+    """
+    Build the normalized-key index.
+
+    Returns:
+        (index: key -> standard name,
+         conflicts: list of (name, standard name ignored, standard name kept))
+    Raw names take precedence over standard names; within each, the first entry wins.
+    """
+    index = {}
+    conflicts = []
+    entries = list(mapping.items()) + [(standard, standard) for standard in mapping.values()]
+    for name, standard in entries:
+        key = normalize_operator_key(name)
+        if not key:
+            continue
+        if key not in index:
+            index[key] = standard
+        elif index[key] != standard and name in mapping:
+            conflicts.append((name, standard, index[key]))
+    return index, conflicts
+
+
+def load_operator_index(file_path=OPERATOR_MAPPING_FILE, use_cache=True, reader_backend=None):
+    """Load (once per process) and index the operator mapping"""
+    stamp = os.path.getmtime(file_path) if os.path.exists(file_path) else None
+    cache_key = (os.path.abspath(file_path), stamp)
+    if cache_key in _index_cache:
+        return _index_cache[cache_key]
+
+    mapping = load_operator_mapping(file_path, use_cache, reader_backend)
+    index, conflicts = build_operator_index(mapping)
+    print(f"  Loaded {len(mapping)} operator mappings ({len(index)} normalized names)")
+    for name, ignored, kept in conflicts:
+        print(f"    WARNING: '{name}' -> '{ignored}' ignored; same normalized name as '{kept}'")
+
+    _index_cache[cache_key] = index
+    return index
+
+# ============================================================================
+# APPLY
+# ============================================================================
+
+def canonicalize_operators(operators, index):
+    """
+    Standard name for each operator value, evaluated once per distinct value.
+
+    Returns:
+        (names: Series aligned with operators, unmapped values left as they are,
+         changes: DataFrame of OLD, NEW, RECORDS for every name that changed)
+    """
+    text = as_text(operators)
+    standard = map_distinct(text, lambda names: pd.Series(
+        [index.get(normalize_operator_key(name)) for name in names], index=names.index, dtype=object))
+
+    changed = standard.notna() & (standard != text)
+    names = operators.astype(object).mask(changed, standard)
+
+    changes = (pd.DataFrame({'OLD': text[changed], 'NEW': standard[changed]})
+               .groupby(['OLD', 'NEW'], sort=False).size().reset_index(name='RECORDS'))
+    return names, changes
+
+# ============================================================================
+# SUGGESTIONS FOR UNMAPPED NAMES
+# ============================================================================
+
+def name_ngrams(key):
+    """Character n-grams of a normalized key, with ^ and $ marking its start and end"""
+    padded = f'^{key}$'
+    return {padded[i:i + NGRAM_SIZE] for i in range(max(1, len(padded) - NGRAM_SIZE + 1))}
+
+
+def build_ngram_index(index):
+    """
+    Inverted n-gram index over the keys of an operator index.
+
+    Returns:
+        Dictionary with:
+        - standards: standard name of each key (by key id)
+        - sizes: number of n-grams of each key
+        - postings: n-gram -> list of key ids containing it
+    """
+    standards = []
+    sizes = []
+    postings = {}
+    for key_id, (key, standard) in enumerate(index.items()):
+        grams = name_ngrams(key)
+        standards.append(standard)
+        sizes.append(len(grams))
+        for gram in grams:
+            postings.setdefault(gram, []).append(key_id)
+    return {'standards': standards, 'sizes': sizes, 'postings': postings}
+
+
+def suggest_operator_names(name, ngram_index, limit=SUGGESTION_LIMIT, min_score=MIN_SUGGESTION_SCORE):
+    """
+    Closest standard names for an operator name.
+
+    Returns:
+        List of (standard name, score 0-1), best first; a standard name reached
+        through several keys keeps its best score
+    """
+    grams = name_ngrams(normalize_operator_key(name))
+    shared = Counter()
+    for gram in grams:
+        shared.update(ngram_index['postings'].get(gram, ()))
+
+    best = {}
+    for key_id, count in shared.items():
+        score = 2 * count / (len(grams) + ngram_index['sizes'][key_id])
+        standard = ngram_index['standards'][key_id]
+        if score >= min_score and score > best.get(standard, 0):
+            best[standard] = score
+
+    return sorted(best.items(), key=lambda item: (-item[1], item[0]))[:limit]
+
+
+def unmapped_operator_suggestions(operators, index, ngram_index=None):
+    """
+    Ranked suggestions for the operator values that are not in the index.
+
+    Returns:
+        DataFrame NAME, RECORDS, RANK, CANDIDATE, SCORE (one row per candidate,
+        most frequent names first); a name without candidates has one row with a
+        blank CANDIDATE
+    """
+    if ngram_index is None:
+        ngram_index = build_ngram_index(index)
+
+    text = as_text(operators)
+    counts = text.value_counts()
+    rows = []
+    for name, records in counts.items():
+        if normalize_operator_key(name) in index:
+            continue
+        candidates = suggest_operator_names(name, ngram_index) or [(None, float('nan'))]
+        for rank, (candidate, score) in enumerate(candidates, 1):
+            rows.append((name, records, rank, candidate, score))
+
+    return pd.DataFrame(rows, columns=['NAME', 'RECORDS', 'RANK', 'CANDIDATE', 'SCORE'])
+
+
+def apply_operator_suggestions(operators, suggestions, threshold):
+    """
+    Replace unmapped names whose best candidate scores at least threshold.
+
+    Returns:
+        (names: Series aligned with operators, applied: the suggestion rows used)
+    """
+    applied = suggestions[(suggestions['RANK'] == 1) & (suggestions['SCORE'] >= threshold)]
+    replacement = as_text(operators).map(dict(zip(applied['NAME'], applied['CANDIDATE'])))
+    return operators.astype(object).mask(replacement.notna(), replacement), applied
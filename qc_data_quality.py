@@ -5,11 +5,27 @@ Version: 1.0
 Date: 2025-10-31
 
 This script validates merged clean data against QC criteria.
+
+Each rule is compiled once into a validator and evaluated over its whole column
+with boolean masks (validate_data). The original cell-by-cell loop is kept as
+validate_data_by_row (--row-wise); verify_qc.py checks both give the same issues.
+Issues are kept as a boolean rows x columns matrix plus a table of their
+messages, so QC_FLAG and the issue counts are reductions over the matrix.
+Rules that depend only on the cell value (allowed lists, Number, limits, STATE,
+SOURCE, emptiness) are evaluated once per distinct value of the column.
+
+Usage:
+    python qc_data_quality.py
+    python qc_data_quality.py --row-wise
 """
 
+import argparse
+import time
+import numpy as np
 import pandas as pd
 from openpyxl import load_workbook
 from openpyxl.styles import PatternFill
+from spreadsheet_readers import read_sheet
 from datetime import datetime
 import glob
 import os
@@ -25,6 +41,12 @@ US_STATES = [
     "SD", "TN", "TX", "UT", "VT", "VA", "WA", "WV", "WI", "WY"
 ]
 
+SOURCES = ["Motor_KPI", "CAM_Run_Tracker", "POG_MM_Usage", "POG_CAM_Usage"]
+POG_SOURCES = ["POG_MM_Usage", "POG_CAM_Usage"]
+
+# Columns listed in the issue counts of the summary
+ISSUE_REPORT_LIMIT = 10
+
 
 def find_latest_clean_file():
     """Find the most recent MERGE_CLEAN_EXCEL_FILES_AUTO_*.xlsx file."""
@@ -40,216 +62,537 @@ def find_latest_clean_file():
 
 
 def load_qc_criteria():
-    """Load QC criteria from CELL QC CRITERIA.xlsx."""
+    """
+    Load QC criteria from CELL QC CRITERIA.xlsx and compile each rule once.
+
+    Returns: (rules: column name -> validator (see compile_rule), phase_map)
+    """
     criteria_file = "CELL QC CRITERIA.xlsx"
 
     if not os.path.exists(criteria_file):
         raise FileNotFoundError(f"QC criteria file not found: {criteria_file}")
 
     # Load both sheets
-    full_list = pd.read_excel(criteria_file, sheet_name="FULL LIST")
-    phase_equivalent = pd.read_excel(criteria_file, sheet_name="phase equivalent")
+    full_list = read_sheet(criteria_file, sheet_name="FULL LIST")
+    phase_equivalent = read_sheet(criteria_file, sheet_name="phase equivalent")
 
     print(f"Loaded {len(full_list)} column criteria from FULL LIST sheet")
     print(f"Loaded {len(phase_equivalent)} phase mappings from phase equivalent sheet")
 
-    # Create criteria dictionary: column_name -> validation_rule
-    criteria_dict = {}
-    for _, row in full_list.iterrows():
-        col_name = row["COLUMN NAME"]
-        valid_rule = row["VALID"]
+    # Compile the rules: column_name -> validator
+    rules = {}
+    for col_name, valid_rule in zip(full_list["COLUMN NAME"], full_list["VALID"]):
         if pd.notna(valid_rule) and str(valid_rule).strip():
-            criteria_dict[col_name] = str(valid_rule).strip()
+            rules[col_name] = compile_rule(col_name, str(valid_rule).strip())
 
     # Create phase mapping dictionary: PHASES -> Phase_CALC
     phase_map = {}
-    for _, row in phase_equivalent.iterrows():
-        phases = row["PHASES"]
-        phase_calc = row["Phase_CALC"]
+    for phases, phase_calc in zip(phase_equivalent["PHASES"], phase_equivalent["Phase_CALC"]):
         if pd.notna(phases) and pd.notna(phase_calc):
             phase_map[str(phases).strip()] = str(phase_calc).strip()
 
-    return criteria_dict, phase_map
+    return rules, phase_map
 
 
-def check_cell(value, rule, col_name, row_data):
+def compile_rule(col_name, rule):
     """
-    Validate a single cell value against its QC rule.
-
-    Returns: (is_valid, error_message)
+    Parse a free-text QC rule once into a validator.
+
+    Returns: dict with 'column', 'rule' (the text) and 'kind':
+      - phase: Phase_CALC must match PHASES through the phase map
+      - required_unless_source: non-empty unless SOURCE is in 'sources'
+      - required_in_sources: non-empty when SOURCE is in 'sources'
+      - required_if_cur: non-empty when Phase_CALC contains CUR ('motor_kpi_only')
+      - required_if_filled: non-empty when column 'other' is filled
+      - value: non-empty when 'required'; non-empty values must pass 'checks',
+        a list of (check, parameter) tried in order (see VALUE_CHECKS)
+    Rule text is tested exactly as check_cell used to test it for every cell.
     """
-    # Handle empty/null values first
-    is_empty = pd.isna(value) or str(value).strip() == ""
-
-    # Parse the rule
+    validator = {"column": col_name, "rule": rule}
     rule_upper = rule.upper()
 
-    # Check for source-specific "only empty in" requirements
-    source = row_data.get("SOURCE", "")
+    # Phase_CALC is checked against PHASES, whatever its rule text says
+    if col_name == "Phase_CALC":
+        return dict(validator, kind="phase")
 
-    # Handle "only empty in CAM_Run_tracker" validation
+    # "only empty in CAM_Run_tracker"
     if "only empty in CAM" in rule.lower() or "only empty in CAM_Run_tracker" in rule:
-        if source != "CAM_Run_Tracker" and is_empty:
-            return False, f"Required field (empty only allowed in CAM_Run_Tracker)"
-        return True, None
+        return dict(validator, kind="required_unless_source", sources=["CAM_Run_Tracker"],
+                    message="Required field (empty only allowed in CAM_Run_Tracker)")
 
-    # Handle "only empty in POG" validation
+    # "only empty in POG"
     if "only empty in POG" in rule:
-        if source not in ["POG_MM_Usage", "POG_CAM_Usage"] and is_empty:
-            return False, f"Required field (empty only allowed in POG files)"
-        return True, None
+        return dict(validator, kind="required_unless_source", sources=POG_SOURCES,
+                    message="Required field (empty only allowed in POG files)")
 
-    # Handle "only empty in CAM_run_tracker, POG_MM_Usage, POG_CAM_Usage"
+    # "only empty in CAM_run_tracker, POG_MM_Usage, POG_CAM_Usage"
     if "only empty in CAM_run_tracker, POG_MM_Usage, POG_CAM_Usage" in rule:
-        if source not in ["CAM_Run_Tracker", "POG_MM_Usage", "POG_CAM_Usage"] and is_empty:
-            return False, f"Required field (empty only allowed in CAM/POG files)"
-        return True, None
+        return dict(validator, kind="required_unless_source", sources=["CAM_Run_Tracker"] + POG_SOURCES,
+                    message="Required field (empty only allowed in CAM/POG files)")
 
-    # Handle "NON-BLANK in Motor KPI and CAM Run tracker, empty in POG files"
+    # "NON-BLANK in Motor KPI and CAM Run tracker, empty in POG files"
     if "Motor KPI and CAM Run tracker, empty in POG" in rule:
-        if source in ["Motor_KPI", "CAM_Run_Tracker"] and is_empty:
-            return False, f"Required for Motor_KPI and CAM_Run_Tracker"
-        return True, None
+        return dict(validator, kind="required_in_sources", sources=["Motor_KPI", "CAM_Run_Tracker"],
+                    message="Required for Motor_KPI and CAM_Run_Tracker")
 
-    # Check for NON-BLANK / NON EMPTY requirements
+    required = False
     if "NON-BLANK" in rule_upper or "NON EMPTY" in rule_upper:
-        # Check for conditional requirements
         if "IF" in rule_upper:
-            # Handle CUR-related fields: required if CUR in Phase_CALC (only for Motor_KPI)
+            # CUR-related fields: required if CUR in Phase_CALC (optionally only for Motor_KPI)
             if "CUR" in rule_upper and "PHASE_CALC" in rule_upper:
-                # Check if this is a Motor_KPI-only rule
-                if "only for Motor_KPI" in rule or "ONLY FOR MOTOR_KPI" in rule_upper:
-                    # Only validate for Motor_KPI rows
-                    if source != "Motor_KPI":
-                        return True, None
-
-                phase_calc = row_data.get("Phase_CALC", "")
-                if pd.notna(phase_calc) and "CUR" in str(phase_calc).upper():
-                    if is_empty:
-                        return False, "Required when CUR in Phase_CALC"
-                return True, None
-
-            # Handle REPORTED_AS rule: required if INCIDENT_NUM is non-blank
-            elif col_name == "REPORTED_AS":
-                incident_num = row_data.get("INCIDENT_NUM", "")
-                if pd.notna(incident_num) and str(incident_num).strip() != "":
-                    if is_empty:
-                        return False, "Required when INCIDENT_NUM is filled"
-                return True, None
+                return dict(validator, kind="required_if_cur",
+                            motor_kpi_only="only for Motor_KPI" in rule or "ONLY FOR MOTOR_KPI" in rule_upper)
+            # REPORTED_AS: required if INCIDENT_NUM is non-blank
+            if col_name == "REPORTED_AS":
+                return dict(validator, kind="required_if_filled", other="INCIDENT_NUM",
+                            message="Required when INCIDENT_NUM is filled")
+            # Any other conditional rule only checks non-empty values
         else:
-            # Unconditional non-blank requirement
-            if is_empty:
-                return False, "Required field is empty"
+            required = True
 
-    # If value is empty and not caught by above rules, it's OK
-    if is_empty:
-        return True, None
-
-    # Check numeric range validation (e.g., "<30000", "<600")
+    checks = []
+    # Numeric range (e.g., "<30000", "<600"); an unreadable limit fails every value
     if rule.startswith("<"):
         try:
-            threshold = float(rule[1:].strip())
-            cell_value = float(value)
-            if cell_value >= threshold:
-                return False, f"Value {cell_value} exceeds limit {threshold}"
-        except (ValueError, TypeError):
-            return False, f"Expected numeric value for range check"
-
-    # Check for list validation (comma-separated allowed values)
+            checks.append(("upper_bound", float(rule[1:].strip())))
+        except ValueError:
+            checks.append(("upper_bound", None))
+    # List of allowed values (comma-separated)
     if "," in rule and not rule_upper.startswith("NON"):
-        allowed_values = [v.strip() for v in rule.split(",")]
-        cell_value_str = str(value).strip()
-        if cell_value_str not in allowed_values:
-            return False, f"Value '{cell_value_str}' not in allowed list"
+        checks.append(("allowed", {v.strip() for v in rule.split(",")}))
+    if rule_upper == "NUMBER":
+        checks.append(("number", None))
+    if col_name == "STATE":
+        checks.append(("state", set(US_STATES)))
+    if col_name == "SOURCE":
+        checks.append(("source", set(SOURCES)))
 
-    # Check for "Number" type validation
-    if rule.upper() == "NUMBER":
-        try:
-            float(value)
-        except (ValueError, TypeError):
-            return False, f"Expected numeric value"
+    return dict(validator, kind="value", required=required, checks=checks)
 
-    # Check for state validation
-    if col_name == "STATE":
-        state_str = str(value).strip().upper()
-        if state_str not in US_STATES:
-            return False, f"Invalid state code: {state_str}"
 
-    # Special handling for SOURCE column validation
-    if col_name == "SOURCE":
-        valid_sources = ["Motor_KPI", "CAM_Run_Tracker", "POG_MM_Usage", "POG_CAM_Usage"]
-        cell_value_str = str(value).strip()
-        if cell_value_str not in valid_sources:
-            return False, f"Value '{cell_value_str}' not in allowed source list"
+def _check_upper_bound(value, threshold):
+    try:
+        if threshold is None:
+            raise ValueError("no limit")
+        cell_value = float(value)
+    except (ValueError, TypeError):
+        return "Expected numeric value for range check"
+    if cell_value >= threshold:
+        return f"Value {cell_value} exceeds limit {threshold}"
+    return None
+
+
+def _check_allowed(value, allowed_values):
+    cell_value_str = str(value).strip()
+    if cell_value_str not in allowed_values:
+        return f"Value '{cell_value_str}' not in allowed list"
+    return None
+
+
+def _check_number(value, _):
+    try:
+        float(value)
+    except (ValueError, TypeError):
+        return "Expected numeric value"
+    return None
+
+
+def _check_state(value, states):
+    state_str = str(value).strip().upper()
+    if state_str not in states:
+        return f"Invalid state code: {state_str}"
+    return None
 
-    # Check Phase_CALC validation
-    if col_name == "Phase_CALC":
-        # This would need the phase_map, but checking is done separately
-        # in validate_data function
-        pass
+
+def _check_source(value, sources):
+    cell_value_str = str(value).strip()
+    if cell_value_str not in sources:
+        return f"Value '{cell_value_str}' not in allowed source list"
+    return None
+
+
+# Checks of non-empty values: check -> function(value, parameter) returning an error message or None
+VALUE_CHECKS = {
+    "upper_bound": _check_upper_bound,
+    "allowed": _check_allowed,
+    "number": _check_number,
+    "state": _check_state,
+    "source": _check_source,
+}
+
+
+def check_cell(value, validator, row_data):
+    """
+    Validate a single cell value against its compiled rule.
+
+    Returns: (is_valid, error_message)
+    """
+    # Handle empty/null values first
+    is_empty = pd.isna(value) or str(value).strip() == ""
+
+    source = row_data.get("SOURCE", "")
+    kind = validator["kind"]
+
+    if kind == "required_unless_source":
+        if source not in validator["sources"] and is_empty:
+            return False, validator["message"]
+        return True, None
+
+    if kind == "required_in_sources":
+        if source in validator["sources"] and is_empty:
+            return False, validator["message"]
+        return True, None
+
+    if kind == "required_if_cur":
+        if validator["motor_kpi_only"] and source != "Motor_KPI":
+            return True, None
+        phase_calc = row_data.get("Phase_CALC", "")
+        if pd.notna(phase_calc) and "CUR" in str(phase_calc).upper() and is_empty:
+            return False, "Required when CUR in Phase_CALC"
+        return True, None
+
+    if kind == "required_if_filled":
+        other = row_data.get(validator["other"], "")
+        if pd.notna(other) and str(other).strip() != "" and is_empty:
+            return False, validator["message"]
+        return True, None
+
+    # Value rules: empty is OK unless required
+    if is_empty:
+        if validator["required"]:
+            return False, "Required field is empty"
+        return True, None
+
+    for check, parameter in validator["checks"]:
+        error_msg = VALUE_CHECKS[check](value, parameter)
+        if error_msg is not None:
+            return False, error_msg
 
     return True, None
 
 
-def validate_data(df, criteria_dict, phase_map):
+def check_phase_calc(value, phases_value, phase_map):
     """
-    Validate entire dataframe against QC criteria.
+    Phase_CALC must be the phase map's value for PHASES (when PHASES is mapped).
 
-    Returns: dict of issues {(row_idx, col_name): error_message}
+    Returns: error message or None
+    """
+    if pd.notna(phases_value):
+        phases_str = str(phases_value).strip()
+        expected_phase_calc = phase_map.get(phases_str)
+        if expected_phase_calc:
+            actual_phase_calc = str(value).strip() if pd.notna(value) else ""
+            if actual_phase_calc != expected_phase_calc:
+                return f"Expected '{expected_phase_calc}' for PHASES='{phases_str}'"
+    return None
+
+
+def validate_data_by_row(df, rules, phase_map):
+    """
+    Validate entire dataframe against the compiled QC rules, one row at a time.
+
+    Returns: QC results (see issue_results)
     """
     issues_by_cell = {}
 
-    print(f"\nValidating {len(df)} rows against {len(criteria_dict)} criteria...")
+    print(f"\nValidating {len(df)} rows against {len(rules)} criteria...")
+
+    # Only the rules of columns present in the data
+    validators = [validator for col_name, validator in rules.items() if col_name in df.columns]
 
     for row_idx in range(len(df)):
         row_data = df.iloc[row_idx]
 
-        # Check each column that has criteria
-        for col_name, rule in criteria_dict.items():
-            if col_name not in df.columns:
-                continue
-
+        for validator in validators:
+            col_name = validator["column"]
             value = row_data[col_name]
 
-            # Special handling for Phase_CALC validation
-            if col_name == "Phase_CALC":
-                phases_value = row_data.get("PHASES", "")
-                if pd.notna(phases_value):
-                    phases_str = str(phases_value).strip()
-                    expected_phase_calc = phase_map.get(phases_str)
-                    if expected_phase_calc:
-                        actual_phase_calc = str(value).strip() if pd.notna(value) else ""
-                        if actual_phase_calc != expected_phase_calc:
-                            issues_by_cell[(row_idx, col_name)] = f"Expected '{expected_phase_calc}' for PHASES='{phases_str}'"
+            if validator["kind"] == "phase":
+                error_msg = check_phase_calc(value, row_data.get("PHASES", ""), phase_map)
+                if error_msg is not None:
+                    issues_by_cell[(row_idx, col_name)] = error_msg
                 continue
 
-            # Standard validation
-            is_valid, error_msg = check_cell(value, rule, col_name, row_data)
+            is_valid, error_msg = check_cell(value, validator, row_data)
             if not is_valid:
                 issues_by_cell[(row_idx, col_name)] = error_msg
 
     print(f"Found {len(issues_by_cell)} cell issues")
-    return issues_by_cell
+    return results_from_cells(len(df), [validator["column"] for validator in validators], issues_by_cell)
 
 
-def apply_qc_flag(df, issues_by_cell):
-    """Add QC_FLAG column: 1 if row has issues, 0 if clean."""
-    qc_flags = []
+# ============================================================================
+# COLUMN-WISE VALIDATION
+# ============================================================================
 
-    for row_idx in range(len(df)):
-        # Check if this row has any issues
-        has_issue = any(cell_key[0] == row_idx for cell_key in issues_by_cell.keys())
-        qc_flags.append(1 if has_issue else 0)
+def _column_or_blank(df, column):
+    """A column as object values; all "" when missing (like row_data.get(column, ""))"""
+    if column not in df.columns:
+        return pd.Series("", index=df.index, dtype=object)
+    return df[column].astype(object)
+
+
+def _text(values):
+    """str(value).strip() per value (values as objects)"""
+    return values.astype(str).str.strip()
+
+
+def _is_empty(values):
+    """pd.isna(value) or str(value).strip() == "" per value"""
+    return values.isna() | (_text(values) == "")
+
+
+def _float_or_none(value):
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def _float_values(column):
+    """
+    float(value) per value of a column.
+
+    Returns: (numbers: float Series, rejected: boolean Series where float() fails)
+    """
+    if pd.api.types.is_numeric_dtype(column):
+        return column.astype(float), pd.Series(False, index=column.index)
+    parsed = [_float_or_none(value) for value in column.astype(object)]
+    rejected = pd.Series([number is None for number in parsed], index=column.index)
+    numbers = pd.Series([float("nan") if number is None else number for number in parsed],
+                        index=column.index, dtype=float)
+    return numbers, rejected
+
+
+def _messages(values, failed, message):
+    """message(value) for the failed values, None for the others"""
+    result = pd.Series(None, index=values.index, dtype=object)
+    result[failed] = values[failed].map(message)
+    return result
+
+
+def _column_upper_bound(column, threshold):
+    numbers, rejected = _float_values(column)
+    if threshold is None:
+        rejected[:] = True
+    result = _messages(numbers, ~rejected & (numbers >= (threshold or 0)),
+                       lambda number: f"Value {number} exceeds limit {threshold}")
+    result[rejected] = "Expected numeric value for range check"
+    return result
+
+
+def _column_allowed(column, allowed_values):
+    text = _text(column.astype(object))
+    return _messages(text, ~text.isin(allowed_values), lambda value: f"Value '{value}' not in allowed list")
+
+
+def _column_number(column, _):
+    _, rejected = _float_values(column)
+    return pd.Series(None, index=column.index, dtype=object).mask(rejected, "Expected numeric value")
+
+
+def _column_state(column, states):
+    text = _text(column.astype(object)).str.upper()
+    return _messages(text, ~text.isin(states), lambda value: f"Invalid state code: {value}")
+
+
+def _column_source(column, sources):
+    text = _text(column.astype(object))
+    return _messages(text, ~text.isin(sources), lambda value: f"Value '{value}' not in allowed source list")
+
+
+# Column-wise VALUE_CHECKS: check -> function(column, parameter) returning a Series of
+# error messages (None where the value passes)
+COLUMN_CHECKS = {
+    "upper_bound": _column_upper_bound,
+    "allowed": _column_allowed,
+    "number": _column_number,
+    "state": _column_state,
+    "source": _column_source,
+}
+
+
+def distinct_values(column):
+    """
+    Factorize a column by value and by str(value) together, so values that are
+    equal but print differently (1, 1.0, True) stay apart and any rule of the
+    value alone gives the same verdict for every row of a code.
+
+    Returns: (codes: array, one per row; representatives: Series (RangeIndex) with
+              the first value of each code, in the column's dtype)
+    """
+    value_codes, _ = pd.factorize(column)
+    text_codes, text_uniques = pd.factorize(column.astype(object).astype(str))
+    pairs = np.where(value_codes < 0, -1,
+                     value_codes.astype(np.int64) * (len(text_uniques) + 1) + text_codes)
+    codes, _ = pd.factorize(pairs)
+    _, first = np.unique(codes, return_index=True)
+    return codes, column.iloc[first].reset_index(drop=True)
 
+
+def _empty_cells(column):
+    """_is_empty per row, evaluated once per distinct value"""
+    codes, representatives = distinct_values(column)
+    return pd.Series(_is_empty(representatives.astype(object)).to_numpy()[codes], index=column.index)
+
+
+def _value_messages(column, validator):
+    """
+    Error messages of a value rule (kind 'value') for each value of column (None
+    where it passes); depends on the values alone.
+    """
+    result = pd.Series(None, index=column.index, dtype=object)
+    empty = _is_empty(column.astype(object))
+    if validator["required"]:
+        result[empty] = "Required field is empty"
+    # Each check sees the non-empty values that passed the checks before it
+    pending = ~empty
+    for check, parameter in validator["checks"]:
+        if not pending.any():
+            break
+        messages = COLUMN_CHECKS[check](column[pending], parameter).dropna()
+        result[messages.index] = messages
+        pending[messages.index] = False
+    return result
+
+
+def evaluate_rule(df, validator, phase_map):
+    """
+    Evaluate one compiled rule over its whole column (df with a RangeIndex).
+    Value rules and the emptiness tests are evaluated once per distinct value
+    (distinct_values) and broadcast back; only the SOURCE, Phase_CALC, PHASES and
+    INCIDENT_NUM conditions are row by row.
+
+    Returns: Series of error messages indexed by row position, failed cells only
+    """
+    column = df[validator["column"]]
+    values = column.astype(object)
+    kind = validator["kind"]
+    source = _column_or_blank(df, "SOURCE")
+    result = pd.Series(None, index=df.index, dtype=object)
+
+    if kind == "value":
+        codes, representatives = distinct_values(column)
+        verdicts = _value_messages(representatives, validator).to_numpy(dtype=object)
+        return pd.Series(verdicts[codes], index=df.index, dtype=object).dropna()
+
+    if kind == "phase":
+        phases = _column_or_blank(df, "PHASES")
+        phases_str = _text(phases).where(phases.notna())
+        expected = phases_str.map(phase_map)
+        actual = _text(values).where(values.notna(), "")
+        failed = expected.notna() & (expected != "") & (actual != expected)
+        result[failed] = ("Expected '" + expected[failed] + "' for PHASES='" + phases_str[failed] + "'")
+
+    elif kind == "required_unless_source":
+        result[~source.isin(validator["sources"]) & _empty_cells(column)] = validator["message"]
+
+    elif kind == "required_in_sources":
+        result[source.isin(validator["sources"]) & _empty_cells(column)] = validator["message"]
+
+    elif kind == "required_if_cur":
+        phase_calc = _column_or_blank(df, "Phase_CALC")
+        cur = phase_calc.notna() & _text(phase_calc).str.upper().str.contains("CUR", regex=False)
+        if validator["motor_kpi_only"]:
+            cur &= source == "Motor_KPI"
+        result[cur & _empty_cells(column)] = "Required when CUR in Phase_CALC"
+
+    elif kind == "required_if_filled":
+        other = _column_or_blank(df, validator["other"])
+        filled = other.notna() & (_text(other) != "")
+        result[filled & _empty_cells(column)] = validator["message"]
+
+    return result.dropna()
+
+
+def validate_data(df, rules, phase_map):
+    """
+    Validate entire dataframe against the compiled QC rules, one column at a time.
+    Same issues as validate_data_by_row.
+
+    Returns: QC results (see issue_results)
+    """
+    print(f"\nValidating {len(df)} rows against {len(rules)} criteria (column-wise)...")
+
+    df = df.reset_index(drop=True)
+    columns = [col_name for col_name in rules if col_name in df.columns]
+    rows, codes, messages = [], [], []
+    for code, col_name in enumerate(columns):
+        failed = evaluate_rule(df, rules[col_name], phase_map)
+        rows.append(failed.index.to_numpy(dtype=int))
+        codes.append(np.full(len(failed), code))
+        messages.append(failed.to_numpy(dtype=object))
+
+    results = issue_results(len(df), columns, np.concatenate(rows or [[]]).astype(int),
+                            np.concatenate(codes or [[]]).astype(int), np.concatenate(messages or [[]]))
+    print(f"Found {len(results['messages'])} cell issues")
+    return results
+
+# ============================================================================
+# QC RESULTS
+# ============================================================================
+
+def issue_results(n_rows, columns, rows, codes, messages):
+    """
+    QC results from the issues found (one entry per issue in rows/codes/messages).
+
+    Returns: dict with
+      - columns: validated column names
+      - issues: boolean matrix n_rows x columns, True where the cell has an issue
+      - messages: DataFrame ROW (position), COLUMN, MESSAGE, one row per issue,
+        sorted by row and then column
+    """
+    issues = np.zeros((n_rows, len(columns)), dtype=bool)
+    issues[rows, codes] = True
+
+    order = np.lexsort((codes, rows))
+    messages = pd.DataFrame({
+        "ROW": rows[order],
+        "COLUMN": pd.Categorical.from_codes(codes[order], categories=columns),
+        "MESSAGE": np.asarray(messages, dtype=object)[order],
+    })
+    return {"columns": columns, "issues": issues, "messages": messages}
+
+
+def results_from_cells(n_rows, columns, issues_by_cell):
+    """QC results from a dict of issues {(row_idx, col_name): error_message}"""
+    code_of = {col_name: code for code, col_name in enumerate(columns)}
+    cells = list(issues_by_cell.items())
+    rows = np.array([row_idx for (row_idx, _), _ in cells], dtype=int)
+    codes = np.array([code_of[col_name] for (_, col_name), _ in cells], dtype=int)
+    return issue_results(n_rows, columns, rows, codes, [error_msg for _, error_msg in cells])
+
+
+def cells_from_results(results):
+    """Dict of issues {(row_idx, col_name): error_message} of QC results"""
+    messages = results["messages"]
+    return dict(zip(zip(messages["ROW"].tolist(), messages["COLUMN"].astype(object)), messages["MESSAGE"]))
+
+
+def issue_counts(df, results):
+    """
+    Issue counts per SOURCE (rows) and validated column (columns).
+
+    Returns: DataFrame, blank sources counted under '(blank)'
+    """
+    source = _column_or_blank(df, "SOURCE").fillna("(blank)").to_numpy()
+    counts = pd.DataFrame(results["issues"], columns=results["columns"]).groupby(source).sum()
+    return counts.astype(int)
+
+
+def apply_qc_flag(df, results):
+    """Add QC_FLAG column: 1 if row has issues, 0 if clean."""
+    qc_flags = results["issues"].any(axis=1).astype(int)
     df["QC_FLAG"] = qc_flags
 
-    rows_with_issues = sum(qc_flags)
+    rows_with_issues = int(qc_flags.sum())
     print(f"QC_FLAG column added: {rows_with_issues} rows with issues, {len(df) - rows_with_issues} clean rows")
 
 
-def highlight_issues_in_excel(output_file, df, issues_by_cell):
+def highlight_issues_in_excel(output_file, df, results):
     """Apply yellow highlighting to cells with issues."""
-    print(f"\nApplying yellow highlighting to {len(issues_by_cell)} cells...")
+    rows, codes = np.nonzero(results["issues"])
+    print(f"\nApplying yellow highlighting to {len(rows)} cells...")
 
     # Convert DATE_IN and DATE_OUT to date-only format (remove time)
     date_columns = ['DATE_IN', 'DATE_OUT']
@@ -265,24 +608,31 @@ def highlight_issues_in_excel(output_file, df, issues_by_cell):
     wb = load_workbook(output_file)
     ws = wb.active
 
+    # Excel column of each validated column (Excel is 1-indexed); read_sheet makes
+    # header names unique, so each name has one position
+    positions = {col_name: position for position, col_name in enumerate(df.columns, start=1)}
+    excel_columns = [positions[col_name] for col_name in results["columns"]]
+
     # Apply yellow fill to each issue cell
-    for (row_idx, col_name), error_msg in issues_by_cell.items():
+    for row_idx, code in zip(rows.tolist(), codes.tolist()):
         # Excel rows are 1-indexed, and we have a header row
         excel_row = row_idx + 2  # +1 for 0-index, +1 for header
-
-        # Find column index
-        col_idx = df.columns.get_loc(col_name) + 1  # Excel is 1-indexed
-
-        # Apply yellow fill
-        cell = ws.cell(row=excel_row, column=col_idx)
-        cell.fill = YELLOW_FILL
+        ws.cell(row=excel_row, column=excel_columns[code]).fill = YELLOW_FILL
 
     wb.save(output_file)
     print(f"Highlighting applied and saved to: {output_file}")
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Validate the latest clean file against CELL QC CRITERIA.xlsx")
+    parser.add_argument('--row-wise', action='store_true',
+                        help="Validate one row at a time (the original, slower loop)")
+    return parser.parse_args()
+
+
 def main():
     """Main execution function."""
+    args = parse_args()
     print("=" * 60)
     print("QC Data Quality Check Script")
     print("=" * 60)
@@ -292,25 +642,29 @@ def main():
         input_file = find_latest_clean_file()
 
         # Load QC criteria
-        criteria_dict, phase_map = load_qc_criteria()
+        rules, phase_map = load_qc_criteria()
 
         # Load data
         print(f"\nLoading data from: {input_file}")
-        df = pd.read_excel(input_file)
+        df = read_sheet(input_file)
         print(f"Loaded {len(df)} rows, {len(df.columns)} columns")
 
         # Validate data
-        issues_by_cell = validate_data(df, criteria_dict, phase_map)
+        validate = validate_data_by_row if args.row_wise else validate_data
+        start = time.perf_counter()
+        results = validate(df, rules, phase_map)
+        print(f"Validation took {time.perf_counter() - start:.1f} s")
 
         # Add QC_FLAG column
-        apply_qc_flag(df, issues_by_cell)
+        apply_qc_flag(df, results)
+        counts = issue_counts(df, results)
 
         # Generate output filename
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         output_file = f"MERGE_CLEAN_QC_{timestamp}.xlsx"
 
         # Highlight issues and save
-        highlight_issues_in_excel(output_file, df, issues_by_cell)
+        highlight_issues_in_excel(output_file, df, results)
 
         # Summary
         print("\n" + "=" * 60)
@@ -319,10 +673,20 @@ def main():
         print(f"Input file: {input_file}")
         print(f"Output file: {output_file}")
         print(f"Total rows: {len(df)}")
-        print(f"Total cells checked: {len(df) * len(criteria_dict)}")
-        print(f"Issues found: {len(issues_by_cell)} cells")
+        print(f"Total cells checked: {len(df) * len(rules)}")
+        print(f"Issues found: {int(results['issues'].sum())} cells")
         print(f"Rows with issues: {df['QC_FLAG'].sum()}")
         print(f"Clean rows: {len(df) - df['QC_FLAG'].sum()}")
+
+        by_column = counts.sum(axis=0)
+        by_column = by_column[by_column > 0].sort_values(ascending=False)
+        if len(by_column):
+            print(f"\nIssues by column (top {min(len(by_column), ISSUE_REPORT_LIMIT)}):")
+            for col_name, count in by_column.head(ISSUE_REPORT_LIMIT).items():
+                print(f"  {col_name}: {count}")
+            print("\nIssues by source:")
+            for source, count in counts.sum(axis=1).items():
+                print(f"  {source}: {count}")
         print("=" * 60)
 
     except Exception as e:
@@ -0,0 +1,80 @@
+"""
+Serial Numbers
+Canonical serial-number key columns for the merged frame.
+
+Several stages read the motor serial number (SN): MOTOR_TYPE2 looks for "MLA07"
+in it, MOTOR_MODEL takes the TDI model number out of it, and the duplicate
+cleaners match on its last 3 digits (one row at a time, in every cleaner).
+Here each piece is derived with .str operations over the whole column, into
+compact key columns:
+
+  SN_SUFFIX  Last 3 digits of SN (all of them when there are fewer; category)
+  SN_MLA07   SN contains "MLA07" (CAM directional motors; bool)
+  SN_MODEL   First known TDI model number in SN (475, 500, ...; category,
+             blank when none)
+
+The merge adds them once, next to SN, and its steps call sn_keys(df) to reuse
+them; they are dropped before MERGED_DATA is written, so reuse stops at the
+merge. The duplicate cleaners derive SN_SUFFIX from SN with the same function:
+read back from a workbook the keys would be numbers ('005' becomes 5). Digits
+are taken from str(value), exactly like the original row-wise rule (kept in
+verify_duplicates.py as reference_last_digits).
+"""
+
+import pandas as pd
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+SN_KEY_COLUMNS = ['SN_SUFFIX', 'SN_MLA07', 'SN_MODEL']
+
+# Digits kept in SN_SUFFIX
+SN_SUFFIX_DIGITS = 3
+
+# Known TDI motor models found in serial numbers (first match wins)
+TDI_MODEL_PATTERN = r'\b(475|500|575|650|712|800|962)\b'
+
+# ============================================================================
+# KEYS
+# ============================================================================
+
+def serial_number_keys(sn):
+    """
+    Key columns of a Series of serial numbers.
+
+    Returns:
+        DataFrame with SN_KEY_COLUMNS, aligned with sn
+    """
+    values = sn.astype(object)
+    present = values.notna()
+    text = values.astype(str).where(present, '')
+
+    key = text.str.strip().str.upper()
+    digits = text.str.replace(r'\D', '', regex=True)
+    model = key.str.extract(TDI_MODEL_PATTERN, expand=False)
+
+    return pd.DataFrame({
+        'SN_SUFFIX': digits.str[-SN_SUFFIX_DIGITS:].astype('category'),
+        'SN_MLA07': key.str.contains('MLA07', regex=False).astype(bool),
+        'SN_MODEL': model.astype('category'),
+    }, index=sn.index)
+
+
+def add_serial_number_keys(df):
+    """Add (or refresh) the SN key columns from SN"""
+    if 'SN' not in df.columns:
+        return df
+    keys = serial_number_keys(df['SN'])
+    for column in SN_KEY_COLUMNS:
+        df[column] = keys[column]
+    return df
+
+
+def sn_keys(df):
+    """The SN key columns of df: the ones added by add_serial_number_keys, otherwise derived from SN"""
+    if all(column in df.columns for column in SN_KEY_COLUMNS):
+        return df[SN_KEY_COLUMNS]
+
+    sn = df['SN'] if 'SN' in df.columns else pd.Series(None, index=df.index, dtype=object)
+    return serial_number_keys(sn)
@@ -0,0 +1,188 @@
+"""
+Source Frame Cache
+Content-addressed cache of parsed source workbooks.
+
+Parsing the source .xlsx files through openpyxl is the slowest part of a merge.
+This module stores each parsed sheet on disk (Parquet when pyarrow can represent
+the frame, pickle otherwise) so the next run loads it directly instead of
+re-parsing the XML.
+
+Cache key: SHA-256 of the file contents + sheet name + reader version
+(+ any extra reader options). A changed file or a new reader version simply
+produces a new key; stale entries are dropped by size-based LRU eviction.
+"""
+
+import hashlib
+import os
+import glob
+import pandas as pd
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+CACHE_DIR = '.merge_cache'
+CACHE_MAX_BYTES = 512 * 1024 * 1024  # Evict least recently used entries above 512 MB
+CACHE_EXTENSIONS = ('.parquet', '.pkl')
+
+# ============================================================================
+# KEYS
+# ============================================================================
+
+def file_hash(file_path, chunk_size=1024 * 1024):
+    """Return the SHA-256 hex digest of a file's contents"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_key(file_path, sheet_name, reader_version, extra=''):
+    """Build the cache key for one parsed sheet"""
+    parts = [file_hash(file_path), str(sheet_name), str(reader_version), str(extra)]
+    return hashlib.sha256('|'.join(parts).encode('utf-8')).hexdigest()
+
+# ============================================================================
+# LOAD / STORE
+# ============================================================================
+
+def _entry_paths(key, cache_dir):
+    return [os.path.join(cache_dir, key + ext) for ext in CACHE_EXTENSIONS]
+
+
+def load_cached_frame(key, cache_dir=CACHE_DIR, columns=None):
+    """
+    Load a cached frame by key.
+
+    Args:
+        key: Cache key from cache_key()
+        cache_dir: Cache directory
+        columns: Optional list of columns to load (Parquet entries only read these)
+
+    Returns:
+        DataFrame, or None on a cache miss
+    """
+    for path in _entry_paths(key, cache_dir):
+        if not os.path.exists(path):
+            continue
+        try:
+            if path.endswith('.parquet'):
+                df = pd.read_parquet(path, columns=columns)
+            else:
+                df = pd.read_pickle(path)
+                if columns is not None:
+                    df = df[[col for col in columns if col in df.columns]]
+        except Exception as e:
+            # Corrupt or unreadable entry: drop it and treat as a miss
+            print(f"  WARNING: Discarding unreadable cache entry {os.path.basename(path)}: {e}")
+            os.remove(path)
+            return None
+
+        # Touch the entry so eviction is least-recently-used
+        os.utime(path, None)
+        return df
+
+    return None
+
+
+def store_cached_frame(key, df, cache_dir=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+    """
+    Store a parsed frame under key, then evict old entries above max_bytes.
+
+    Parquet is used when pyarrow can represent every column. Raw sheets often
+    have mixed-type object columns, so pickle is the fallback.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    parquet_path, pickle_path = _entry_paths(key, cache_dir)
+
+    # Write to a temp file and rename, so parallel readers never see a partial entry
+    tmp_path = f"{parquet_path}.{os.getpid()}.tmp"
+    try:
+        df.to_parquet(tmp_path, index=True)
+        os.replace(tmp_path, parquet_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        tmp_path = f"{pickle_path}.{os.getpid()}.tmp"
+        df.to_pickle(tmp_path)
+        os.replace(tmp_path, pickle_path)
+
+    evict_cache(cache_dir, max_bytes)
+
+
+def evict_cache(cache_dir=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+    """
+    Delete least recently used cache entries until the cache fits in max_bytes.
+
+    Returns:
+        Number of entries removed
+    """
+    entries = []
+    for ext in CACHE_EXTENSIONS:
+        entries.extend(glob.glob(os.path.join(cache_dir, '*' + ext)))
+
+    entries.sort(key=os.path.getmtime)
+    total_bytes = sum(os.path.getsize(path) for path in entries)
+
+    removed = 0
+    while entries and total_bytes > max_bytes:
+        oldest = entries.pop(0)
+        total_bytes -= os.path.getsize(oldest)
+        os.remove(oldest)
+        removed += 1
+
+    if removed:
+        print(f"  Evicted {removed} old cache entries (cache limit {max_bytes // (1024 * 1024)} MB)")
+
+    return removed
+
+# ============================================================================
+# CACHED READ
+# ============================================================================
+
+def read_excel_cached(file_path, sheet_name=0, reader_version=1, use_cache=True,
+                      cache_extra='', cache_dir=CACHE_DIR, max_bytes=CACHE_MAX_BYTES,
+                      reader=None, **read_kwargs):
+    """
+    Read a sheet with pd.read_excel (or another reader), going through the parsed-frame cache.
+
+    Args:
+        file_path: Path to the workbook
+        sheet_name: Sheet to read (name or index)
+        reader_version: Version of the calling reader; bump it when its output changes
+        use_cache: False to always parse the workbook (and leave the cache untouched)
+        cache_extra: Extra text folded into the key; describe any callable read_kwargs
+                     here, since callables themselves are not part of the key
+        cache_dir: Cache directory
+        max_bytes: Size limit for eviction
+        reader: Function called as reader(file_path, sheet_name=..., **read_kwargs);
+                defaults to pd.read_excel. Its name is part of the cache key
+        **read_kwargs: Passed to the reader (and folded into the cache key)
+
+    Returns:
+        DataFrame with the same values the reader returns
+    """
+    if reader is None:
+        reader = pd.read_excel
+
+    if not use_cache:
+        return reader(file_path, sheet_name=sheet_name, **read_kwargs)
+
+    plain_kwargs = sorted((k, v) for k, v in read_kwargs.items() if not callable(v))
+    extra = reader.__name__ + repr(plain_kwargs) + str(cache_extra)
+    key = cache_key(file_path, sheet_name, reader_version, extra)
+
+    df = load_cached_frame(key, cache_dir)
+    if df is not None:
+        print(f"  Loaded parsed sheet from cache ({os.path.basename(file_path)} / {sheet_name})")
+        return df
+
+    df = reader(file_path, sheet_name=sheet_name, **read_kwargs)
+    try:
+        store_cached_frame(key, df, cache_dir, max_bytes)
+    except OSError as e:
+        # A read-only folder should not break the merge
+        print(f"  WARNING: Could not write cache entry: {e}")
+
+    return df
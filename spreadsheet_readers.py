@@ -0,0 +1,491 @@
+"""
+Spreadsheet Readers
+One reader abstraction for every script, with pluggable backends.
+
+All scripts read their sheets through read_sheet(), which hands the work to
+one of these backends:
+
+  streaming  openpyxl read-only mode, row by row (default for workbooks)
+  openpyxl   pd.read_excel with openpyxl (loads the whole sheet first)
+  calamine   pd.read_excel with calamine (Rust engine; needs python-calamine)
+  parquet    Parquet files (needs pyarrow)
+  csv        CSV files
+
+Parquet/CSV files always use their own backend. For workbooks the backend is
+chosen per call, by the SCORECARD_READER environment variable, or with
+--reader on merge_excel_files_auto.py. benchmark_backends() times them all
+and checks that the workbook backends return the same frame
+(python merge_excel_files_auto.py benchmark-readers).
+
+The streaming backend never holds the whole sheet as a frame:
+
+  1. Peek at the first rows and pick the header row (first row that is mostly
+     filled in), so title/blank rows above the headers are skipped
+  2. Resolve usecols against the real header names, so unplanned columns are
+     never materialized
+  3. Build each kept column directly from the streamed rows, skipping blank rows
+
+Values follow pd.read_excel: integral floats become ints, empty cells, Excel
+error values (#VALUE!, #DIV/0!, ...) and the standard NA strings become NaN.
+When the header is on the first row, column types are inferred the way
+pd.read_excel infers them: a column whose cells are all numbers or
+numeric-looking text becomes numeric ('005' becomes 5, '10.9' next to 8 makes
+a float column). Below a title row the columns keep the raw cell values
+(text-only columns become string columns), matching what the old "promote the
+first data row" restructuring produced.
+"""
+
+import contextlib
+import importlib.util
+import io
+import itertools
+import os
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+HEADER_SCAN_ROWS = 10    # Rows peeked at when looking for the header row
+HEADER_MIN_FILL = 0.5    # A header row has at least this share of cells filled in
+
+# Strings pd.read_excel treats as missing values
+NA_STRINGS = {
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan',
+    '1.#IND', '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a',
+    'nan', 'null',
+}
+
+# Excel error values; pd.read_excel reads error cells as missing values
+EXCEL_ERRORS = {
+    '#NULL!', '#DIV/0!', '#VALUE!', '#REF!', '#NAME?', '#NUM!', '#N/A', '#GETTING_DATA',
+    '#SPILL!', '#CALC!', '#FIELD!', '#BLOCKED!', '#CONNECT!', '#BUSY!', '#UNKNOWN!',
+}
+
+MISSING_STRINGS = NA_STRINGS | EXCEL_ERRORS
+
+# ============================================================================
+# CELL AND HEADER HELPERS
+# ============================================================================
+
+def convert_cell(value):
+    """Convert one raw cell value the way pd.read_excel does"""
+    if value is None:
+        return np.nan
+    if isinstance(value, str):
+        return np.nan if value in MISSING_STRINGS else value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def is_blank(value):
+    """Check whether a converted cell value is empty"""
+    return isinstance(value, float) and np.isnan(value)
+
+
+def detect_header_row(rows, min_fill=HEADER_MIN_FILL):
+    """
+    Find the header row among the first rows of a sheet.
+
+    Args:
+        rows: List of converted rows (lists of values)
+        min_fill: Share of the sheet width that must be filled in
+
+    Returns:
+        Index of the first row with at least min_fill of its cells filled in
+        (0 when no row qualifies)
+    """
+    width = 0
+    for row in rows:
+        filled = [i for i, value in enumerate(row) if not is_blank(value)]
+        if filled:
+            width = max(width, filled[-1] + 1)
+
+    if width == 0:
+        return 0
+
+    for i, row in enumerate(rows):
+        filled = sum(1 for value in row[:width] if not is_blank(value))
+        if filled >= width * min_fill:
+            return i
+
+    return 0
+
+
+def make_column_names(header_values):
+    """
+    Turn header cells into column names like pd.read_excel:
+    blank headers become "Unnamed: i", repeated names get ".1", ".2", ...
+    """
+    names = []
+    seen = {}
+    for i, value in enumerate(header_values):
+        name = f"Unnamed: {i}" if is_blank(value) else value
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+            while name in seen:
+                name = f"{name}.1"
+        seen.setdefault(name, 0)
+        names.append(name)
+    return names
+
+
+def _resolve_usecols(names, usecols):
+    """Return the indexes of the columns to keep"""
+    if usecols is None:
+        return list(range(len(names)))
+    if callable(usecols):
+        return [i for i, name in enumerate(names) if usecols(name)]
+    wanted = set(usecols)
+    return [i for i, name in enumerate(names) if name in wanted]
+
+# ============================================================================
+# COLUMN TYPES
+# ============================================================================
+
+def infer_column(values):
+    """
+    Infer a column's dtype the way pd.read_excel does for a first-row header sheet:
+    numeric-looking text is converted along with the numbers, and a column with
+    any other value keeps its raw values.
+    """
+    column = pd.Series(values, dtype=object)
+    try:
+        return pd.to_numeric(column)
+    except (ValueError, TypeError):
+        return column.infer_objects()
+
+
+def raw_column(values):
+    """
+    Keep raw cell values; text-only columns become string columns. Blank cells
+    stay NaN (astype('str') alone turns them into 'nan' before pandas 3).
+    """
+    column = pd.Series(values, dtype=object)
+    if all(isinstance(value, str) for value in values if not is_blank(value)):
+        return column.astype('str').where(column.notna(), np.nan)
+    return column
+
+# ============================================================================
+# ROWS -> FRAME
+# ============================================================================
+
+def frame_from_rows(rows, usecols=None, header_row=None, infer_types=None,
+                    header_scan_rows=HEADER_SCAN_ROWS):
+    """
+    Build a frame from an iterator of raw rows, one pass, keeping only usecols.
+
+    Args:
+        rows: Iterator of row tuples/lists (raw cell values)
+        usecols: Optional callable (column name -> bool) or list of column names to keep
+        header_row: Row index of the headers; None detects it among the first rows
+        infer_types: Infer column dtypes; None infers only when the header is the first row
+        header_scan_rows: Number of rows peeked at to find the header row
+
+    Returns:
+        DataFrame with the header row's names as columns
+    """
+    rows = iter(rows)
+
+    # Peek at the first rows to find the header
+    peek_count = header_scan_rows if header_row is None else header_row + 1
+    peeked = [[convert_cell(value) for value in row]
+              for row in itertools.islice(rows, peek_count)]
+    if len(peeked) <= (header_row or 0):
+        return pd.DataFrame()
+
+    if header_row is None:
+        header_row = detect_header_row(peeked)
+        if header_row > 0:
+            print(f"  Detected headers in sheet row {header_row + 1}, skipping {header_row} row(s) above")
+
+    names = make_column_names(peeked[header_row])
+    keep = _resolve_usecols(names, usecols)
+    columns = [[] for _ in keep]
+
+    def add_row(row):
+        # Blank rows are skipped (whole row, before projection)
+        if all(is_blank(value) for value in row):
+            return
+        width = len(row)
+        for column, i in zip(columns, keep):
+            column.append(row[i] if i < width else np.nan)
+
+    for row in peeked[header_row + 1:]:
+        add_row(row)
+    for row in rows:
+        add_row([convert_cell(value) for value in row])
+
+    # Trailing columns with no header and no values are not part of the table
+    while keep and names[keep[-1]] == f"Unnamed: {keep[-1]}" and all(is_blank(v) for v in columns[-1]):
+        keep.pop()
+        columns.pop()
+
+    if infer_types is None:
+        infer_types = header_row == 0
+    build_column = infer_column if infer_types else raw_column
+
+    return pd.DataFrame({names[i]: build_column(values) for i, values in zip(keep, columns)})
+
+# ============================================================================
+# BACKENDS
+# ============================================================================
+# Every backend is called as backend(file_path, sheet_name, usecols, header_row)
+# and returns the same frame: header_row=None means "detect the header row".
+# The workbook backends only differ in how they read the raw cells; headers,
+# usecols and column types always go through frame_from_rows.
+
+def read_sheet_streaming(file_path, sheet_name=0, usecols=None, header_row=None, infer_types=None,
+                         header_scan_rows=HEADER_SCAN_ROWS):
+    """
+    Read one sheet row by row with openpyxl read-only mode.
+
+    Args:
+        file_path: Path to the workbook
+        sheet_name: Sheet name or index
+        usecols: Optional callable (column name -> bool) or list of column names to keep
+        header_row: Row index of the headers; None detects it among the first rows
+        infer_types: Infer column dtypes; None infers only when the header is the first row
+        header_scan_rows: Number of rows peeked at to find the header row
+
+    Returns:
+        DataFrame with the header row's names as columns
+    """
+    wb = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[sheet_name] if isinstance(sheet_name, int) else wb[sheet_name]
+        return frame_from_rows(ws.iter_rows(values_only=True), usecols, header_row,
+                               infer_types, header_scan_rows)
+    finally:
+        wb.close()
+
+
+def _read_excel_engine(engine, file_path, sheet_name, usecols, header_row):
+    """Raw cells from pd.read_excel with a given engine, built into a frame like the streaming backend"""
+    raw = pd.read_excel(file_path, sheet_name=sheet_name, header=None, engine=engine)
+    return frame_from_rows(raw.itertuples(index=False, name=None), usecols, header_row)
+
+
+def read_sheet_openpyxl(file_path, sheet_name=0, usecols=None, header_row=None):
+    """Read one sheet with pd.read_excel and the openpyxl engine (loads the whole sheet)"""
+    return _read_excel_engine('openpyxl', file_path, sheet_name, usecols, header_row)
+
+
+def read_sheet_calamine(file_path, sheet_name=0, usecols=None, header_row=None):
+    """Read one sheet with pd.read_excel and the calamine engine (needs python-calamine)"""
+    return _read_excel_engine('calamine', file_path, sheet_name, usecols, header_row)
+
+
+def read_table_parquet(file_path, sheet_name=0, usecols=None, header_row=None):
+    """Read a Parquet table (sheet_name and header_row do not apply)"""
+    if usecols is None:
+        return pd.read_parquet(file_path)
+    import pyarrow.parquet as pq
+    names = pq.read_schema(file_path).names
+    keep = [names[i] for i in _resolve_usecols(names, usecols)]
+    return pd.read_parquet(file_path, columns=keep)
+
+
+def read_table_csv(file_path, sheet_name=0, usecols=None, header_row=None):
+    """Read a CSV table (sheet_name does not apply)"""
+    if header_row is not None:
+        return pd.read_csv(file_path, header=header_row, usecols=usecols)
+    raw = pd.read_csv(file_path, header=None, dtype=object, keep_default_na=False)
+    return frame_from_rows(raw.itertuples(index=False, name=None), usecols)
+
+
+# Backend name -> (reader function, module it needs)
+READER_BACKENDS = {
+    'streaming': (read_sheet_streaming, 'openpyxl'),
+    'openpyxl': (read_sheet_openpyxl, 'openpyxl'),
+    'calamine': (read_sheet_calamine, 'python_calamine'),
+    'parquet': (read_table_parquet, 'pyarrow'),
+    'csv': (read_table_csv, None),
+}
+
+# Backends for workbooks; Parquet/CSV files always use their own backend
+EXCEL_BACKENDS = ['streaming', 'openpyxl', 'calamine']
+TABLE_EXTENSIONS = {'.parquet': 'parquet', '.csv': 'csv'}
+
+# 'auto' picks the streaming backend for workbooks. Set SCORECARD_READER
+# (e.g. to "calamine") to change the default for every script.
+DEFAULT_BACKEND = os.environ.get('SCORECARD_READER', 'auto')
+
+
+def backend_available(name):
+    """Check whether a backend's required module is installed"""
+    module = READER_BACKENDS[name][1]
+    return module is None or importlib.util.find_spec(module) is not None
+
+
+def available_backends():
+    """Return the names of the installed backends"""
+    return [name for name in READER_BACKENDS if backend_available(name)]
+
+
+def resolve_backend(file_path, backend=None):
+    """
+    Pick the backend name for a file.
+
+    Parquet/CSV files always use their table backend. For workbooks, 'auto'
+    means the streaming backend; a named backend that is not installed is an error.
+    """
+    table_backend = TABLE_EXTENSIONS.get(os.path.splitext(str(file_path))[1].lower())
+    if table_backend:
+        return table_backend
+
+    backend = backend or DEFAULT_BACKEND
+    if backend == 'auto':
+        return 'streaming'
+    if backend not in EXCEL_BACKENDS:
+        raise ValueError(f"Unknown workbook reader '{backend}' (choose from: auto, {', '.join(EXCEL_BACKENDS)})")
+    if not backend_available(backend):
+        raise ImportError(f"Reader '{backend}' needs the '{READER_BACKENDS[backend][1]}' package")
+    return backend
+
+
+def read_sheet(file_path, sheet_name=0, usecols=None, header_row=0, backend=None):
+    """
+    Read one sheet (or table file) with the chosen backend.
+    Entry points call this instead of pd.read_excel.
+
+    Args:
+        file_path: Workbook, Parquet or CSV file
+        sheet_name: Sheet name or index (workbooks only)
+        usecols: Optional callable (column name -> bool) or list of column names to keep
+        header_row: Row index of the headers (default first row); None detects it
+        backend: Backend name, 'auto' or None (DEFAULT_BACKEND)
+
+    Returns:
+        DataFrame
+    """
+    reader = READER_BACKENDS[resolve_backend(file_path, backend)][0]
+    return reader(file_path, sheet_name=sheet_name, usecols=usecols, header_row=header_row)
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+def frame_difference(df, reference):
+    """First line of what differs between two frames (None when they are identical)"""
+    try:
+        pd.testing.assert_frame_equal(df, reference)
+    except AssertionError as e:
+        return str(e).strip().splitlines()[0]
+    return None
+
+
+def _time_read(reader, file_path, sheet_name, header_row, repeat):
+    """Return (best seconds, frame) over repeat reads"""
+    best = None
+    df = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        df = reader(file_path, sheet_name=sheet_name, header_row=header_row)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, df
+
+
+def benchmark_backends(sources, backends=None, repeat=3):
+    """
+    Time every reader backend on the given sheets.
+
+    Workbook backends read the sheet itself, and each frame is checked against the
+    first backend's: they must be identical. The Parquet and CSV backends read a
+    converted copy of it (written to a temp folder), showing what converting the
+    source files once would save.
+
+    Args:
+        sources: List of (label, file_path, sheet_name, header_row)
+        backends: Backend names to time (default: all)
+        repeat: Reads per backend; the best time is reported
+
+    Returns:
+        List of dicts with label, backend, seconds (None if not run), rows, columns,
+        same_frame (None if not compared), note
+    """
+    backends = backends or list(READER_BACKENDS)
+    results = []
+    mismatches = []
+
+    print("\n" + "=" * 80)
+    print("READER BENCHMARK")
+    print("=" * 80)
+    print(f"Best of {repeat} reads per backend (parsed-file cache not used)")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for label, file_path, sheet_name, header_row in sources:
+            print(f"\n{label} ({os.path.basename(file_path)} / {sheet_name})")
+            reference = None
+            reference_name = None
+            timings = {}
+
+            for name in backends:
+                reader, module = READER_BACKENDS[name]
+                result = {'label': label, 'backend': name, 'seconds': None,
+                          'rows': None, 'columns': None, 'same_frame': None, 'note': ''}
+
+                if not backend_available(name):
+                    result['note'] = f"not installed ({module})"
+                elif name in TABLE_EXTENSIONS.values():
+                    if reference is None:
+                        result['note'] = "no workbook read to convert"
+                    else:
+                        # Time the table backend on a converted copy of the sheet
+                        # (mixed-type columns are stored as text, as an export would)
+                        table_path = os.path.join(tmp_dir, f"{len(results)}.{name}")
+                        try:
+                            if name == 'parquet':
+                                table = reference.apply(lambda col: col.astype('str') if col.dtype == object else col)
+                                table.to_parquet(table_path, index=False)
+                            else:
+                                reference.to_csv(table_path, index=False)
+                            seconds, df = _time_read(reader, table_path, sheet_name, 0, repeat)
+                            result.update(seconds=seconds, rows=len(df), columns=len(df.columns),
+                                          note="converted copy")
+                        except Exception as e:
+                            result['note'] = f"could not convert: {e}"
+                else:
+                    try:
+                        with contextlib.redirect_stdout(io.StringIO()):
+                            seconds, df = _time_read(reader, file_path, sheet_name, header_row, repeat)
+                        result.update(seconds=seconds, rows=len(df), columns=len(df.columns))
+                        if reference is None:
+                            reference = df
+                            reference_name = name
+                        else:
+                            difference = frame_difference(df, reference)
+                            result['same_frame'] = difference is None
+                            if difference is None:
+                                result['note'] = f"same frame as {reference_name}"
+                            else:
+                                result['note'] = f"DIFFERS from {reference_name}: {difference}"
+                                mismatches.append(f"{label} / {name}")
+                        timings[name] = seconds
+                    except Exception as e:
+                        result['note'] = f"failed: {e}"
+
+                if result['seconds'] is None:
+                    print(f"  {name:<10} {'-':>8}   {result['note']}")
+                else:
+                    print(f"  {name:<10} {result['seconds']:>7.3f}s   "
+                          f"{result['rows']} rows x {result['columns']} cols  {result['note']}")
+                results.append(result)
+
+            if timings:
+                fastest = min(timings, key=timings.get)
+                print(f"  Fastest workbook reader: {fastest}")
+
+    if mismatches:
+        print(f"\nWARNING: Workbook readers return different frames for: {', '.join(mismatches)}")
+    else:
+        print("\nAll workbook readers return the same frames.")
+
+    return results
@@ -0,0 +1,165 @@
+"""
+Text Normalization
+Compiled text parsing for the merged frame: MY, LOBE/STAGE and COUNTY/STATE.
+
+These used to run Python regexes row by row, and clean_county_names rebuilt an
+re.sub pattern for every county. Here every pattern is compiled once and applied
+with the .str accessors over a whole column. Counties, LOBE/STAGE strings and MY
+values repeat heavily, so each column is reduced to its distinct values first,
+parsed once per distinct value, and the results are broadcast back to the rows.
+
+Results depend only on the text of a value (str(value)), so distinct values are
+taken on the text: 7 and 7.0 are different values here, exactly as they were
+for the row-wise rules.
+"""
+
+import re
+import pandas as pd
+from derivations import POG_SOURCES
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+# MY (CAM Run Tracker): "18s" -> 18.0, "11s to 15s" -> 13.0
+MY_SINGLE_PATTERN = re.compile(r'^(\d+(?:\.\d+)?)[sS]?$', re.IGNORECASE)
+MY_RANGE_PATTERN = re.compile(r'^(\d+(?:\.\d+)?)[sS]?\s+to\s+(\d+(?:\.\d+)?)[sS]?$', re.IGNORECASE)
+
+# COUNTY: "Leon County TX" -> County "Leon", State "TX"
+STATE_PATTERN = re.compile(r'\b([A-Z]{2})$')
+COUNTY_WORD_PATTERN = re.compile(r'\s+County\s*', re.IGNORECASE)
+PARISH_WORD_PATTERN = re.compile(r'\s+Parish\s*', re.IGNORECASE)
+TRAILING_STATE_PATTERN = re.compile(r'\s+[A-Z]{2}\s*$')
+
+LOBE_STAGE_SOURCES = ['Motor_KPI'] + POG_SOURCES
+
+# County text -> (STATE, cleaned COUNTY), kept for the whole run: the same counties
+# come back in every source, so each one is only parsed the first time it is seen
+_county_cache = {}
+
+# ============================================================================
+# DISTINCT-VALUE EVALUATION
+# ============================================================================
+
+def as_text(values):
+    """str(value) per cell as an object Series, NaN where blank"""
+    values = values.astype(object)
+    return values.astype(str).where(values.notna())
+
+
+def map_distinct(text, parse):
+    """
+    Evaluate parse once per distinct value of text and broadcast back to its rows.
+
+    parse gets a Series of the distinct non-blank values (RangeIndex) and returns a
+    Series or DataFrame with the same index. Blank rows come back as NaN.
+    """
+    codes, uniques = pd.factorize(text)
+    parsed = parse(pd.Series(uniques, dtype=object))
+    result = parsed.reindex(codes)
+    result.index = text.index
+    return result
+
+# ============================================================================
+# MY
+# ============================================================================
+
+def _to_float(text):
+    """float(text), or None when text is not a number"""
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def _parse_my_text(text):
+    """Distinct MY strings -> DataFrame of the parsed MY and whether a pattern matched"""
+    text = text.str.strip()
+    numbers = pd.Series([_to_float(value) for value in text], index=text.index, dtype=object)
+    is_number = numbers.map(lambda number: number is not None).astype(bool)
+
+    single = text.str.extract(MY_SINGLE_PATTERN, expand=False).astype(float)
+    bounds = text.str.extract(MY_RANGE_PATTERN).astype(float)
+    average = (bounds[0] + bounds[1]) / 2.0
+
+    parsed = average.astype(object).mask(single.notna(), single).mask(is_number, numbers)
+    return pd.DataFrame({'MY': parsed, 'MATCHED': is_number | single.notna() | average.notna()})
+
+
+def parse_my_values(df):
+    """
+    MY for CAM Run Tracker rows: numbers as float, "18s" -> 18.0, "11s to 15s" -> 13.0
+    (case-insensitive). Unknown patterns, blanks and other sources are left as is.
+    """
+    my = df['MY'].astype(object)
+    cam = df['SOURCE'].astype(object) == 'CAM_Run_Tracker'
+
+    parsed = map_distinct(as_text(my.where(cam)), _parse_my_text)
+    matched = parsed['MATCHED'].fillna(False).astype(bool)
+    return my.mask(matched, parsed['MY']).infer_objects()
+
+# ============================================================================
+# LOBE/STAGE
+# ============================================================================
+
+def combine_lobe_stage(df):
+    """
+    LOBE/STAGE per source:
+    - Motor KPI and POG: LOBES + ":" + STAGES (e.g. "6/7:7.8"); a LOBES value
+      written as "6:7" is corrected to "6/7"
+    - CAM Run Tracker: existing value with "-" replaced by ":"
+    Rows missing LOBES or STAGES keep the existing value.
+    """
+    source = df['SOURCE'].astype(object)
+    existing = df['LOBE/STAGE'].astype(object)
+
+    lobe = map_distinct(as_text(df['LOBES']),
+                        lambda text: text.str.strip().str.replace(':', '/', regex=False))
+    stage = map_distinct(as_text(df['STAGES']), lambda text: text.str.strip())
+    cam_value = map_distinct(as_text(existing), lambda text: text.str.replace('-', ':', regex=False))
+
+    combine = source.isin(LOBE_STAGE_SOURCES) & lobe.notna() & stage.notna()
+    cam = (source == 'CAM_Run_Tracker') & existing.notna()
+    return existing.mask(combine, lobe + ':' + stage).mask(cam, cam_value)
+
+# ============================================================================
+# COUNTY / STATE
+# ============================================================================
+
+def _split_county_text(text):
+    """Distinct county strings -> DataFrame of STATE (None if absent) and cleaned COUNTY"""
+    text = text.str.strip()
+    state = text.str.extract(STATE_PATTERN, expand=False)
+
+    cleaned = text.str.replace(COUNTY_WORD_PATTERN, ' ', regex=True)
+    cleaned = cleaned.str.replace(PARISH_WORD_PATTERN, ' ', regex=True)
+    # The state is still the last two letters after removing County/Parish
+    has_state = state.notna()
+    cleaned[has_state] = cleaned[has_state].str.replace(TRAILING_STATE_PATTERN, '', regex=True)
+
+    return pd.DataFrame({'STATE': state.astype(object).where(has_state, None),
+                         'COUNTY': cleaned.str.strip()})
+
+
+def _split_county_cached(text):
+    """_split_county_text, parsing only the counties not already in the cache"""
+    new = text[~text.isin(list(_county_cache))]
+    if len(new):
+        parsed = _split_county_text(new)
+        _county_cache.update(zip(new, zip(parsed['STATE'], parsed['COUNTY'])))
+    return pd.DataFrame([_county_cache[value] for value in text],
+                        columns=['STATE', 'COUNTY'], index=text.index, dtype=object)
+
+
+def split_county_state(county):
+    """
+    Split county strings into STATE and cleaned COUNTY, aligned with county's index.
+    "Leon County TX" -> STATE "TX", COUNTY "Leon"; "Caddo Parish LA" -> "LA", "Caddo".
+    Blank counties give blank STATE and COUNTY.
+    """
+    return map_distinct(as_text(county), _split_county_cached)
+
+
+def clear_county_cache():
+    """Forget every parsed county"""
+    _county_cache.clear()
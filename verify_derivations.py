@@ -0,0 +1,589 @@
+#!/usr/bin/env python3
+"""
+Derivation Check Script
+Compares the vectorized derivations (derivations.py), text parsing
+(text_normalization.py) and FORM_FAM matcher (formation_matcher.py) with the
+original row-wise rules they replaced, and times both.
+
+The row-wise rules are kept here, unchanged, as the reference. The check runs
+on the source files in the current folder (read and cleaned exactly like the
+merge does, before the transformation steps) plus a small set of edge cases,
+and then on the same data repeated 10x and 100x for the timing comparison.
+
+Usage:
+    python verify_derivations.py
+    python verify_derivations.py --scales 1 10 100 1000
+"""
+
+import argparse
+import contextlib
+import io
+import re
+import sys
+import time
+from datetime import date, datetime, time as dt_time
+import numpy as np
+import pandas as pd
+
+import merge_excel_files_auto as merge
+from derivations import (derive_motor_type2, derive_job_type, derive_dds, derive_motor_model,
+                         derive_start_date, derive_end_date)
+from text_normalization import split_county_state, combine_lobe_stage, parse_my_values
+from formation_matcher import build_formfam_index, lookup_form_fam
+
+# ============================================================================
+# REFERENCE: ORIGINAL ROW-WISE RULES
+# ============================================================================
+
+def reference_motor_type2(df):
+    """Original populate_motor_type2 rule (row-wise)"""
+    def determine_motor_type2(row):
+        source = row['SOURCE']
+
+        # Motor KPI logic
+        if source == 'Motor_KPI':
+            sn = str(row.get('SN', '')).upper() if pd.notna(row.get('SN')) else ''
+            motor_make = str(row.get('MOTOR_MAKE', '')).upper() if pd.notna(row.get('MOTOR_MAKE')) else ''
+
+            if 'MLA07' in sn:
+                return 'CAM DD'
+            elif 'TDI' in motor_make and 'MLA07' not in sn:
+                return 'TDI CONV'
+            else:
+                return '3RD PARTY'
+
+        # CAM Run Tracker logic
+        elif source == 'CAM_Run_Tracker':
+            return 'CAM RENTAL'
+
+        # POG_CAM logic
+        elif source == 'POG_CAM_Usage':
+            job_type = str(row.get('JOB_TYPE', '')).strip().upper() if pd.notna(row.get('JOB_TYPE')) else ''
+            if 'RENTAL' in job_type:
+                return 'CAM RENTAL'
+            elif 'DIRECTIONAL' in job_type:
+                return 'CAM DD'
+            return None
+
+        # POG_MM logic
+        elif source == 'POG_MM_Usage':
+            return 'TDI CONV'
+
+        return None
+
+    return df.apply(determine_motor_type2, axis=1)
+
+
+def reference_job_type(df):
+    """Original populate_and_clean_job_type rule (row-wise)"""
+    def clean_job_type(row):
+        source = row['SOURCE']
+        job_type = row.get('JOB_TYPE', None)
+
+        # Motor KPI: All are Directional
+        if source == 'Motor_KPI':
+            return 'Directional'
+
+        # CAM Run Tracker: All are Rental
+        if source == 'CAM_Run_Tracker':
+            return 'Rental'
+
+        # For POG files and other sources, clean the existing value
+        if pd.notna(job_type):
+            job_type_str = str(job_type).strip()
+
+            # Replace "MWD" with "Rental"
+            if job_type_str.upper() == 'MWD':
+                return 'Rental'
+
+            # Replace "Directional- MWD and Motor" with "Directional"
+            if 'Directional- MWD and Motor' in job_type_str:
+                return 'Directional'
+
+            # Standardize to exact case
+            if job_type_str.upper() == 'DIRECTIONAL':
+                return 'Directional'
+            if job_type_str.upper() == 'RENTAL':
+                return 'Rental'
+
+            return job_type_str
+
+        # POG files: If blank, set to "Rental"
+        if source in ['POG_CAM_Usage', 'POG_MM_Usage']:
+            return 'Rental'
+
+        return job_type
+
+    return df.apply(clean_job_type, axis=1)
+
+
+def reference_dds(df):
+    """Original DDS rule from populate_lobe_stage_and_dds (row-wise)"""
+    def populate_dds(row):
+        source = row['SOURCE']
+
+        # Motor KPI: Always "SDT"
+        if source == 'Motor_KPI':
+            return 'SDT'
+
+        # CAM Run Tracker: Keep as is (extract first complete word/company name)
+        elif source == 'CAM_Run_Tracker':
+            if pd.notna(row['DDS']):
+                dds_value = str(row['DDS']).strip()
+                # Extract first word before space or /
+                match = re.match(r'^([A-Za-z]+)', dds_value)
+                if match:
+                    return match.group(1)
+            return row['DDS']
+
+        # POG files: Always "Other"
+        elif source in ['POG_CAM_Usage', 'POG_MM_Usage']:
+            return 'Other'
+
+        return row['DDS'] if pd.notna(row['DDS']) else None
+
+    return df.apply(populate_dds, axis=1)
+
+
+def reference_motor_model(df):
+    """Original populate_motor_model rule (row-wise)"""
+    def calculate_motor_model(row):
+        source = row['SOURCE']
+
+        # Motor KPI logic
+        if source == 'Motor_KPI':
+            motor_make = str(row.get('MOTOR_MAKE', '')).upper() if pd.notna(row.get('MOTOR_MAKE')) else ''
+
+            if 'TDI' in motor_make:
+                # Extract model from SN (serial number)
+                sn = str(row.get('SN', '')).upper() if pd.notna(row.get('SN')) else ''
+
+                # Look for 3-digit numbers in SN that match motor models
+                # Common TDI models: 475, 500, 575, 650, 712, 800, 962
+                matches = re.findall(r'\b(475|500|575|650|712|800|962)\b', sn)
+                if matches:
+                    return matches[0]  # Return first match
+
+                # If no match found, return existing MOTOR_MODEL or None
+                return row.get('MOTOR_MODEL')
+            else:
+                # Not TDI, use MOTOR_OD
+                motor_od = row.get('MOTOR_OD')
+                if pd.notna(motor_od):
+                    return str(motor_od).strip()
+                return row.get('MOTOR_MODEL')
+
+        # CAM Run Tracker: keep existing
+        elif source == 'CAM_Run_Tracker':
+            return row.get('MOTOR_MODEL')
+
+        # POG files: convert text to numbers
+        elif source in ['POG_CAM_Usage', 'POG_MM_Usage']:
+            motor_model = row.get('MOTOR_MODEL')
+            if pd.notna(motor_model):
+                model_str = str(motor_model).strip()
+
+                # Conversion mapping
+                conversions = {
+                    '5': '500',
+                    '5-4/4': '575',
+                    '6-1/2': '650',
+                    '7-1/8': '712',
+                    '8': '800',
+                    '9-5/8': '962'
+                }
+
+                # Check for exact match
+                if model_str in conversions:
+                    return conversions[model_str]
+
+                # Check if already a number
+                if model_str.isdigit():
+                    return model_str
+
+                return model_str
+            return None
+
+        return row.get('MOTOR_MODEL')
+
+    return df.apply(calculate_motor_model, axis=1)
+
+def reference_start_date(df):
+    """Original START_DATE rule from format_dates_and_datetimes (row-wise)"""
+    def create_start_date(row):
+        # For Motor KPI: combine DATE_IN + TIME_IN
+        if row['SOURCE'] in ['Motor_KPI']:
+            if pd.notna(row['DATE_IN']) and pd.notna(row.get('TIME_IN')):
+                try:
+                    # TIME_IN might be a string like '09:00:00', convert to time object
+                    time_in = row['TIME_IN']
+                    if isinstance(time_in, str):
+                        # Parse string time to time object
+                        time_in = pd.to_datetime(time_in, format='%H:%M:%S').time()
+
+                    # Combine date and time
+                    return pd.Timestamp.combine(row['DATE_IN'], time_in)
+                except Exception:
+                    # If combination fails, just use the date
+                    return pd.to_datetime(row['DATE_IN'])
+        # For POG files without time
+        elif row['SOURCE'] in ['POG_CAM_Usage', 'POG_MM_Usage']:
+            if pd.notna(row['DATE_IN']):
+                return pd.to_datetime(row['DATE_IN'])
+        # For CAM Run Tracker, START_DATE already populated
+        return row['START_DATE']
+
+    return df.apply(create_start_date, axis=1)
+
+
+def reference_end_date(df):
+    """Original END_DATE rule from format_dates_and_datetimes (row-wise)"""
+    def create_end_date(row):
+        # For Motor KPI: combine DATE_OUT + TIME_OUT
+        if row['SOURCE'] in ['Motor_KPI']:
+            if pd.notna(row['DATE_OUT']) and pd.notna(row.get('TIME_OUT')):
+                try:
+                    # TIME_OUT might be a string like '10:00:00', convert to time object
+                    time_out = row['TIME_OUT']
+                    if isinstance(time_out, str):
+                        # Parse string time to time object
+                        time_out = pd.to_datetime(time_out, format='%H:%M:%S').time()
+
+                    # Combine date and time
+                    return pd.Timestamp.combine(row['DATE_OUT'], time_out)
+                except Exception:
+                    # If combination fails, just use the date
+                    return pd.to_datetime(row['DATE_OUT'])
+        # For POG files without time
+        elif row['SOURCE'] in ['POG_CAM_Usage', 'POG_MM_Usage']:
+            if pd.notna(row['DATE_OUT']):
+                return pd.to_datetime(row['DATE_OUT'])
+        # For CAM Run Tracker, END_DATE already populated
+        return row['END_DATE']
+
+    return df.apply(create_end_date, axis=1)
+
+def reference_lobe_stage(df):
+    """Original LOBE/STAGE rule from populate_lobe_stage_and_dds (row-wise)"""
+    def combine_lobe_stage(row):
+        # For Motor KPI and POG files, combine LOBES + ":" + STAGES
+        if row['SOURCE'] in ['Motor_KPI', 'POG_CAM_Usage', 'POG_MM_Usage']:
+            lobe = row['LOBES']
+            stage = row['STAGES']
+            if pd.notna(lobe) and pd.notna(stage):
+                lobe_str = str(lobe).strip()
+                stage_str = str(stage).strip()
+
+                # LOBES mistakenly formatted as "6:7" instead of "6/7"
+                if ':' in lobe_str:
+                    lobe_str = lobe_str.replace(':', '/')
+
+                return f"{lobe_str}:{stage_str}"
+        # CAM Run Tracker: replace "-" with ":" to match format
+        elif row['SOURCE'] == 'CAM_Run_Tracker':
+            if pd.notna(row['LOBE/STAGE']):
+                return str(row['LOBE/STAGE']).replace('-', ':')
+        return row['LOBE/STAGE']
+
+    return df.apply(combine_lobe_stage, axis=1)
+
+
+def reference_my(df):
+    """Original parse_my_column_text rule (row-wise)"""
+    def parse_my_value(row):
+        if row['SOURCE'] != 'CAM_Run_Tracker':
+            return row['MY']
+
+        my_value = row['MY']
+        if pd.isna(my_value):
+            return my_value
+
+        my_str = str(my_value).strip()
+        try:
+            return float(my_str)
+        except ValueError:
+            pass
+
+        match1 = re.match(r'^(\d+(?:\.\d+)?)[sS]?$', my_str, re.IGNORECASE)
+        if match1:
+            return float(match1.group(1))
+
+        match2 = re.match(r'^(\d+(?:\.\d+)?)[sS]?\s+to\s+(\d+(?:\.\d+)?)[sS]?$', my_str, re.IGNORECASE)
+        if match2:
+            return (float(match2.group(1)) + float(match2.group(2))) / 2.0
+
+        return my_value
+
+    return df.apply(parse_my_value, axis=1)
+
+
+def _reference_county_parts(df):
+    """Original extract_state_and_clean_county from clean_county_names (row by row)"""
+    def extract_state_and_clean_county(county_str):
+        if pd.isna(county_str):
+            return None, None
+
+        county_str = str(county_str).strip()
+
+        state_match = re.search(r'\b([A-Z]{2})$', county_str)
+        state = state_match.group(1) if state_match else None
+
+        cleaned = county_str
+        cleaned = re.sub(r'\s+County\s*', ' ', cleaned, flags=re.IGNORECASE)
+        cleaned = re.sub(r'\s+Parish\s*', ' ', cleaned, flags=re.IGNORECASE)
+        if state:
+            cleaned = re.sub(r'\s+' + state + r'\s*$', '', cleaned)
+
+        return state, cleaned.strip()
+
+    parts = [extract_state_and_clean_county(county) for county in df['COUNTY']]
+    return pd.DataFrame(parts, columns=['STATE', 'COUNTY'], index=df.index)
+
+
+def reference_state(df):
+    return _reference_county_parts(df)['STATE']
+
+
+def reference_county(df):
+    return _reference_county_parts(df)['COUNTY']
+
+
+def derive_state(df):
+    return split_county_state(df['COUNTY'])['STATE']
+
+
+def derive_county(df):
+    return split_county_state(df['COUNTY'])['COUNTY']
+
+def reference_form_fam(df, formfam_df):
+    """Original apply_formfam_lookup rule (row-wise scan of every keyword)"""
+    formfam_dict = {}
+    for _, row in formfam_df.iterrows():
+        key = (str(row['Basin']).upper(), str(row['Keyword']).upper())
+        formfam_dict[key] = row['Formation Family']
+
+    def get_form_fam(row):
+        if pd.isna(row['FORMATION']) or pd.isna(row['BASIN']):
+            return None
+
+        basin = str(row['BASIN']).upper()
+        formation = str(row['FORMATION']).upper()
+
+        for (lookup_basin, keyword), form_fam in formfam_dict.items():
+            if lookup_basin == basin and keyword in formation:
+                return form_fam
+
+        return None
+
+    return df.apply(get_form_fam, axis=1)
+
+
+def formfam_checks(formfam_df):
+    """FORM_FAM check bound to one FORM_FAM table"""
+    return [('FORM_FAM',
+             lambda df: reference_form_fam(df, formfam_df),
+             lambda df: lookup_form_fam(df, build_formfam_index(formfam_df)))]
+
+# ============================================================================
+# CHECKS
+# ============================================================================
+
+# (column, row-wise reference, vectorized rule)
+DERIVATION_CHECKS = [
+    ('MOTOR_TYPE2', reference_motor_type2, derive_motor_type2),
+    ('JOB_TYPE', reference_job_type, derive_job_type),
+    ('DDS', reference_dds, derive_dds),
+    ('MOTOR_MODEL', reference_motor_model, derive_motor_model),
+]
+
+# Text parsing stage (text_normalization.py)
+TEXT_CHECKS = [
+    ('LOBE/STAGE', reference_lobe_stage, combine_lobe_stage),
+    ('MY', reference_my, parse_my_values),
+    ('STATE', reference_state, derive_state),
+    ('COUNTY', reference_county, derive_county),
+]
+
+# START_DATE/END_DATE need DATE_IN/DATE_OUT already formatted as dates
+DATE_CHECKS = [
+    ('START_DATE', reference_start_date, derive_start_date),
+    ('END_DATE', reference_end_date, derive_end_date),
+]
+
+# Rows that exercise branches the sample files may not reach
+EDGE_CASES = pd.DataFrame({
+    'SOURCE': ['Motor_KPI', 'Motor_KPI', 'Motor_KPI', 'Motor_KPI', 'CAM_Run_Tracker', 'CAM_Run_Tracker',
+               'POG_CAM_Usage', 'POG_CAM_Usage', 'POG_CAM_Usage', 'POG_MM_Usage', 'POG_MM_Usage', 'Other'],
+    'SN': ['tdi-650-mla07-1', 'TDI-500-X', None, 'ABC 962', 'x', np.nan,
+           'TDI-500-MLA07-006', None, 'a', 'b', None, 'TDI 475'],
+    'MOTOR_MAKE': ['tdi', 'TDI', 'Other', 'TDI', None, 'x', None, None, None, None, None, 'TDI'],
+    'MOTOR_OD': [6.75, np.nan, 5.0, np.nan, 7, np.nan, np.nan, np.nan, np.nan, np.nan, np.nan, 4.75],
+    'MOTOR_MODEL': [np.nan, '500', None, 650, 'CAM 500', np.nan, '5', ' 6-1/2 ', 8, '9-5/8', None, '712'],
+    'JOB_TYPE': [None, 'x', 'Rental', np.nan, 'Directional', None,
+                 ' rental ', 'Directional- MWD and Motor', 'MWD', np.nan, 'Other Type', None],
+    'DDS': ['x', None, 'y', np.nan, '  Scout Downhole', '123 Corp', 'a', None, 'b', np.nan, 'c', 'Keep/me'],
+})
+
+# Date/time rows: text and time objects, bad text, numbers, full datetimes, blanks
+DATE_EDGE_CASES = pd.DataFrame({
+    'SOURCE': ['Motor_KPI'] * 8 + ['CAM_Run_Tracker', 'POG_CAM_Usage', 'POG_MM_Usage', 'Other'],
+    'DATE_IN': [date(2025, 9, 7), date(2025, 9, 7), date(2025, 9, 8), date(2025, 9, 8), date(2025, 9, 9),
+                None, date(2025, 9, 10), date(2025, 9, 10), date(2025, 9, 1), date(2025, 9, 2), None,
+                date(2025, 9, 3)],
+    'TIME_IN': ['09:00:00', dt_time(13, 30, 15), '9:5:1', 'bad', 0.5, '10:00:00', None,
+                datetime(2025, 9, 10, 8, 0), '07:00:00', '07:00:00', None, '07:00:00'],
+    'DATE_OUT': [date(2025, 9, 8), None, date(2025, 9, 9), date(2025, 9, 9), date(2025, 9, 10),
+                 date(2025, 9, 11), date(2025, 9, 12), date(2025, 9, 12), date(2025, 9, 4), None,
+                 date(2025, 9, 5), None],
+    'TIME_OUT': [dt_time(6, 0, 0, 500000), '23:59:59', '24:00:00', None, '10:00', '00:00:00', '12:00:00',
+                 np.nan, None, None, '12:00:00', None],
+    'START_DATE': [pd.NaT] * 8 + [pd.Timestamp('2025-09-01 07:30'), pd.NaT, pd.NaT, pd.Timestamp('2025-01-01')],
+    'END_DATE': [pd.NaT] * 8 + [pd.Timestamp('2025-09-04 18:00'), pd.NaT, pd.NaT, pd.NaT],
+})
+
+# Text rows: numbers vs text, "6:7" lobes, MY ranges and unknown text, county/parish/state forms
+TEXT_EDGE_CASES = pd.DataFrame({
+    'SOURCE': ['Motor_KPI', 'Motor_KPI', 'POG_CAM_Usage', 'POG_MM_Usage', 'CAM_Run_Tracker',
+               'CAM_Run_Tracker', 'CAM_Run_Tracker', 'CAM_Run_Tracker', 'CAM_Run_Tracker', 'Other'],
+    'LOBES': ['6/7', ' 6:7 ', 7, 7.0, '4/5', None, '6/7', np.nan, None, '1/2'],
+    'STAGES': [7.8, '5', None, '3.5', 2, None, None, None, None, 3],
+    'LOBE/STAGE': [None, 'x', '7/8-3', np.nan, '6/7-5.0', '7/8-3', None, 'a-b-c', 4.5, 'keep-me'],
+    'MY': ['18s', 2, '18S', ' 11s to 15s ', ' 12 ', '11 TO 15', '3.5s', 'see notes', np.nan, 'nan'],
+    'COUNTY': ['Leon County TX', 'Caddo Parish LA', 'Reeves', ' Lea County NM ', 'Harris CountyTX',
+               None, 'DeSoto parish la', 'Eddy  NM', 12, 'Weld County'],
+})
+
+# FORM_FAM table with overlapping keywords, a repeated keyword and a second basin
+FORMFAM_EDGE_TABLE = pd.DataFrame({
+    'Basin': ['Permian', 'Permian', 'Permian', 'Permian', 'Permian', 'Haynesville', 'Haynesville'],
+    'Keyword': ['Wolfcamp A', 'Wolfcamp', 'camp', 'Spraberry', 'wolfcamp', 'Haynesville', 'Bossier'],
+    'Formation Family': ['WCA', 'WC', 'CAMP', 'SPRA', 'WC2', 'HV', 'BOS'],
+})
+
+FORMFAM_EDGE_CASES = pd.DataFrame({
+    'BASIN': ['Permian', 'PERMIAN', 'Permian', 'Permian', 'Haynesville', 'Haynesville', None, 'Unknown', 'Permian'],
+    'FORMATION': ['Wolfcamp A upper', 'lower wolfcamp b', 'Bone Spring', 'Spraberry / Wolfcamp A',
+                  'Bossier-Haynesville', 'Cotton Valley', 'Wolfcamp', 'Wolfcamp', None],
+})
+
+
+def format_dates(df):
+    """DATE_IN/DATE_OUT as dates, like the start of format_dates_and_datetimes"""
+    for column in ['DATE_IN', 'DATE_OUT']:
+        if column in df.columns:
+            df[column] = pd.to_datetime(df[column], errors='coerce').dt.date
+    return df
+
+
+def load_sample_frame():
+    """Read and clean the source files in this folder, then concatenate (merge steps 1-4)"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        FILES = merge.find_files()
+        if FILES is None:
+            return None
+        mappings, target_headers, read_plans = merge.load_mapping()
+        dfs, _, _ = merge.ingest_sources(FILES, mappings, read_plans)
+    return format_dates(pd.concat(dfs, ignore_index=True, sort=False))
+
+
+def _normalized(value):
+    """Blank values compare equal; numbers and text must stay numbers and text"""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return ('blank',)
+    return (isinstance(value, str), value)
+
+
+def sample_text_checks(df):
+    """Text checks whose columns exist in the merged sample frame"""
+    needed = {'LOBE/STAGE': ['LOBE/STAGE', 'LOBES', 'STAGES'], 'MY': ['MY'],
+              'STATE': ['COUNTY'], 'COUNTY': ['COUNTY']}
+    return [check for check in TEXT_CHECKS if all(column in df.columns for column in needed[check[0]])]
+
+
+def sample_formfam_checks(df):
+    """FORM_FAM check on the sample frame, with BASIN looked up like the merge does"""
+    if 'FORMATION' not in df.columns or 'COUNTY' not in df.columns or 'BASIN' not in df.columns:
+        return []
+    with contextlib.redirect_stdout(io.StringIO()):
+        county_to_basin, formfam_df = merge.load_lookup_tables()
+    merge.apply_basin_lookup(df, county_to_basin)
+    return formfam_checks(formfam_df)
+
+
+def compare_series(expected, actual):
+    """Return the row positions where two derived columns differ"""
+    return [i for i, (a, b) in enumerate(zip(expected, actual))
+            if _normalized(a) != _normalized(b)]
+
+
+def check_equivalence(df, label, checks):
+    """Run every reference/vectorized pair on df and report differences"""
+    print(f"\nEquivalence on {label} ({len(df)} rows)")
+    all_match = True
+    for column, reference, vectorized in checks:
+        expected = reference(df.copy())
+        actual = vectorized(df.copy())
+        diffs = compare_series(expected, actual)
+        if diffs:
+            all_match = False
+            print(f"  {column:<12} MISMATCH in {len(diffs)} rows, e.g.:")
+            for i in diffs[:5]:
+                print(f"    row {i}: expected {expected.iloc[i]!r}, got {actual.iloc[i]!r}")
+        else:
+            print(f"  {column:<12} OK")
+    return all_match
+
+
+def time_rule(func, df):
+    start = time.perf_counter()
+    func(df)
+    return time.perf_counter() - start
+
+
+def compare_timings(df, scales, checks):
+    """Time the reference and vectorized rules on df repeated scale times"""
+    print("\nTiming (seconds)")
+    print(f"  {'Column':<12} {'Rows':>8} {'Row-wise':>10} {'Vectorized':>11} {'Speedup':>8}")
+    for scale in scales:
+        big = pd.concat([df] * scale, ignore_index=True)
+        for column, reference, vectorized in checks:
+            slow = time_rule(reference, big)
+            fast = time_rule(vectorized, big)
+            print(f"  {column:<12} {len(big):>8} {slow:>10.3f} {fast:>11.3f} {slow / fast:>7.0f}x")
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Check vectorized derivations against the row-wise rules")
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100],
+                        help="Row-count multipliers for the timing comparison (default: 1 10 100)")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("DERIVATION CHECK - vectorized vs row-wise")
+    print("=" * 70)
+
+    ok = check_equivalence(EDGE_CASES, "edge cases", DERIVATION_CHECKS)
+    ok = check_equivalence(DATE_EDGE_CASES, "date/time edge cases", DATE_CHECKS) and ok
+    ok = check_equivalence(TEXT_EDGE_CASES, "text edge cases", TEXT_CHECKS) and ok
+    ok = check_equivalence(FORMFAM_EDGE_CASES, "FORM_FAM edge cases", formfam_checks(FORMFAM_EDGE_TABLE)) and ok
+
+    df = load_sample_frame()
+    if df is None:
+        print("\nWARNING: Source files not found; timing uses the edge cases only")
+        compare_timings(EDGE_CASES, args.scales, DERIVATION_CHECKS)
+        compare_timings(DATE_EDGE_CASES, args.scales, DATE_CHECKS)
+        compare_timings(TEXT_EDGE_CASES, args.scales, TEXT_CHECKS)
+    else:
+        checks = DERIVATION_CHECKS + DATE_CHECKS + sample_text_checks(df) + sample_formfam_checks(df)
+        ok = check_equivalence(df, "sample source files", checks) and ok
+        compare_timings(df, args.scales, checks)
+
+    print("\n" + ("All derivations match." if ok else "MISMATCHES FOUND - see above."))
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
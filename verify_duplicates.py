@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+"""
+Duplicate Matching Check Script
+Compares the grouped duplicate matching (duplicate_matching.py) with the
+original row-by-row is_duplicate rule it replaced, and times both.
+
+The row-wise rule and SN digit extraction are kept here, unchanged, as the
+reference. The check runs on the most recent MERGED_DATA*.xlsx in the current
+folder (empty runs removed, exactly like the cleaners do) plus a small set of
+edge cases, and then on the same data repeated 10x for the timing comparison
+(each copy gets its own JOB_NUMs, so copies never match each other).
+
+Usage:
+    python verify_duplicates.py
+    python verify_duplicates.py --scales 1 10 50
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+
+from spreadsheet_readers import read_sheet
+from clean_duplicates import (TOTAL_HRS_TOLERANCE, SN_LAST_DIGITS, find_merged_file, remove_empty_runs,
+                              sn_last_digits)
+from serial_numbers import add_serial_number_keys
+from duplicate_matching import flag_pog_duplicates, flag_pog_duplicates_parallel
+
+# ============================================================================
+# REFERENCE: ORIGINAL ROW-WISE RULES
+# ============================================================================
+
+def reference_last_digits(sn, num_digits=3):
+    """
+    Original extract_last_digits (row-wise).
+    Extract the last N digits from a serial number.
+    Handles various formats and extracts only numeric digits.
+
+    Args:
+        sn: Serial number (string or number)
+        num_digits: Number of digits to extract from the end
+
+    Returns:
+        String of last N digits, or empty string if not enough digits
+    """
+    if pd.isna(sn):
+        return ""
+
+    # Convert to string and extract only digits
+    sn_str = str(sn)
+    digits_only = ''.join(filter(str.isdigit, sn_str))
+
+    # Return last N digits
+    if len(digits_only) >= num_digits:
+        return digits_only[-num_digits:]
+    else:
+        return digits_only  # Return whatever digits we have
+
+
+def reference_is_duplicate(row, reference_df, job_type):
+    """
+    Original is_duplicate rule (row-wise).
+    Check if a row is a duplicate based on:
+    1. JOB_NUM matches
+    2. Total Hrs within tolerance (±5 hours) OR TOTAL_DRILL within tolerance if hrs blank
+    3. Last 3 digits of SN match
+
+    Args:
+        row: The row to check (from POG files)
+        reference_df: DataFrame to check against (Motor KPI or CAM Run Tracker)
+        job_type: "Directional" or "Rental"
+
+    Returns:
+        Boolean indicating if row is a duplicate
+    """
+    # Get values from the row being checked
+    job_num = row['JOB_NUM']
+    total_hrs = row['Total Hrs (C+D)']
+    total_drill = row['TOTAL_DRILL']
+    sn_last_digits = row['SN_LAST_3']
+
+    # Skip if missing critical identifiers
+    if pd.isna(job_num) or job_num == '':
+        return False
+
+    if pd.isna(total_hrs):
+        total_hrs = 0
+
+    if pd.isna(total_drill):
+        total_drill = 0
+
+    if sn_last_digits == '':
+        # If no SN digits, can't match on third criterion
+        # But we can still check JOB_NUM + Total Hrs/Drill
+        pass
+
+    # Filter reference data by JOB_NUM first (must match exactly)
+    matching_jobs = reference_df[reference_df['JOB_NUM'] == job_num]
+
+    if len(matching_jobs) == 0:
+        return False  # No matching job number
+
+    # NEW LOGIC: Check if POG row represents multiple reference runs combined
+    # Group reference rows by SN (same JOB_NUM + same SN last 3 digits)
+    if sn_last_digits != '':
+        matching_sn_rows = matching_jobs[matching_jobs['SN_LAST_3'] == sn_last_digits]
+
+        if len(matching_sn_rows) > 0:
+            # Sum all Total Hrs for matching JOB_NUM + SN combinations
+            sum_ref_hours = matching_sn_rows['Total Hrs (C+D)'].fillna(0).sum()
+
+            # Check if POG total hours matches the SUM of reference hours
+            if total_hrs > 0 and sum_ref_hours > 0:
+                if abs(total_hrs - sum_ref_hours) <= TOTAL_HRS_TOLERANCE:
+                    return True  # POG row represents combined reference runs
+            else:
+                # If Total Hrs is blank/zero, check TOTAL_DRILL instead
+                sum_ref_drill = matching_sn_rows['TOTAL_DRILL'].fillna(0).sum()
+                if total_drill > 0 and sum_ref_drill > 0:
+                    if abs(total_drill - sum_ref_drill) <= TOTAL_HRS_TOLERANCE:
+                        return True  # POG row represents combined reference runs (matched by drill)
+
+    # ORIGINAL LOGIC: Check each matching job for Total Hrs tolerance and SN match
+    for _, ref_row in matching_jobs.iterrows():
+        ref_total_hrs = ref_row['Total Hrs (C+D)']
+        ref_total_drill = ref_row['TOTAL_DRILL']
+        ref_sn_last_digits = ref_row['SN_LAST_3']
+
+        if pd.isna(ref_total_hrs):
+            ref_total_hrs = 0
+
+        if pd.isna(ref_total_drill):
+            ref_total_drill = 0
+
+        # Check if total hours are within tolerance
+        # If both Total Hrs are blank/zero, fall back to TOTAL_DRILL comparison
+        hrs_match = False
+        if total_hrs > 0 or ref_total_hrs > 0:
+            hrs_match = abs(total_hrs - ref_total_hrs) <= TOTAL_HRS_TOLERANCE
+        else:
+            # Both Total Hrs are blank/zero, check TOTAL_DRILL instead
+            if total_drill > 0 or ref_total_drill > 0:
+                hrs_match = abs(total_drill - ref_total_drill) <= TOTAL_HRS_TOLERANCE
+
+        # Check if SN last digits match
+        sn_match = False
+        if sn_last_digits != '' and ref_sn_last_digits != '':
+            sn_match = (sn_last_digits == ref_sn_last_digits)
+        elif sn_last_digits == '' and ref_sn_last_digits == '':
+            # Both have no SN - consider it a match if other criteria met
+            sn_match = True
+
+        # If both hours/drill and SN match, it's a duplicate
+        if hrs_match and sn_match:
+            return True
+
+    return False
+
+
+
+def reference_flags(df):
+    """Original detection loop: (Directional, Rental) duplicate flags, row by row"""
+    motor_kpi = df[df['SOURCE'] == 'Motor_KPI']
+    cam_tracker = df[df['SOURCE'] == 'CAM_Run_Tracker']
+    directional = pd.Series(False, index=df.index)
+    rental = pd.Series(False, index=df.index)
+
+    for idx, row in df[df['SOURCE'].isin(['POG_CAM_Usage', 'POG_MM_Usage'])].iterrows():
+        job_type = row.get('JOB_TYPE', '')
+        if job_type == 'Directional':
+            directional[idx] = reference_is_duplicate(row, motor_kpi, 'Directional')
+        elif job_type == 'Rental':
+            rental[idx] = reference_is_duplicate(row, cam_tracker, 'Rental')
+
+    return directional, rental
+
+
+def grouped_flags(df):
+    return flag_pog_duplicates(df, TOTAL_HRS_TOLERANCE)[:2]
+
+
+def sharded_flags(df):
+    return flag_pog_duplicates_parallel(df, TOTAL_HRS_TOLERANCE, workers=2)[:2]
+
+# ============================================================================
+# DATA
+# ============================================================================
+
+def with_sn_digits(df):
+    df = df.copy()
+    df['SN_LAST_3'] = df['SN'].apply(lambda x: reference_last_digits(x, SN_LAST_DIGITS))
+    return df
+
+
+# Motor KPI / CAM Run Tracker reference runs, then POG runs; the comment on each
+# POG run is the expected result
+EDGE_CASES = with_sn_digits(pd.DataFrame([
+    ('Motor_KPI', None, 'J1', 'A-101', 10, 100),
+    ('Motor_KPI', None, 'J1', 'B101', 20, 0),
+    ('Motor_KPI', None, 'J2', None, 0, 50),
+    ('Motor_KPI', None, 'J3', 'X-7', np.nan, np.nan),
+    ('Motor_KPI', None, 'J4', 'Z-555', 0, 30),
+    ('Motor_KPI', None, 'J4', 'Q555', 0, 40),
+    ('Motor_KPI', None, 123, 'S-900', 8, 0),
+    ('CAM_Run_Tracker', None, 'J1', 'A-101', 100, 0),
+    ('CAM_Run_Tracker', None, 'J5', 'M-321', -3, 10),
+    ('POG_CAM_Usage', 'Directional', 'J1', 'P101', 30, 0),      # sum of both J1/101 runs
+    ('POG_CAM_Usage', 'Directional', 'J1', '101', 14.5, 0),     # within 5 of one run
+    ('POG_MM_Usage', 'Directional', 'J1', '101', 15, 0),        # exactly 5 from one run
+    ('POG_MM_Usage', 'Directional', 'J1', '101', 25.01, 0),     # only the sum is close
+    ('POG_MM_Usage', 'Directional', 'J1', '101', 40, 100),      # hours too far, drill not used
+    ('POG_CAM_Usage', 'Directional', 'J1', '202', 10, 0),       # other SN
+    ('POG_CAM_Usage', 'Directional', 'J2', None, 0, 54),        # no hours: drill, both SN blank
+    ('POG_CAM_Usage', 'Directional', 'J2', 'n/a', 3, 50),       # POG hours vs blank reference hours
+    ('POG_CAM_Usage', 'Directional', 'J3', 'Y7', 0, 0),         # nothing to compare
+    ('POG_MM_Usage', 'Directional', 'J4', 'W555', 0, 72),       # sum of drill
+    ('POG_MM_Usage', 'Directional', '', '101', 10, 0),          # no JOB_NUM
+    ('POG_MM_Usage', 'Directional', np.nan, '101', 10, 0),      # no JOB_NUM
+    ('POG_CAM_Usage', 'Rental', 'J1', 'A-101', 98, 0),          # CAM Run Tracker run
+    ('POG_CAM_Usage', 'Rental', 'J1', '101', 30, 0),            # Motor KPI sum does not count
+    ('POG_CAM_Usage', 'MWD', 'J1', '101', 30, 0),               # not checked
+    ('POG_MM_Usage', 'Directional', 123.0, 'k900', 12, 0),      # 123.0 == 123
+    ('POG_MM_Usage', 'Rental', 'J5', '321', 0, 12),             # negative hours: drill
+], columns=['SOURCE', 'JOB_TYPE', 'JOB_NUM', 'SN', 'Total Hrs (C+D)', 'TOTAL_DRILL']))
+
+
+# Partial combined runs: J1/101 has runs of 10, 20 and 40 hours (sum 70)
+PARTIAL_EDGE_CASES = with_sn_digits(pd.DataFrame([
+    ('Motor_KPI', None, 'J1', 'A-101', 10, 0),
+    ('Motor_KPI', None, 'J1', 'B101', 20, 0),
+    ('Motor_KPI', None, 'J1', 'C101', 40, 0),
+    ('POG_CAM_Usage', 'Directional', 'J1', '101', 30, 0),       # 10 + 20
+    ('POG_CAM_Usage', 'Directional', 'J1', '101', 85, 0),       # no subset within 5
+    ('POG_CAM_Usage', 'Directional', 'J1', '101', 61, 0),       # 20 + 40
+    ('POG_MM_Usage', 'Directional', 'J1', None, 30, 0),         # no SN digits
+    ('POG_MM_Usage', 'Directional', 'J1', '101', 72, 0),        # all three: combined-runs rule
+], columns=['SOURCE', 'JOB_TYPE', 'JOB_NUM', 'SN', 'Total Hrs (C+D)', 'TOTAL_DRILL']))
+
+# POG row -> reference rows it should be matched to (partial matches only)
+PARTIAL_EXPECTED = {3: [0, 1], 5: [1, 2]}
+
+
+# Date overlap: J1/101 ran 10 hours on Jan 1-3 and 20 hours on Feb 1-2
+DATE_EDGE_CASES = with_sn_digits(pd.DataFrame([
+    ('Motor_KPI', None, 'J1', 'A-101', 10, 0, '2024-01-01', '2024-01-03'),
+    ('Motor_KPI', None, 'J1', 'B101', 20, 0, '2024-02-01', '2024-02-02'),
+    ('POG_CAM_Usage', 'Directional', 'J1', '101', 12, 0, '2024-01-02', '2024-01-02'),   # inside Jan 1-3
+    ('POG_CAM_Usage', 'Directional', 'J1', '101', 12, 0, '2024-01-10', '2024-01-11'),   # 7 days later
+    ('POG_CAM_Usage', 'Directional', 'J1', '101', 12, 0, None, None),                   # undated
+    ('POG_CAM_Usage', 'Directional', 'J1', '101', 30, 0, '2024-01-01', '2024-02-05'),   # spans both runs
+    ('POG_CAM_Usage', 'Directional', 'J1', '101', 30, 0, '2024-01-02', None),           # first run only
+], columns=['SOURCE', 'JOB_TYPE', 'JOB_NUM', 'SN', 'Total Hrs (C+D)', 'TOTAL_DRILL', 'DATE_IN', 'DATE_OUT']))
+
+# Days of slack -> expected Directional flags of the POG rows
+DATE_EXPECTED = {0: [True, False, True, True, False], 7: [True, True, True, True, False]}
+
+
+# Serial numbers whose digits lose their leading zeros if read back as numbers
+SN_ROUND_TRIP = pd.DataFrame({'SN': ['005', '0012', 'A-005', 'MLA07-0042', 7, 1005.0, None, 'n/a']})
+
+
+def load_sample_frame():
+    """The most recent merged file in this folder, with empty runs removed"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        merged_file = find_merged_file()
+        if merged_file is None:
+            return None
+        df, _ = remove_empty_runs(read_sheet(merged_file))
+    return with_sn_digits(df)
+
+
+def repeat_frame(df, scale):
+    """df repeated scale times, each copy with its own JOB_NUMs"""
+    copies = []
+    for copy in range(scale):
+        part = df.copy()
+        part['JOB_NUM'] = part['JOB_NUM'].astype(object).where(
+            part['JOB_NUM'].isna() | (part['JOB_NUM'] == ''), part['JOB_NUM'].astype(str) + f'#{copy}')
+        copies.append(part)
+    return pd.concat(copies, ignore_index=True)
+
+# ============================================================================
+# CHECKS
+# ============================================================================
+
+def check_equivalence(df, label, flags=grouped_flags):
+    """Compare the Directional and Rental flags of the row-wise rule and flags on df"""
+    print(f"\nEquivalence on {label} ({len(df)} rows)")
+    expected = reference_flags(df)
+    actual = flags(df)
+    all_match = True
+    for name, old, new in zip(['Directional', 'Rental'], expected, actual):
+        diffs = df.index[old.to_numpy() != new.to_numpy()]
+        if len(diffs):
+            all_match = False
+            print(f"  {name:<12} MISMATCH in {len(diffs)} rows, e.g.:")
+            for i in diffs[:5]:
+                print(f"    row {i}: expected {old[i]!r}, got {new[i]!r}")
+        else:
+            print(f"  {name:<12} OK ({int(new.sum())} duplicates)")
+    return all_match
+
+
+def check_sn_suffix(df, label):
+    """Compare the cleaner's vectorized SN_LAST_3 with the row-wise reference_last_digits"""
+    expected = df['SN'].apply(lambda x: reference_last_digits(x, SN_LAST_DIGITS))
+    actual = sn_last_digits(df)
+    diffs = df.index[expected.to_numpy() != actual.to_numpy()]
+    if len(diffs):
+        print(f"  {'SN suffix':<12} MISMATCH on {label} in {len(diffs)} rows, e.g.:")
+        for i in diffs[:5]:
+            print(f"    row {i} (SN {df.at[i, 'SN']!r}): expected {expected[i]!r}, got {actual[i]!r}")
+        return False
+    print(f"  {'SN suffix':<12} OK on {label}")
+    return True
+
+
+def check_written_sn_suffix():
+    """
+    check_sn_suffix on a merged frame written to a workbook and read back, SN_*
+    key columns included (they come back as numbers: '005' -> 5)
+    """
+    df = add_serial_number_keys(SN_ROUND_TRIP.copy())
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'MERGED_DATA_check.xlsx')
+        df.to_excel(path, index=False)
+        df_read = read_sheet(path)
+    return check_sn_suffix(df_read, "merged file read back")
+
+
+def overlap_flags(df):
+    """Flags with --date-overlap; on undated rows they match the row-wise rule"""
+    return flag_pog_duplicates(df, TOTAL_HRS_TOLERANCE, date_slack=0)[:2]
+
+
+def check_date_overlap():
+    """Date-overlap flags on DATE_EDGE_CASES"""
+    print("\nDate overlap on edge cases")
+    pog = DATE_EDGE_CASES['SOURCE'] != 'Motor_KPI'
+    all_match = True
+    for slack, expected in DATE_EXPECTED.items():
+        directional = flag_pog_duplicates(DATE_EDGE_CASES, TOTAL_HRS_TOLERANCE, date_slack=slack)[0]
+        found = directional[pog].tolist()
+        if found == expected:
+            print(f"  {f'{slack} days':<12} OK ({sum(found)} duplicates)")
+        else:
+            all_match = False
+            print(f"  {f'{slack} days':<12} MISMATCH: expected {expected}, got {found}")
+    return all_match
+
+
+def check_partial_runs():
+    """Partial combined-run matches on PARTIAL_EDGE_CASES"""
+    print("\nPartial combined runs on edge cases")
+    partial = flag_pog_duplicates(PARTIAL_EDGE_CASES, TOTAL_HRS_TOLERANCE, max_subset_runs=12)[2]
+    found = dict(zip(partial['POG_ROW'], partial['REFERENCE_ROWS']))
+    if found == PARTIAL_EXPECTED:
+        print(f"  {'Partial':<12} OK ({len(found)} matches)")
+        return True
+    print(f"  {'Partial':<12} MISMATCH: expected {PARTIAL_EXPECTED}, got {found}")
+    return False
+
+
+def time_rule(func, df):
+    start = time.perf_counter()
+    func(df)
+    return time.perf_counter() - start
+
+
+def compare_timings(df, scales):
+    """Time both versions on df repeated scale times"""
+    print("\nTiming (seconds)")
+    print(f"  {'Rows':>8} {'Row-wise':>10} {'Grouped':>9} {'Speedup':>8}")
+    for scale in scales:
+        big = repeat_frame(df, scale)
+        slow = time_rule(reference_flags, big)
+        fast = time_rule(grouped_flags, big)
+        print(f"  {len(big):>8} {slow:>10.3f} {fast:>9.3f} {slow / fast:>7.0f}x")
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Check grouped duplicate matching against the row-wise rule")
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10],
+                        help="Row-count multipliers for the timing comparison (default: 1 10)")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("DUPLICATE MATCHING CHECK - grouped vs row-wise")
+    print("=" * 70)
+
+    ok = check_equivalence(EDGE_CASES, "edge cases")
+    ok = check_sn_suffix(EDGE_CASES, "edge cases") and ok
+    ok = check_written_sn_suffix() and ok
+    ok = check_equivalence(EDGE_CASES, "edge cases, 2 JOB_NUM shards", sharded_flags) and ok
+    ok = check_partial_runs() and ok
+    ok = check_equivalence(EDGE_CASES, "edge cases, undated, date overlap", overlap_flags) and ok
+    ok = check_date_overlap() and ok
+
+    df = load_sample_frame()
+    if df is None:
+        print("\nWARNING: No MERGED_DATA file found; timing uses the edge cases only")
+        compare_timings(EDGE_CASES, args.scales)
+    else:
+        ok = check_equivalence(df, "merged file") and ok
+        ok = check_sn_suffix(df, "merged file") and ok
+        compare_timings(df, args.scales)
+
+    print("\n" + ("All duplicate flags match." if ok else "MISMATCHES FOUND - see above."))
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
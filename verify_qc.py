@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+QC Validation Check Script
+Compares the compiled, column-wise QC validation (qc_data_quality.py) with the
+original row-by-row check_cell loop it replaced, and times both.
+
+The original loop is kept here, unchanged, as the reference. The check runs on
+a small set of edge cases with one rule of every kind, then on real data: the
+most recent MERGE_CLEAN_EXCEL_FILES_AUTO_*.xlsx in the current folder (or the
+most recent MERGED_DATA_*.xlsx when there is no clean file) with the rules of
+CELL QC CRITERIA.xlsx (or the built-in EDGE_RULES when it is missing). The same
+data repeated 10x is used for the timing comparison.
+
+Usage:
+    python verify_qc.py
+    python verify_qc.py --scales 1 10 50
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import os
+import sys
+import time
+import pandas as pd
+
+from spreadsheet_readers import read_sheet
+from qc_data_quality import (US_STATES, load_qc_criteria, compile_rule, validate_data, validate_data_by_row,
+                             cells_from_results)
+
+CRITERIA_FILE = "CELL QC CRITERIA.xlsx"
+
+# ============================================================================
+# REFERENCE: ORIGINAL ROW-WISE RULES
+# ============================================================================
+
+def reference_check_cell(value, rule, col_name, row_data):
+    """
+    Original check_cell (row-wise, parses the rule text for every cell).
+    Validate a single cell value against its QC rule.
+
+    Returns: (is_valid, error_message)
+    """
+    # Handle empty/null values first
+    is_empty = pd.isna(value) or str(value).strip() == ""
+
+    # Parse the rule
+    rule_upper = rule.upper()
+
+    # Check for source-specific "only empty in" requirements
+    source = row_data.get("SOURCE", "")
+
+    # Handle "only empty in CAM_Run_tracker" validation
+    if "only empty in CAM" in rule.lower() or "only empty in CAM_Run_tracker" in rule:
+        if source != "CAM_Run_Tracker" and is_empty:
+            return False, "Required field (empty only allowed in CAM_Run_Tracker)"
+        return True, None
+
+    # Handle "only empty in POG" validation
+    if "only empty in POG" in rule:
+        if source not in ["POG_MM_Usage", "POG_CAM_Usage"] and is_empty:
+            return False, "Required field (empty only allowed in POG files)"
+        return True, None
+
+    # Handle "only empty in CAM_run_tracker, POG_MM_Usage, POG_CAM_Usage"
+    if "only empty in CAM_run_tracker, POG_MM_Usage, POG_CAM_Usage" in rule:
+        if source not in ["CAM_Run_Tracker", "POG_MM_Usage", "POG_CAM_Usage"] and is_empty:
+            return False, "Required field (empty only allowed in CAM/POG files)"
+        return True, None
+
+    # Handle "NON-BLANK in Motor KPI and CAM Run tracker, empty in POG files"
+    if "Motor KPI and CAM Run tracker, empty in POG" in rule:
+        if source in ["Motor_KPI", "CAM_Run_Tracker"] and is_empty:
+            return False, "Required for Motor_KPI and CAM_Run_Tracker"
+        return True, None
+
+    # Check for NON-BLANK / NON EMPTY requirements
+    if "NON-BLANK" in rule_upper or "NON EMPTY" in rule_upper:
+        # Check for conditional requirements
+        if "IF" in rule_upper:
+            # Handle CUR-related fields: required if CUR in Phase_CALC (only for Motor_KPI)
+            if "CUR" in rule_upper and "PHASE_CALC" in rule_upper:
+                # Check if this is a Motor_KPI-only rule
+                if "only for Motor_KPI" in rule or "ONLY FOR MOTOR_KPI" in rule_upper:
+                    # Only validate for Motor_KPI rows
+                    if source != "Motor_KPI":
+                        return True, None
+
+                phase_calc = row_data.get("Phase_CALC", "")
+                if pd.notna(phase_calc) and "CUR" in str(phase_calc).upper():
+                    if is_empty:
+                        return False, "Required when CUR in Phase_CALC"
+                return True, None
+
+            # Handle REPORTED_AS rule: required if INCIDENT_NUM is non-blank
+            elif col_name == "REPORTED_AS":
+                incident_num = row_data.get("INCIDENT_NUM", "")
+                if pd.notna(incident_num) and str(incident_num).strip() != "":
+                    if is_empty:
+                        return False, "Required when INCIDENT_NUM is filled"
+                return True, None
+        else:
+            # Unconditional non-blank requirement
+            if is_empty:
+                return False, "Required field is empty"
+
+    # If value is empty and not caught by above rules, it's OK
+    if is_empty:
+        return True, None
+
+    # Check numeric range validation (e.g., "<30000", "<600")
+    if rule.startswith("<"):
+        try:
+            threshold = float(rule[1:].strip())
+            cell_value = float(value)
+            if cell_value >= threshold:
+                return False, f"Value {cell_value} exceeds limit {threshold}"
+        except (ValueError, TypeError):
+            return False, "Expected numeric value for range check"
+
+    # Check for list validation (comma-separated allowed values)
+    if "," in rule and not rule_upper.startswith("NON"):
+        allowed_values = [v.strip() for v in rule.split(",")]
+        cell_value_str = str(value).strip()
+        if cell_value_str not in allowed_values:
+            return False, f"Value '{cell_value_str}' not in allowed list"
+
+    # Check for "Number" type validation
+    if rule.upper() == "NUMBER":
+        try:
+            float(value)
+        except (ValueError, TypeError):
+            return False, "Expected numeric value"
+
+    # Check for state validation
+    if col_name == "STATE":
+        state_str = str(value).strip().upper()
+        if state_str not in US_STATES:
+            return False, f"Invalid state code: {state_str}"
+
+    # Special handling for SOURCE column validation
+    if col_name == "SOURCE":
+        valid_sources = ["Motor_KPI", "CAM_Run_Tracker", "POG_MM_Usage", "POG_CAM_Usage"]
+        cell_value_str = str(value).strip()
+        if cell_value_str not in valid_sources:
+            return False, f"Value '{cell_value_str}' not in allowed source list"
+
+    # Check Phase_CALC validation
+    if col_name == "Phase_CALC":
+        # This would need the phase_map, but checking is done separately
+        # in validate_data function
+        pass
+
+    return True, None
+
+
+def reference_validate_data(df, criteria_dict, phase_map):
+    """
+    Original validate_data (row-wise).
+    Validate entire dataframe against QC criteria.
+
+    Returns: dict of issues {(row_idx, col_name): error_message}
+    """
+    issues_by_cell = {}
+
+    print(f"\nValidating {len(df)} rows against {len(criteria_dict)} criteria...")
+
+    for row_idx in range(len(df)):
+        row_data = df.iloc[row_idx]
+
+        # Check each column that has criteria
+        for col_name, rule in criteria_dict.items():
+            if col_name not in df.columns:
+                continue
+
+            value = row_data[col_name]
+
+            # Special handling for Phase_CALC validation
+            if col_name == "Phase_CALC":
+                phases_value = row_data.get("PHASES", "")
+                if pd.notna(phases_value):
+                    phases_str = str(phases_value).strip()
+                    expected_phase_calc = phase_map.get(phases_str)
+                    if expected_phase_calc:
+                        actual_phase_calc = str(value).strip() if pd.notna(value) else ""
+                        if actual_phase_calc != expected_phase_calc:
+                            issues_by_cell[(row_idx, col_name)] = f"Expected '{expected_phase_calc}' for PHASES='{phases_str}'"
+                continue
+
+            # Standard validation
+            is_valid, error_msg = reference_check_cell(value, rule, col_name, row_data)
+            if not is_valid:
+                issues_by_cell[(row_idx, col_name)] = error_msg
+
+    print(f"Found {len(issues_by_cell)} cell issues")
+    return issues_by_cell
+
+
+# ============================================================================
+# DATA
+# ============================================================================
+
+# One rule of every kind; equal values that print differently (1, 1.0, True, "1")
+# must keep their own verdicts when rules are evaluated per distinct value.
+# Also the built-in rules for real data when CELL QC CRITERIA.xlsx is missing.
+EDGE_RULES = {
+    "SOURCE": "Motor_KPI, CAM_Run_Tracker, POG_MM_Usage, POG_CAM_Usage",
+    "WELL": "NON-BLANK, only empty in CAM_Run_tracker",
+    "RIG": "only empty in POG",
+    "LEAD_DD": "only empty in CAM_run_tracker, POG_MM_Usage, POG_CAM_Usage",
+    "BHA": "NON-BLANK in Motor KPI and CAM Run tracker, empty in POG files",
+    "CUR_ROP": "NON-BLANK if CUR in Phase_CALC, only for Motor_KPI",
+    "CUR_DLS": "NON-BLANK if CUR in Phase_CALC",
+    "REPORTED_AS": "NON-BLANK if INCIDENT_NUM is filled",
+    "COMMENTS": "NON-BLANK if needed",
+    "COUNTY": "NON-BLANK",
+    "DEPTH_IN": "<30000",
+    "DEPTH_OUT": "<about 30000",
+    "JOB_TYPE": "Directional, Rental",
+    "MOTOR_OD": "Number",
+    "BIT_NUM": "1, 2, 3",
+    "MUD_WEIGHT": "Number",
+    "STATE": "NON EMPTY",
+    "Phase_CALC": "see phase equivalent",
+}
+
+EDGE_PHASE_MAP = {"Drilling Curve": "CUR", "Lateral": "LAT", "Blank": ""}
+
+EDGE_CASES = pd.DataFrame({
+    "SOURCE": ["Motor_KPI", "CAM_Run_Tracker", "POG_MM_Usage", "POG_CAM_Usage", " Motor_KPI ", None, "Other"],
+    "WELL": ["W1", None, " ", "W4", "", "W6", None],
+    "RIG": [None, None, "", None, "R5", " ", None],
+    "LEAD_DD": [None, "", None, " ", "DD", None, "x"],
+    "BHA": [1, None, None, float("nan"), 2, None, 3],
+    "CUR_ROP": [None, None, None, "", 50, None, None],
+    "CUR_DLS": ["", None, 3.5, None, None, " ", None],
+    "Phase_CALC": ["CUR", "cur-2", "LAT", "Curve", None, "CUR", " LAT "],
+    "PHASES": ["Drilling Curve", "Drilling Curve", "Lateral", "Other", "Lateral", None, " Lateral"],
+    "INCIDENT_NUM": ["INC1", None, " ", 0, "", None, "INC7"],
+    "REPORTED_AS": [None, None, None, "", "Motor", None, " "],
+    "COMMENTS": [None, "ok", "", None, None, None, None],
+    "COUNTY": ["Leon", None, " ", "Reeves", "", "Ward", None],
+    "DEPTH_IN": [100, 40000, "abc", " 12 ", None, "nan", 30000],
+    "DEPTH_OUT": [1, None, "x", 5, None, 2, 3],
+    "JOB_TYPE": ["Directional", " Rental ", "rental", 7.0, None, "", 7],
+    "MOTOR_OD": [6.75, float("nan"), 8.0, 5.0, 4.75, float("inf"), 7.0],
+    "MUD_WEIGHT": ["9.5", "heavy", None, 10, True, " ", "True"],
+    "BIT_NUM": [1, 1.0, True, "1", 2, None, "3 "],
+    "STATE": ["TX", "tx", " NM ", "XX", None, "", 12],
+})
+
+# ============================================================================
+# CHECKS
+# ============================================================================
+
+def load_sample_frame():
+    """
+    The most recent clean file in this folder, or the most recent merged file.
+
+    Returns:
+        (DataFrame, label), or (None, None) when there is neither
+    """
+    for pattern, label in [("MERGE_CLEAN_EXCEL_FILES_AUTO_*.xlsx", "clean file"),
+                           ("MERGED_DATA_*.xlsx", "merged file")]:
+        files = glob.glob(pattern)
+        if files:
+            with contextlib.redirect_stdout(io.StringIO()):
+                return read_sheet(max(files, key=os.path.getmtime)), label
+    return None, None
+
+
+def load_rules():
+    """
+    The rules of CELL QC CRITERIA.xlsx, or the built-in EDGE_RULES when it is missing.
+
+    Returns:
+        (criteria_dict, rules, phase_map, label)
+    """
+    if os.path.exists(CRITERIA_FILE):
+        with contextlib.redirect_stdout(io.StringIO()):
+            rules, phase_map = load_qc_criteria()
+        criteria_dict = {col_name: validator["rule"] for col_name, validator in rules.items()}
+        return criteria_dict, rules, phase_map, "QC criteria"
+    rules = {col_name: compile_rule(col_name, rule) for col_name, rule in EDGE_RULES.items()}
+    return EDGE_RULES, rules, EDGE_PHASE_MAP, "built-in rules"
+
+
+def check_equivalence(df, criteria_dict, rules, phase_map, label, validate=validate_data):
+    """Compare the issues of the original loop and validate on df"""
+    print(f"\nEquivalence on {label} ({len(df)} rows, {len(rules)} rules)")
+    with contextlib.redirect_stdout(io.StringIO()):
+        expected = reference_validate_data(df, criteria_dict, phase_map)
+        actual = cells_from_results(validate(df, rules, phase_map))
+    if expected == actual:
+        print(f"  {validate.__name__:<22} OK ({len(actual)} issues)")
+        return True
+    diffs = sorted(set(expected.items()) ^ set(actual.items()), key=lambda item: (item[0][0], item[0][1]))
+    print(f"  {validate.__name__:<22} MISMATCH in {len(diffs)} issues, e.g.:")
+    for (row_idx, col_name), error_msg in diffs[:5]:
+        where = "expected" if expected.get((row_idx, col_name)) == error_msg else "got"
+        print(f"    row {row_idx}, {col_name}: {where} {error_msg!r}")
+    return False
+
+
+def time_rule(func, *args):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        func(*args)
+    return time.perf_counter() - start
+
+
+def compare_timings(df, criteria_dict, rules, phase_map, scales):
+    """Time the original loop and the column-wise validation on df repeated scale times"""
+    print("\nTiming (seconds)")
+    print(f"  {'Rows':>8} {'Row-wise':>10} {'Columns':>9} {'Speedup':>8}")
+    for scale in scales:
+        big = pd.concat([df] * scale, ignore_index=True)
+        slow = time_rule(reference_validate_data, big, criteria_dict, phase_map)
+        fast = time_rule(validate_data, big, rules, phase_map)
+        print(f"  {len(big):>8} {slow:>10.3f} {fast:>9.3f} {slow / fast:>7.1f}x")
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Check column-wise QC validation against the row-wise loop")
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10],
+                        help="Row-count multipliers for the timing comparison (default: 1 10)")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("QC VALIDATION CHECK - column-wise vs row-wise")
+    print("=" * 70)
+
+    edge_rules = {col_name: compile_rule(col_name, rule) for col_name, rule in EDGE_RULES.items()}
+    ok = True
+    for validate in [validate_data, validate_data_by_row]:
+        ok = check_equivalence(EDGE_CASES, EDGE_RULES, edge_rules, EDGE_PHASE_MAP, "edge cases",
+                               validate) and ok
+
+    df, data_label = load_sample_frame()
+    if df is None:
+        print("\nWARNING: No clean or merged file found; timing uses the edge cases only")
+        compare_timings(EDGE_CASES, EDGE_RULES, edge_rules, EDGE_PHASE_MAP, args.scales)
+    else:
+        criteria_dict, rules, phase_map, rules_label = load_rules()
+        if rules_label == "built-in rules":
+            print(f"\nWARNING: {CRITERIA_FILE} not found; checking the {data_label} with the built-in rules")
+        label = f"{data_label}, {rules_label}"
+        for validate in [validate_data, validate_data_by_row]:
+            ok = check_equivalence(df, criteria_dict, rules, phase_map, label, validate) and ok
+        compare_timings(df, criteria_dict, rules, phase_map, args.scales)
+
+    print("\n" + ("All QC issues match." if ok else "MISMATCHES FOUND - see above."))
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())